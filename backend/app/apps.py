@@ -1,4 +1,7 @@
 from django.apps import AppConfig
 
 class AppsConfig(AppConfig):
-    name = 'app'
\ No newline at end of file
+    name = 'app'
+
+    def ready(self):
+        from app import signals  # noqa: F401
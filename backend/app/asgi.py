@@ -1,8 +1,22 @@
-
 import os
+import logging
 
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 app = get_asgi_application()
+
+# Same name as app.wsgi, for ASGI servers (gunicorn -k uvicorn.workers.UvicornWorker app.asgi:application).
+application = app
+
+# Load the event store up front, as app.wsgi does, so the first request
+# does not pay for the full load.
+try:
+    from django.conf import settings
+
+    if settings.SUMMARY_ENGINE == 'columnar':
+        from app.helpers.event_store import get_event_store
+        get_event_store()
+except Exception as e:
+    logging.error(f"Error loading event store: {str(e)}")
@@ -0,0 +1,35 @@
+import hmac
+
+from django.conf import settings
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import BasePermission
+
+
+class IngestKeyAuthentication(BaseAuthentication):
+    """
+    Authenticates Authorization: Bearer <key> against
+    settings.INGEST_API_KEYS. A valid key becomes request.auth; there is no
+    user.
+    """
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        header = get_authorization_header(request).split()
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+        if len(header) != 2:
+            raise AuthenticationFailed('Invalid Authorization header')
+
+        key = header[1]
+        if not any(hmac.compare_digest(key, valid_key.encode()) for valid_key in settings.INGEST_API_KEYS):
+            raise AuthenticationFailed('Invalid API key')
+        return None, key.decode()
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class HasIngestKey(BasePermission):
+    def has_permission(self, request, view):
+        return request.auth is not None
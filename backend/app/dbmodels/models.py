@@ -19,6 +19,10 @@ class Game(models.Model):
     class Meta:
         db_table = 'games'
         ordering = ['date']
+        indexes = [
+            # Resolves date-windowed summaries to their games.
+            models.Index(fields=['date', 'game_id'], name='games_date_idx'),
+        ]
     
     def __str__(self):
         return f"Game {self.game_id} - {self.date}"
@@ -55,6 +59,16 @@ class Shot(models.Model):
     
     class Meta:
         db_table = 'shots'
+        indexes = [
+            # Covers the per-player location fetch and its keyset paging
+            # (player_id IN ... [AND game_id IN ...] [AND shot_id > ...]
+            # ORDER BY shot_id), so it is answered by an index-only scan.
+            models.Index(
+                fields=['player', 'shot_id'],
+                include=['action_type', 'game', 'points', 'shot_loc_x', 'shot_loc_y'],
+                name='shots_player_event_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"Shot {self.shot_id} by {self.player.name} - {self.points} points"
@@ -82,6 +96,18 @@ class Pass(models.Model):
     
     class Meta:
         db_table = 'passes'
+        indexes = [
+            # Covers the per-player location fetch and its keyset paging, as
+            # for shots.
+            models.Index(
+                fields=['player', 'pass_id'],
+                include=[
+                    'action_type', 'game', 'potential_assist', 'turnover', 'completed_pass',
+                    'ball_start_loc_x', 'ball_start_loc_y', 'ball_end_loc_x', 'ball_end_loc_y',
+                ],
+                name='passes_player_event_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"Pass {self.pass_id} by {self.player.name} - {'Completed' if self.completed_pass else 'Failed'}"
@@ -104,6 +130,113 @@ class Turnover(models.Model):
     
     class Meta:
         db_table = 'turnovers'
+        indexes = [
+            # Covers the per-player location fetch and its keyset paging, as
+            # for shots.
+            models.Index(
+                fields=['player', 'turnover_id'],
+                include=['action_type', 'game', 'tov_loc_x', 'tov_loc_y'],
+                name='turnovers_player_event_idx',
+            ),
+        ]
     
     def __str__(self):
         return f"Turnover {self.turnover_id} by {self.player.name}"
+
+
+class DataVersion(models.Model):
+    """
+    Single-row counter bumped whenever player or event data changes, so
+    derived data (rank index, cached summaries) can tell it is stale.
+    """
+    data_version_id = models.IntegerField(primary_key=True)
+    version = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'data_version'
+
+    def __str__(self):
+        return f"Data version {self.version}"
+
+
+class DataChange(models.Model):
+    """
+    What one data version bump changed: the players whose events or rows
+    it touched, or NULL when any data may have changed (a full load). Lets
+    processes refresh only those players' derived data; see
+    app.helpers.data_version.get_data_changes.
+    """
+    version = models.BigIntegerField(primary_key=True)
+    player_ids = models.JSONField(null=True)
+
+    class Meta:
+        db_table = 'data_changes'
+
+    def __str__(self):
+        return f"Data change {self.version}"
+
+
+class IngestCheckpoint(models.Model):
+    """
+    Progress of an incremental load of one players file. A load resumes from
+    (player_offset, event_offset); a completed checkpoint for the same
+    content hash means the file is unchanged and can be skipped.
+    """
+    checkpoint_id = models.AutoField(primary_key=True)
+    source = models.CharField(max_length=500)
+    content_hash = models.CharField(max_length=64)
+    player_offset = models.IntegerField(default=0)
+    event_offset = models.IntegerField(default=0)
+    rows_loaded = models.BigIntegerField(default=0)
+    completed = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ingest_checkpoints'
+        unique_together = [('source', 'content_hash')]
+
+    def __str__(self):
+        return f"Checkpoint {self.source} @ {self.player_offset}/{self.event_offset}"
+
+
+class IngestedGame(models.Model):
+    """
+    Content hash of each game's events as of the last completed incremental
+    load, used to reload only new or changed games.
+    """
+    game = models.OneToOneField(Game, primary_key=True, on_delete=models.CASCADE, related_name='ingest')
+    content_hash = models.CharField(max_length=64)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'ingested_games'
+
+    def __str__(self):
+        return f"Game {self.game_id} ingested as {self.content_hash[:12]}"
+
+
+class PlayerGameStats(models.Model):
+    """
+    Rollup of one player's events in one game for one action type, holding
+    the counts and point sums the summary totals and ranks are built from.
+    Maintained by the loaders and event signals; see
+    app.helpers.rollup.refresh_player_game_stats.
+    """
+    player_game_stats_id = models.AutoField(primary_key=True)
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name='game_stats')
+    game = models.ForeignKey(Game, on_delete=models.CASCADE, related_name='player_stats')
+    action_type = models.CharField(max_length=20)
+    shot_attempts = models.IntegerField(default=0)
+    points = models.IntegerField(default=0)
+    passes = models.IntegerField(default=0)
+    potential_assists = models.IntegerField(default=0)
+    turnovers = models.IntegerField(default=0)
+    passing_turnovers = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'player_game_stats'
+        unique_together = [('player', 'game', 'action_type')]
+
+    def __str__(self):
+        return f"Player {self.player_id} in game {self.game_id} ({self.action_type})"
@@ -0,0 +1,100 @@
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.utils.module_loading import import_string
+
+from app.helpers.metrics import record_cache_lookup
+
+
+class LocMemLRUCache:
+    """
+    Per-process cache holding at most max_entries values, evicting the least
+    recently used entry once full.
+    """
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            try:
+                self._entries.move_to_end(key)
+            except KeyError:
+                record_cache_lookup(key, hit=False)
+                return None
+            record_cache_lookup(key, hit=True)
+            return self._entries[key]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class DjangoCache:
+    """
+    Adapter over a configured Django cache alias, for a cache shared between
+    workers (Redis, Memcached). Keys embed the data version, so entries left
+    over from older data are never read again and simply expire; timeout
+    defaults to the alias's TIMEOUT.
+    """
+
+    def __init__(self, alias='default', timeout=DEFAULT_TIMEOUT):
+        self.cache = caches[alias]
+        self.timeout = timeout
+
+    def get(self, key):
+        value = self.cache.get(key)
+        record_cache_lookup(key, hit=value is not None)
+        return value
+
+    def set(self, key, value):
+        self.cache.set(key, value, timeout=self.timeout)
+
+    def clear(self):
+        # Deliberately a no-op: the alias may be shared with sessions or
+        # other apps, and clearing it would drop their keys too. Entries
+        # for older data versions are unreachable and expire (timeout) or
+        # are evicted by the cache server.
+        pass
+
+
+_summary_cache = None
+_summary_cache_lock = threading.Lock()
+
+
+def get_summary_cache():
+    """
+    Return the cache configured by settings.PLAYER_SUMMARY_CACHE.
+    """
+    global _summary_cache
+    if _summary_cache is None:
+        with _summary_cache_lock:
+            if _summary_cache is None:
+                config = settings.PLAYER_SUMMARY_CACHE
+                backend = import_string(config['BACKEND'])
+                _summary_cache = backend(**config.get('OPTIONS', {}))
+    return _summary_cache
+
+
+def invalidate_summary_cache():
+    get_summary_cache().clear()
+
+
+def cache_key(kind, version, *parts):
+    return ':'.join([kind, str(version), *(str(part) for part in parts)])
+
+
+def summary_cache_key(player_id, version, *variant):
+    return cache_key('playerSummary', version, player_id, *variant)
@@ -0,0 +1,190 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F
+from django.dispatch import Signal
+from django.utils import timezone
+
+from app.dbmodels.models import DataChange, DataVersion
+
+DATA_VERSION_ID = 1
+
+# Data changes kept in the log. A process whose derived data is further
+# behind than this rebuilds it in full.
+DATA_CHANGE_LOG_SIZE = 10000
+
+# Sent after the data version is bumped, so derived caches can drop entries.
+# player_ids is the set of players the change touched, or None for any.
+data_version_changed = Signal()
+
+_cached_version = None
+_data_changes = {}
+_data_changes_lock = threading.Lock()
+
+
+def get_data_version():
+    """
+    Return (version, updated_at) for the current player/event data.
+
+    The row is re-read at most once per settings.DATA_VERSION_TTL seconds per
+    process, so hot paths can check staleness without a query per call.
+    """
+    global _cached_version
+    now = time.monotonic()
+    cached = _cached_version
+    if cached is not None and now - cached[2] < settings.DATA_VERSION_TTL:
+        return cached[0], cached[1]
+
+    row = DataVersion.objects.filter(pk=DATA_VERSION_ID).values_list('version', 'updated_at').first()
+    version, updated_at = row if row is not None else (0, None)
+    _cached_version = (version, updated_at, now)
+    return version, updated_at
+
+
+def bump_data_version(player_ids=None):
+    """
+    Mark player/event data as changed. Loaders call this once they finish.
+    player_ids limits the change to those players' data, which lets other
+    processes refresh just those players (see get_data_changes); None means
+    any data may have changed.
+    """
+    global _cached_version
+    player_ids = sorted(set(player_ids)) if player_ids is not None else None
+    with transaction.atomic():
+        updated = DataVersion.objects.filter(pk=DATA_VERSION_ID).update(
+            version=F('version') + 1,
+            updated_at=timezone.now(),
+        )
+        if not updated:
+            DataVersion.objects.get_or_create(pk=DATA_VERSION_ID, defaults={'version': 1})
+        version = DataVersion.objects.filter(pk=DATA_VERSION_ID).values_list('version', flat=True).get()
+        DataChange.objects.bulk_create(
+            [DataChange(version=version, player_ids=player_ids)],
+            update_conflicts=True, unique_fields=['version'], update_fields=['player_ids'],
+        )
+        DataChange.objects.filter(version__lte=version - DATA_CHANGE_LOG_SIZE).delete()
+    _cached_version = None
+    data_version_changed.send(
+        sender=DataVersion, player_ids=frozenset(player_ids) if player_ids is not None else None,
+    )
+
+
+def get_data_changes(since, version):
+    """
+    The IDs of the players whose data changed after version since, up to and
+    including version, or None when that is unknown (since is None, or the
+    log no longer covers the range) or any data may have changed. Changes
+    already read are remembered, so each one is read once per process.
+    """
+    if since is None or since > version or version - since >= DATA_CHANGE_LOG_SIZE:
+        return None
+    versions = range(since + 1, version + 1)
+    missing = [change_version for change_version in versions if change_version not in _data_changes]
+    if missing:
+        rows = DataChange.objects.filter(
+            version__gte=missing[0], version__lte=missing[-1],
+        ).values_list('version', 'player_ids')
+        with _data_changes_lock:
+            for change_version, player_ids in rows:
+                _data_changes[change_version] = frozenset(player_ids) if player_ids is not None else None
+            for change_version in [key for key in _data_changes if key <= version - DATA_CHANGE_LOG_SIZE]:
+                del _data_changes[change_version]
+
+    changed = set()
+    for change_version in versions:
+        if change_version not in _data_changes:
+            return None
+        player_ids = _data_changes[change_version]
+        if player_ids is None:
+            return None
+        changed |= player_ids
+    return changed
+
+
+class PlayerVersions:
+    """
+    Per-player data versions for this process: the latest version whose
+    change touched a player, or, for players untouched since, the version
+    of the last change this process could not scope (a full load, or
+    startup). A player's derived data is unchanged between that version and
+    the current one, so keying cached payloads by it keeps them warm across
+    changes to other players.
+    """
+
+    def __init__(self):
+        self.version = None
+        self.base = None
+        self.players = {}
+        self.lock = threading.Lock()
+
+    def get(self, player_id):
+        version, _ = get_data_version()
+        if version != self.version:
+            with self.lock:
+                if version != self.version:
+                    changed = get_data_changes(self.version, version)
+                    if changed is None:
+                        self.base = version
+                        self.players = {}
+                    else:
+                        self.players.update(dict.fromkeys(changed, version))
+                    self.version = version
+        return self.players.get(player_id, self.base)
+
+
+_player_versions = PlayerVersions()
+
+
+def get_player_version(player_id):
+    return _player_versions.get(player_id)
+
+
+def lock_data_version():
+    """
+    Lock the data version row until the current transaction ends, so
+    writers that read before they write (such as bulk event ingestion)
+    run one at a time. Must be called inside transaction.atomic().
+    """
+    DataVersion.objects.select_for_update().get_or_create(pk=DATA_VERSION_ID)
+
+
+class PendingDataChange:
+    """
+    The data version bump scheduled for the end of a transaction, gathering
+    the players of every change made in it.
+    """
+
+    def __init__(self):
+        self.player_ids = set()
+        self.sent = False
+
+    def add(self, player_ids):
+        if player_ids is None:
+            self.player_ids = None
+        elif self.player_ids is not None:
+            self.player_ids.update(player_ids)
+
+    def __call__(self):
+        self.sent = True
+        bump_data_version(self.player_ids)
+
+
+def mark_data_changed(player_ids=None):
+    """
+    Schedule a single data version bump for when the current transaction
+    commits, however many rows it writes. player_ids limits the change to
+    those players (see bump_data_version); the bump covers every player
+    passed by any call in the transaction, or all of them if any call
+    passes None.
+    """
+    connection = transaction.get_connection()
+    if connection.in_atomic_block:
+        for _, func, _ in connection.run_on_commit:
+            if isinstance(func, PendingDataChange) and not func.sent:
+                func.add(player_ids)
+                return
+    pending = PendingDataChange()
+    pending.add(player_ids)
+    transaction.on_commit(pending)
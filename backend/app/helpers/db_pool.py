@@ -0,0 +1,66 @@
+import time
+
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+
+def get_pool(alias=DEFAULT_DB_ALIAS):
+    """
+    The alias's psycopg_pool ConnectionPool, or None when it isn't pooled
+    (DB_POOL unset, or a backend without pooling such as SQLite).
+    """
+    return getattr(connections[alias], 'pool', None)
+
+
+def pool_stats(alias=DEFAULT_DB_ALIAS):
+    """
+    This process's pool usage for alias, or None when it isn't pooled.
+    Counters (requests, waits, errors) are cumulative since the pool opened.
+    """
+    pool = get_pool(alias)
+    if pool is None:
+        return None
+
+    stats = pool.get_stats()
+    size = stats.get('pool_size', 0)
+    available = stats.get('pool_available', 0)
+    return {
+        'minSize': stats.get('pool_min', 0),
+        'maxSize': stats.get('pool_max', 0),
+        'size': size,
+        'inUse': size - available,
+        'available': available,
+        'waiting': stats.get('requests_waiting', 0),
+        'requests': stats.get('requests_num', 0),
+        'requestsQueued': stats.get('requests_queued', 0),
+        'waitMs': stats.get('requests_wait_ms', 0),
+        'requestErrors': stats.get('requests_errors', 0),
+        'connectionsOpened': stats.get('connections_num', 0),
+        'connectionErrors': stats.get('connections_errors', 0),
+        'connectionsLost': stats.get('connections_lost', 0),
+        'badReturns': stats.get('returns_bad', 0),
+    }
+
+
+def check_database(alias=DEFAULT_DB_ALIAS):
+    """
+    Run a trivial query on alias. Returns (ok, latency in ms, error message).
+    """
+    start = time.perf_counter()
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+    except DatabaseError as e:
+        return False, round((time.perf_counter() - start) * 1000, 2), str(e)
+    return True, round((time.perf_counter() - start) * 1000, 2), None
+
+
+def close_pools():
+    """
+    Close every pool this process has opened. Call before forking workers:
+    a pool's connections and maintenance threads must not be shared with a
+    child, which opens its own pool on first use instead.
+    """
+    for connection in connections.all():
+        if hasattr(connection, 'close_pool'):
+            connection.close_pool()
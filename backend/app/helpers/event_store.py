@@ -0,0 +1,395 @@
+import logging
+import threading
+
+import numpy as np
+from django.conf import settings
+
+from app.dbmodels import models
+from app.helpers.data_version import get_data_changes, get_data_version
+
+LOGGER = logging.getLogger('django')
+
+ACTION_TYPES = [action_type for action_type, _ in models.Shot.ACTION_TYPES]
+ACTION_CODES = {action_type: code for code, action_type in enumerate(ACTION_TYPES)}
+
+# Events with an action type outside ACTION_TYPES still count toward the
+# headline totals, as they do when summarizing from the database.
+OTHER_ACTION = len(ACTION_TYPES)
+ACTION_KEYS = ACTION_TYPES + ['other']
+
+# The per-event arrays embedded under each action type, in response order.
+EVENT_KINDS = ['shots', 'passes', 'turnovers']
+
+# Locations are stored as float32; rounding on the way out drops float32
+# noise (31.49 rather than 31.489999771118164).
+LOCATION_DECIMALS = 4
+
+CHUNK_SIZE = 100000
+
+
+def to_locations(column):
+    return np.round(column.astype(np.float64), LOCATION_DECIMALS).tolist()
+
+
+class EventColumns:
+    """
+    One event table as parallel NumPy columns sorted by player (then event
+    ID), with a per-player offset index so a player's events are a slice.
+    """
+
+    def __init__(self, player, action, columns):
+        self.player = player
+        self.action = action
+        self.columns = columns
+        # player is sorted, so each player's rows start where the ID changes.
+        self.starts = np.flatnonzero(np.diff(player, prepend=np.int64(-1)))
+        self.player_ids = player[self.starts]
+        self.ends = np.append(self.starts[1:], len(player))[:len(self.starts)]
+
+    @classmethod
+    def load(cls, queryset, columns):
+        """
+        Load queryset, a values_list of (player_id, action_type, *columns),
+        into arrays. columns is a list of (name, dtype).
+        """
+        chunks = []
+        rows = []
+        for row in queryset.iterator(chunk_size=CHUNK_SIZE):
+            rows.append(row)
+            if len(rows) >= CHUNK_SIZE:
+                chunks.append(cls.to_arrays(rows, columns))
+                rows = []
+        chunks.append(cls.to_arrays(rows, columns))
+
+        player = np.concatenate([chunk[0] for chunk in chunks])
+        action = np.concatenate([chunk[1] for chunk in chunks])
+        arrays = {
+            name: np.concatenate([chunk[2][name] for chunk in chunks])
+            for name, _ in columns
+        }
+        return cls(player, action, arrays)
+
+    @staticmethod
+    def to_arrays(rows, columns):
+        values = list(zip(*rows)) or [()] * (len(columns) + 2)
+        player = np.array(values[0], dtype=np.int32)
+        action = np.array([ACTION_CODES.get(action_type, OTHER_ACTION) for action_type in values[1]], dtype=np.int8)
+        arrays = {
+            name: np.array(values[index + 2], dtype=dtype)
+            for index, (name, dtype) in enumerate(columns)
+        }
+        return player, action, arrays
+
+    def replaced(self, player_ids, replacement):
+        """
+        A copy with the rows of player_ids (sorted) swapped for those in
+        replacement, which holds just those players' current events. The
+        untouched rows are copied in runs, so the cost is one pass over the
+        arrays rather than a reload.
+        """
+        pieces = []
+        position = 0
+        for player_id in player_ids:
+            start = int(np.searchsorted(self.player, player_id, side='left'))
+            end = int(np.searchsorted(self.player, player_id, side='right'))
+            pieces.append((self, position, start))
+            pieces.append((
+                replacement,
+                int(np.searchsorted(replacement.player, player_id, side='left')),
+                int(np.searchsorted(replacement.player, player_id, side='right')),
+            ))
+            position = end
+        pieces.append((self, position, len(self.player)))
+
+        def join(column):
+            return np.concatenate([column(source)[start:end] for source, start, end in pieces])
+
+        return EventColumns(
+            join(lambda source: source.player),
+            join(lambda source: source.action),
+            {name: join(lambda source, name=name: source.columns[name]) for name in self.columns},
+        )
+
+    def slice(self, player_id):
+        index = np.searchsorted(self.player_ids, player_id)
+        if index < len(self.player_ids) and self.player_ids[index] == player_id:
+            start, end = self.starts[index], self.ends[index]
+        else:
+            start = end = 0
+        return self.action[start:end], {name: column[start:end] for name, column in self.columns.items()}
+
+    def per_player_counts(self, player_index, player_count):
+        """
+        (player_count, len(ACTION_KEYS)) matrix of event counts.
+        """
+        keys = len(ACTION_KEYS)
+        return np.bincount(
+            player_index * keys + self.action, minlength=player_count * keys
+        ).reshape(player_count, keys)
+
+
+def load_event_columns(player_ids=None):
+    """
+    (shots, passes, turnovers) as EventColumns, for every player or only
+    player_ids.
+    """
+    shots = models.Shot.objects.order_by('player_id', 'shot_id')
+    passes = models.Pass.objects.order_by('player_id', 'pass_id')
+    turnovers = models.Turnover.objects.order_by('player_id', 'turnover_id')
+    if player_ids is not None:
+        shots = shots.filter(player_id__in=player_ids)
+        passes = passes.filter(player_id__in=player_ids)
+        turnovers = turnovers.filter(player_id__in=player_ids)
+
+    shots = EventColumns.load(
+        shots.values_list('player_id', 'action_type', 'shot_loc_x', 'shot_loc_y', 'points', 'game_id', 'shot_id'),
+        [('x', np.float32), ('y', np.float32), ('points', np.int16), ('game', np.int32), ('id', np.int64)],
+    )
+    passes = EventColumns.load(
+        passes.values_list(
+            'player_id', 'action_type', 'ball_start_loc_x', 'ball_start_loc_y',
+            'ball_end_loc_x', 'ball_end_loc_y', 'completed_pass', 'potential_assist', 'turnover', 'pass_id'
+        ),
+        [
+            ('start_x', np.float32), ('start_y', np.float32),
+            ('end_x', np.float32), ('end_y', np.float32),
+            ('completed', np.bool_), ('potential_assist', np.bool_), ('turnover', np.bool_),
+            ('id', np.int64),
+        ],
+    )
+    turnovers = EventColumns.load(
+        turnovers.values_list('player_id', 'action_type', 'tov_loc_x', 'tov_loc_y', 'turnover_id'),
+        [('x', np.float32), ('y', np.float32), ('id', np.int64)],
+    )
+    return shots, passes, turnovers
+
+
+class EventStore:
+    """
+    Every Shot, Pass and Turnover row held in memory as NumPy columns, so
+    summaries and ranks are answered with slices and vectorized reductions
+    instead of database queries. Built for one data version; see
+    get_event_store for refreshes.
+    """
+
+    def __init__(self, player_names, shots, passes, turnovers, version=None):
+        self.version = version
+        self.player_names = player_names
+        self.shots = shots
+        self.passes = passes
+        self.turnovers = turnovers
+
+    @classmethod
+    def load(cls, version=None):
+        player_names = dict(models.Player.objects.values_list('player_id', 'name'))
+        return cls(player_names, *load_event_columns(), version=version)
+
+    def patched(self, player_ids, version):
+        """
+        A copy of this store as of version, where only player_ids changed:
+        their names and events are re-read (four queries) and spliced in,
+        instead of reloading every event.
+        """
+        player_ids = sorted(player_ids)
+        player_names = dict(self.player_names)
+        for player_id in player_ids:
+            player_names.pop(player_id, None)
+        player_names.update(models.Player.objects.filter(player_id__in=player_ids).values_list('player_id', 'name'))
+        shots, passes, turnovers = load_event_columns(player_ids)
+        return EventStore(
+            player_names,
+            self.shots.replaced(player_ids, shots),
+            self.passes.replaced(player_ids, passes),
+            self.turnovers.replaced(player_ids, turnovers),
+            version=version,
+        )
+
+    def action_totals(self, player_id):
+        """
+        One player's totals per action type, shaped like
+        aggregate_action_totals()[player_id].
+        """
+        keys = len(ACTION_KEYS)
+        shot_actions, shots = self.shots.slice(player_id)
+        pass_actions, passes = self.passes.slice(player_id)
+        turnover_actions, _ = self.turnovers.slice(player_id)
+
+        shot_attempts = np.bincount(shot_actions, minlength=keys)
+        points = np.bincount(shot_actions, weights=shots['points'], minlength=keys)
+        pass_counts = np.bincount(pass_actions, minlength=keys)
+        potential_assists = np.bincount(pass_actions, weights=passes['potential_assist'], minlength=keys)
+        passing_turnovers = np.bincount(pass_actions, weights=passes['turnover'], minlength=keys)
+        turnovers = np.bincount(turnover_actions, minlength=keys)
+
+        return {
+            action_type: {
+                'totalShotAttempts': int(shot_attempts[code]),
+                'totalPoints': int(points[code]),
+                'totalPasses': int(pass_counts[code]),
+                'totalPotentialAssists': int(potential_assists[code]),
+                'totalTurnovers': int(turnovers[code]),
+                'totalPassingTurnovers': int(passing_turnovers[code]),
+            }
+            for code, action_type in enumerate(ACTION_KEYS)
+        }
+
+    def action_events(self, player_id, include=EVENT_KINDS):
+        """
+        One player's location payloads per action type for the event kinds in
+        include, shaped like fetch_event_locations()[player_id].
+        """
+        events, _ = self.event_page(player_id, include)
+        return events
+
+    def event_page(self, player_id, include=EVENT_KINDS, after=None, limit=None):
+        """
+        One page of a player's location payloads, shaped like
+        fetch_event_page(): at most limit events of each kind after the
+        event IDs in after. Returns (events, next_after).
+        """
+        windows = {}
+        next_after = {}
+        for kind in include:
+            actions, columns = getattr(self, kind).slice(player_id)
+            start = 0
+            if after is not None:
+                start = int(np.searchsorted(columns['id'], after[kind], side='right'))
+            end = len(actions) if limit is None else min(start + limit, len(actions))
+            if end < len(actions):
+                next_after[kind] = int(columns['id'][end - 1])
+            windows[kind] = (actions[start:end], {name: column[start:end] for name, column in columns.items()})
+
+        events = {}
+        for code, action_type in enumerate(ACTION_TYPES):
+            action_events = {}
+            if 'shots' in windows:
+                shot_actions, shots = windows['shots']
+                shot_mask = shot_actions == code
+                action_events['shots'] = [
+                    {'loc': [x, y], 'points': points}
+                    for x, y, points in zip(
+                        to_locations(shots['x'][shot_mask]),
+                        to_locations(shots['y'][shot_mask]),
+                        shots['points'][shot_mask].tolist(),
+                    )
+                ]
+            if 'passes' in windows:
+                pass_actions, passes = windows['passes']
+                pass_mask = pass_actions == code
+                action_events['passes'] = [
+                    {
+                        'startLoc': [start_x, start_y],
+                        'endLoc': [end_x, end_y],
+                        'isCompleted': completed,
+                        'isPotentialAssist': potential_assist,
+                        'isTurnover': turnover,
+                    }
+                    for start_x, start_y, end_x, end_y, completed, potential_assist, turnover in zip(
+                        to_locations(passes['start_x'][pass_mask]),
+                        to_locations(passes['start_y'][pass_mask]),
+                        to_locations(passes['end_x'][pass_mask]),
+                        to_locations(passes['end_y'][pass_mask]),
+                        passes['completed'][pass_mask].tolist(),
+                        passes['potential_assist'][pass_mask].tolist(),
+                        passes['turnover'][pass_mask].tolist(),
+                    )
+                ]
+            if 'turnovers' in windows:
+                turnover_actions, turnovers = windows['turnovers']
+                turnover_mask = turnover_actions == code
+                action_events['turnovers'] = [
+                    {'loc': [x, y]}
+                    for x, y in zip(
+                        to_locations(turnovers['x'][turnover_mask]),
+                        to_locations(turnovers['y'][turnover_mask]),
+                    )
+                ]
+            events[action_type] = action_events
+        return events, next_after or None
+
+    def player_stats(self):
+        """
+        Every player's ten ranked stats, computed with one bincount per stat
+        over the whole league. Returns {player_id: stats} for RankIndex.
+        """
+        player_ids = np.array(sorted(self.player_names), dtype=np.int64)
+        player_count = len(player_ids)
+
+        shot_index = np.searchsorted(player_ids, self.shots.player)
+        pass_index = np.searchsorted(player_ids, self.passes.player)
+        turnover_index = np.searchsorted(player_ids, self.turnovers.player)
+
+        shot_counts = self.shots.per_player_counts(shot_index, player_count)
+        pass_counts = self.passes.per_player_counts(pass_index, player_count)
+        turnover_counts = self.turnovers.per_player_counts(turnover_index, player_count)
+        action_counts = shot_counts + pass_counts + turnover_counts
+
+        stats = {
+            'totalShotAttempts': shot_counts.sum(axis=1),
+            'totalPoints': np.bincount(shot_index, weights=self.shots.columns['points'], minlength=player_count),
+            'totalPasses': pass_counts.sum(axis=1),
+            'totalPotentialAssists': np.bincount(
+                pass_index, weights=self.passes.columns['potential_assist'], minlength=player_count
+            ),
+            'totalTurnovers': turnover_counts.sum(axis=1),
+            'totalPassingTurnovers': np.bincount(
+                pass_index, weights=self.passes.columns['turnover'], minlength=player_count
+            ),
+        }
+        for code, action_type in enumerate(ACTION_TYPES):
+            stats[f'{action_type}Count'] = action_counts[:, code]
+
+        columns = {stat: values.astype(np.int64).tolist() for stat, values in stats.items()}
+        return {
+            player_id: {stat: values[index] for stat, values in columns.items()}
+            for index, player_id in enumerate(player_ids.tolist())
+        }
+
+
+_event_store = None
+_event_store_lock = threading.Lock()
+
+
+def get_event_store():
+    """
+    Return the process-wide event store, refreshed once the data version
+    moves on: patched for just the changed players when the data change log
+    says which (e.g. after an ingested batch), reloaded otherwise (e.g. when
+    a loader finishes). The new store replaces the old one in a single
+    assignment, and other threads keep answering from the old store while
+    the refresh runs.
+    """
+    global _event_store
+    version, _ = get_data_version()
+    store = _event_store
+    if store is not None and store.version == version:
+        return store
+
+    if not _event_store_lock.acquire(blocking=store is None):
+        return store
+    try:
+        if _event_store is None or _event_store.version != version:
+            changed = get_data_changes(_event_store.version, version) if _event_store is not None else None
+            if changed is not None:
+                _event_store = _event_store.patched(changed, version)
+                return _event_store
+            _event_store = EventStore.load(version=version)
+            LOGGER.info(
+                'Loaded event store for data version %s: %s shots, %s passes, %s turnovers',
+                version, len(_event_store.shots.player), len(_event_store.passes.player),
+                len(_event_store.turnovers.player),
+            )
+        return _event_store
+    finally:
+        _event_store_lock.release()
+
+
+def event_store_lags(version):
+    """
+    Whether the columnar engine is answering from a store older than
+    version, as it does while another thread refreshes it (the store is
+    brought up to date here first when it can be). Payloads computed
+    meanwhile may predate version, so they must not be cached or validated
+    under it.
+    """
+    return settings.SUMMARY_ENGINE == 'columnar' and get_event_store().version != version
@@ -0,0 +1,160 @@
+import math
+import time
+from collections import defaultdict
+
+from django.db import transaction
+
+from app.dbmodels.models import Game, Pass, Player, Shot, Turnover
+from app.helpers.data_version import lock_data_version, mark_data_changed
+from app.helpers.loaders import DEFAULT_BATCH_SIZE, pass_fields, shot_fields, turnover_fields
+from app.helpers.metrics import record_ingest
+from app.helpers.players import ACTION_TYPES
+from app.helpers.rollup import apply_event_deltas
+from app.helpers.wire_format import COORDINATE_DECIMALS
+
+# Fields every event carries, and the fields of each event type on top of
+# them, with the JSON type each must have. Names match the raw data files.
+COMMON_FIELDS = {'id': int, 'player_id': int, 'game_id': int, 'action_type': str}
+
+# type -> (model, response key, row builder, fields). The float fields are
+# court locations, rounded to COORDINATE_DECIMALS like the raw data files,
+# so the columnar layout's fixed-point coordinates stay exact.
+INGEST_TYPES = {
+    'shot': (Shot, 'shots', shot_fields, {
+        'points': int,
+        'shooting_foul_drawn': bool,
+        'shot_loc_x': float,
+        'shot_loc_y': float,
+    }),
+    'pass': (Pass, 'passes', pass_fields, {
+        'completed_pass': bool,
+        'potential_assist': bool,
+        'turnover': bool,
+        'ball_start_loc_x': float,
+        'ball_start_loc_y': float,
+        'ball_end_loc_x': float,
+        'ball_end_loc_y': float,
+    }),
+    'turnover': (Turnover, 'turnovers', turnover_fields, {
+        'tov_loc_x': float,
+        'tov_loc_y': float,
+    }),
+}
+
+
+def valid_value(value, kind):
+    if kind is bool:
+        return isinstance(value, bool)
+    if isinstance(value, bool):
+        return False
+    if kind is float:
+        return isinstance(value, (int, float)) and math.isfinite(value)
+    return isinstance(value, kind)
+
+
+def event_error(event):
+    """
+    Why event is malformed, or None when it is a well-formed shot, pass or
+    turnover.
+    """
+    if not isinstance(event, dict):
+        return 'Expected an event object'
+    if event.get('type') not in INGEST_TYPES:
+        return f"type must be one of {', '.join(INGEST_TYPES)}"
+    fields = COMMON_FIELDS | INGEST_TYPES[event['type']][3]
+    missing = [field for field in fields if field not in event]
+    if missing:
+        return f"Missing {', '.join(missing)}"
+    invalid = [field for field, kind in fields.items() if not valid_value(event[field], kind)]
+    if invalid:
+        return f"Invalid {', '.join(invalid)}"
+    if event['action_type'] not in ACTION_TYPES:
+        return f"Unknown action_type {event['action_type']}"
+    return None
+
+
+def ingest_events(events, batch_size=DEFAULT_BATCH_SIZE):
+    """
+    Validate and insert a batch of mixed shots, passes and turnovers (dicts
+    with a type of shot, pass or turnover plus the raw data fields and
+    player_id). Locations are rounded to two decimals, as in the raw data.
+    Players and games are checked with one query each, events are written
+    with bulk_create in batches, and the PlayerGameStats rollup is updated
+    in the same transaction. The data version is bumped when it
+    commits, scoped to the players that got new events, so only their
+    cached summaries, rank entries and event columns are refreshed.
+
+    Ingestion is idempotent on event IDs: events whose ID is already stored,
+    or repeated earlier in the batch, are skipped and counted as duplicates.
+    Malformed events, and events for unknown players or games, are reported
+    in errors ({'index', 'id', 'error'}), and then nothing is written, so a
+    corrected batch can be posted again as a whole.
+    """
+    start = time.perf_counter()
+    errors = []
+    candidates = []
+    for index, event in enumerate(events):
+        error = event_error(event)
+        if error is not None:
+            errors.append({'index': index, 'id': event.get('id') if isinstance(event, dict) else None, 'error': error})
+        else:
+            candidates.append((index, event))
+
+    player_ids = set(Player.objects.filter(
+        player_id__in={event['player_id'] for _, event in candidates}
+    ).values_list('player_id', flat=True))
+    game_ids = set(Game.objects.filter(
+        game_id__in={event['game_id'] for _, event in candidates}
+    ).values_list('game_id', flat=True))
+
+    rows = defaultdict(dict)
+    duplicates = 0
+    for index, event in candidates:
+        if event['player_id'] not in player_ids:
+            errors.append({'index': index, 'id': event['id'], 'error': f"Player {event['player_id']} not found"})
+            continue
+        if event['game_id'] not in game_ids:
+            errors.append({'index': index, 'id': event['id'], 'error': f"Game {event['game_id']} not found"})
+            continue
+        model, _, build_fields, fields = INGEST_TYPES[event['type']]
+        if event['id'] in rows[model]:
+            duplicates += 1
+            continue
+        locations = {field: round(event[field], COORDINATE_DECIMALS) for field, kind in fields.items() if kind is float}
+        rows[model][event['id']] = build_fields(event['player_id'], event | locations)
+
+    created = {key: 0 for _, key, _, _ in INGEST_TYPES.values()}
+    if errors:
+        errors.sort(key=lambda error: error['index'])
+        record_ingest(created, 0, len(errors), time.perf_counter() - start)
+        return {'received': len(events), 'created': created, 'duplicates': 0, 'errors': errors}
+
+    with transaction.atomic():
+        # Serializes concurrent batches, so two posts of the same events
+        # cannot both find them missing and count them twice in the rollup.
+        lock_data_version()
+        new_events = []
+        for model, key, _, _ in INGEST_TYPES.values():
+            model_rows = list(rows[model].values())
+            for offset in range(0, len(model_rows), batch_size):
+                batch = model_rows[offset:offset + batch_size]
+                existing = set(model.objects.filter(
+                    pk__in=[row[model._meta.pk.attname] for row in batch]
+                ).values_list('pk', flat=True))
+                new_objects = [model(**row) for row in batch if row[model._meta.pk.attname] not in existing]
+                model.objects.bulk_create(new_objects, batch_size=batch_size)
+                new_events += new_objects
+                created[key] += len(new_objects)
+                duplicates += len(batch) - len(new_objects)
+
+        if new_events:
+            apply_event_deltas(new_events)
+            mark_data_changed({event.player_id for event in new_events})
+
+    record_ingest(created, duplicates, 0, time.perf_counter() - start)
+    return {
+        'received': len(events),
+        'created': created,
+        'duplicates': duplicates,
+        'errors': errors,
+    }
@@ -0,0 +1,546 @@
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import django
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+from app.dbmodels.models import (
+    Team, Game, Player, Shot, Pass, Turnover, IngestCheckpoint, IngestedGame, PlayerGameStats,
+)
+from app.helpers.data_version import bump_data_version
+from app.helpers.db_pool import close_pools
+from app.helpers.metrics import record_load
+from app.helpers.raw_data import READ_SIZE, iter_players
+from app.helpers.rollup import delete_events, refresh_player_game_stats
+
+RAW_DATA_DIR = os.path.join(settings.BASE_DIR, 'raw_data')
+
+LOAD_MODES = ['row', 'bulk', 'copy']
+
+DEFAULT_BATCH_SIZE = 5000
+
+
+def shot_fields(player_id, shot_data):
+    return {
+        'shot_id': shot_data['id'],
+        'player_id': player_id,
+        'game_id': shot_data['game_id'],
+        'points': shot_data['points'],
+        'shooting_foul_drawn': shot_data['shooting_foul_drawn'],
+        'shot_loc_x': shot_data['shot_loc_x'],
+        'shot_loc_y': shot_data['shot_loc_y'],
+        'action_type': shot_data['action_type'],
+    }
+
+
+def pass_fields(player_id, pass_data):
+    return {
+        'pass_id': pass_data['id'],
+        'player_id': player_id,
+        'game_id': pass_data['game_id'],
+        'completed_pass': pass_data['completed_pass'],
+        'potential_assist': pass_data['potential_assist'],
+        'turnover': pass_data['turnover'],
+        'ball_start_loc_x': pass_data['ball_start_loc_x'],
+        'ball_start_loc_y': pass_data['ball_start_loc_y'],
+        'ball_end_loc_x': pass_data['ball_end_loc_x'],
+        'ball_end_loc_y': pass_data['ball_end_loc_y'],
+        'action_type': pass_data['action_type'],
+    }
+
+
+def turnover_fields(player_id, turnover_data):
+    return {
+        'turnover_id': turnover_data['id'],
+        'player_id': player_id,
+        'game_id': turnover_data['game_id'],
+        'tov_loc_x': turnover_data['tov_loc_x'],
+        'tov_loc_y': turnover_data['tov_loc_y'],
+        'action_type': turnover_data['action_type'],
+    }
+
+
+# (key in players.json, model, row builder)
+EVENT_TYPES = [
+    ('shots', Shot, shot_fields),
+    ('passes', Pass, pass_fields),
+    ('turnovers', Turnover, turnover_fields),
+]
+
+
+def read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def game_content_hashes(players_data):
+    """
+    SHA-256 of every game's events across all players, in file order.
+    """
+    digests = defaultdict(hashlib.sha256)
+    for player_data in players_data:
+        for key, _, _ in EVENT_TYPES:
+            for event_data in player_data.get(key, []):
+                digests[event_data['game_id']].update(
+                    json.dumps([player_data['player_id'], key, event_data], sort_keys=True).encode()
+                )
+    return {game_id: digest.hexdigest() for game_id, digest in digests.items()}
+
+
+def stored_event_games(game_ids):
+    """
+    The IDs among game_ids that already have shots, passes or turnovers.
+    """
+    stored = set()
+    for _, model, _ in EVENT_TYPES:
+        stored.update(model.objects.filter(game_id__in=game_ids).values_list('game_id', flat=True).distinct())
+    return stored
+
+
+def copy_value(value):
+    """
+    Encode a value for PostgreSQL's COPY text format.
+    """
+    if value is None:
+        return '\\N'
+    if isinstance(value, bool):
+        return 't' if value else 'f'
+    return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+
+class BulkLoader:
+    """
+    Loads the raw_data files with batched writes instead of one
+    get_or_create per row. Each file is parsed once, foreign keys are
+    resolved against in-memory ID sets, and rows whose primary key already
+    exists are skipped, so loading the same files twice is a no-op.
+
+    mode='bulk' writes through bulk_create; mode='copy' streams each batch
+    into a temporary table with PostgreSQL COPY and inserts from there with
+    ON CONFLICT DO NOTHING.
+
+    players.json is streamed rather than loaded whole, so memory stays
+    bounded by the largest single player record plus one batch.
+    """
+
+    def __init__(self, mode='bulk', batch_size=DEFAULT_BATCH_SIZE, log=print):
+        if mode not in ('bulk', 'copy'):
+            raise ValueError(f'Unsupported bulk load mode: {mode}')
+        if mode == 'copy' and connection.vendor != 'postgresql':
+            raise ValueError('The copy load mode requires PostgreSQL')
+        self.mode = mode
+        self.batch_size = batch_size
+        self.log = log
+        self.stats = defaultdict(lambda: {'rows': 0, 'skipped': 0, 'seconds': 0.0})
+
+    def load_all(self, data_dir=RAW_DATA_DIR):
+        self.load_teams(read_json(os.path.join(data_dir, 'teams.json')))
+        self.load_games(read_json(os.path.join(data_dir, 'games.json')))
+        self.load_players(iter_players(os.path.join(data_dir, 'players.json')))
+
+        bump_data_version()
+        self.report()
+
+    def load_teams(self, teams_data):
+        self.log('Loading teams...')
+        self.write_rows(Team, [
+            {'team_id': team_data['team_id'], 'name': team_data['name']}
+            for team_data in teams_data
+        ])
+
+    def load_games(self, games_data):
+        self.log('Loading games...')
+        self.write_rows(Game, [
+            {'game_id': game_data['id'], 'date': datetime.strptime(game_data['date'], '%Y-%m-%d').date()}
+            for game_data in games_data
+        ])
+
+    def load_roster(self, players_data):
+        """
+        Load only the player rows from players_data, without their events.
+        """
+        self.log('Loading players...')
+        team_ids = set(Team.objects.values_list('team_id', flat=True))
+        rows = []
+        for player_data in players_data:
+            if player_data['team_id'] not in team_ids:
+                self.log(f'  Warning: Team with ID {player_data["team_id"]} not found for player {player_data["name"]}')
+                continue
+            rows.append({
+                'player_id': player_data['player_id'],
+                'name': player_data['name'],
+                'team_id': player_data['team_id'],
+            })
+            if len(rows) >= self.batch_size:
+                self.write_rows(Player, rows)
+                rows = []
+        self.write_rows(Player, rows)
+
+    def load_players(self, players_data, start=(0, 0), only_games=None, with_roster=True):
+        """
+        Load players and their shots, passes and turnovers in a single pass
+        over players_data, which may be a stream: only the pending rows are
+        held in memory, and they are written together once batch_size events
+        are pending.
+
+        start is a (player offset, event offset) position to resume from;
+        the event offset indexes the player's shots, passes and turnovers in
+        that order. only_games restricts the load to events in those games.
+        with_roster=False loads only events, for players already loaded by
+        load_roster.
+        """
+        self.log('Loading players, shots, passes and turnovers...')
+        team_ids = set(Team.objects.values_list('team_id', flat=True))
+        game_ids = set(Game.objects.values_list('game_id', flat=True))
+        player_ids = set(Player.objects.values_list('player_id', flat=True))
+
+        self.pending = {model: [] for model in (Player, Shot, Pass, Turnover)}
+        pending_events = 0
+        start_player, start_event = start
+        position = start
+
+        for player_offset, player_data in enumerate(players_data):
+            if player_offset < start_player:
+                continue
+
+            player_id = player_data['player_id']
+            if player_id not in player_ids and not with_roster:
+                self.log(f'  Warning: Player {player_id} not found for events')
+                position = (player_offset + 1, 0)
+                continue
+            if player_id not in player_ids and player_data['team_id'] not in team_ids:
+                self.log(f'  Warning: Team with ID {player_data["team_id"]} not found for player {player_data["name"]}')
+                position = (player_offset + 1, 0)
+                continue
+            if with_roster:
+                self.pending[Player].append({
+                    'player_id': player_id,
+                    'name': player_data['name'],
+                    'team_id': player_data['team_id'],
+                })
+                player_ids.add(player_id)
+
+            events = [
+                (model, build_fields, event_data)
+                for key, model, build_fields in EVENT_TYPES
+                for event_data in player_data.get(key, [])
+            ]
+            first_event = start_event if player_offset == start_player else 0
+            for event_offset in range(first_event, len(events)):
+                model, build_fields, event_data = events[event_offset]
+                if only_games is not None and event_data['game_id'] not in only_games:
+                    continue
+                if event_data['game_id'] not in game_ids:
+                    self.log(f'  Warning: Game {event_data["game_id"]} not found for {model.__name__.lower()} {event_data["id"]}')
+                    continue
+                self.pending[model].append(build_fields(player_id, event_data))
+                pending_events += 1
+                if pending_events >= self.batch_size:
+                    self.flush((player_offset, event_offset + 1))
+                    pending_events = 0
+
+            position = (player_offset + 1, 0)
+            if len(self.pending[Player]) >= self.batch_size:
+                self.flush(position)
+                pending_events = 0
+
+        self.flush(position)
+
+    def flush(self, position):
+        """
+        Write every pending row, players first so events can reference them,
+        then refresh the PlayerGameStats rollup of the players and games
+        whose events were written. position is where loading would resume
+        once this flush is durable. Returns the number of rows created.
+        """
+        event_player_ids = set()
+        event_game_ids = set()
+        for _, model, _ in EVENT_TYPES:
+            for row in self.pending[model]:
+                event_player_ids.add(row['player_id'])
+                event_game_ids.add(row['game_id'])
+        created = 0
+        for model, rows in self.pending.items():
+            created += self.write_rows(model, rows)
+            rows.clear()
+        self.refresh_rollup(event_player_ids, event_game_ids)
+        return created
+
+    def refresh_rollup(self, player_ids, game_ids):
+        """
+        Recount the rollup for player_ids within game_ids only, so a player
+        whose events span several flushes has just the games written by
+        each flush rescanned, not all of their games every time.
+        """
+        if not player_ids:
+            return
+        start = time.perf_counter()
+        rows = refresh_player_game_stats(sorted(player_ids), sorted(game_ids))
+        stats = self.stats[PlayerGameStats._meta.db_table]
+        stats['rows'] += rows
+        stats['seconds'] += time.perf_counter() - start
+
+    def write_rows(self, model, rows):
+        """
+        Insert one batch of field dicts, skipping primary keys that already
+        exist. Returns the number of rows created.
+        """
+        if not rows:
+            return 0
+
+        start = time.perf_counter()
+        if self.mode == 'copy':
+            created = self.copy_rows(model, rows)
+        else:
+            created = self.bulk_create_rows(model, rows)
+
+        stats = self.stats[model._meta.db_table]
+        stats['rows'] += created
+        stats['skipped'] += len(rows) - created
+        stats['seconds'] += time.perf_counter() - start
+        return created
+
+    def bulk_create_rows(self, model, rows):
+        pk_name = model._meta.pk.attname
+        existing = set(
+            model.objects.filter(pk__in=[row[pk_name] for row in rows]).values_list('pk', flat=True)
+        )
+        new_objects = [model(**row) for row in rows if row[pk_name] not in existing]
+        model.objects.bulk_create(new_objects, batch_size=self.batch_size, ignore_conflicts=True)
+        return len(new_objects)
+
+    def copy_rows(self, model, rows):
+        quote_name = connection.ops.quote_name
+        table = quote_name(model._meta.db_table)
+        staging_table = quote_name(f'staging_{model._meta.db_table}')
+        columns = ', '.join(quote_name(column) for column in rows[0])
+        pk_column = quote_name(model._meta.pk.column)
+
+        buffer = io.StringIO()
+        for row in rows:
+            buffer.write('\t'.join(copy_value(value) for value in row.values()))
+            buffer.write('\n')
+        buffer.seek(0)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'CREATE TEMP TABLE IF NOT EXISTS {staging_table} (LIKE {table} INCLUDING DEFAULTS)')
+            cursor.execute(f'TRUNCATE {staging_table}')
+            copy_sql = f'COPY {staging_table} ({columns}) FROM STDIN'
+            if hasattr(cursor.cursor, 'copy_expert'):
+                cursor.cursor.copy_expert(copy_sql, buffer)
+            else:
+                with cursor.cursor.copy(copy_sql) as copy:
+                    copy.write(buffer.getvalue())
+            cursor.execute(
+                f'INSERT INTO {table} ({columns}) SELECT {columns} FROM {staging_table} '
+                f'ON CONFLICT ({pk_column}) DO NOTHING'
+            )
+            return cursor.rowcount
+
+    def report(self):
+        for table, stats in self.stats.items():
+            seconds = stats['seconds']
+            record_load(table, stats['rows'], seconds)
+            rate = stats['rows'] / seconds if seconds else 0
+            self.log(
+                f'  Loaded {stats["rows"]} {table} ({stats["skipped"]} already present) '
+                f'in {seconds:.2f}s, {rate:,.0f} rows/s'
+            )
+
+
+class IncrementalLoader(BulkLoader):
+    """
+    Resumable variant of BulkLoader. Every flush commits in its own
+    transaction together with an IngestCheckpoint row holding the position
+    to resume from, so a failure only loses the current batch and a rerun
+    continues where the last one stopped.
+
+    players.json is skipped entirely when a completed checkpoint exists for
+    its content hash. Otherwise only games whose event content hash differs
+    from the last completed load, or that no incremental load has recorded,
+    are loaded; events already stored for such a game are replaced.
+    """
+
+    def load_all(self, data_dir=RAW_DATA_DIR):
+        self.load_teams(read_json(os.path.join(data_dir, 'teams.json')))
+        self.load_games(read_json(os.path.join(data_dir, 'games.json')))
+
+        players_path = os.path.abspath(os.path.join(data_dir, 'players.json'))
+        content_hash = file_sha256(players_path)
+        checkpoint = IngestCheckpoint.objects.filter(source=players_path, content_hash=content_hash).first()
+        if checkpoint is not None and checkpoint.completed:
+            self.log(f'  {players_path} is unchanged since the last load, skipping')
+            return
+
+        game_hashes = game_content_hashes(iter_players(players_path))
+        ingested = dict(IngestedGame.objects.values_list('game_id', 'content_hash'))
+        changed_games = {game_id for game_id, game_hash in game_hashes.items() if ingested.get(game_id) != game_hash}
+
+        if checkpoint is None:
+            with transaction.atomic():
+                # A changed game may hold events from an earlier load that
+                # recorded no hashes (a bulk or row load), not just from an
+                # earlier incremental one, so check the event tables.
+                stale_games = sorted(stored_event_games(changed_games))
+                delete_events([model.objects.filter(game_id__in=stale_games) for _, model, _ in EVENT_TYPES])
+                IngestCheckpoint.objects.filter(source=players_path).delete()
+                checkpoint = IngestCheckpoint.objects.create(source=players_path, content_hash=content_hash)
+            self.log(f'  {len(changed_games)} new or changed games ({len(stale_games)} to replace)')
+        else:
+            self.log(f'  Resuming at player {checkpoint.player_offset}, event {checkpoint.event_offset}')
+
+        self.checkpoint = checkpoint
+        self.load_players(
+            iter_players(players_path),
+            start=(checkpoint.player_offset, checkpoint.event_offset),
+            only_games=changed_games,
+        )
+
+        game_ids = set(Game.objects.values_list('game_id', flat=True))
+        with transaction.atomic():
+            IngestedGame.objects.bulk_create(
+                [
+                    IngestedGame(game_id=game_id, content_hash=game_hashes[game_id])
+                    for game_id in changed_games if game_id in game_ids
+                ],
+                update_conflicts=True,
+                unique_fields=['game'],
+                update_fields=['content_hash', 'updated_at'],
+            )
+            checkpoint.completed = True
+            checkpoint.save(update_fields=['completed', 'updated_at'])
+
+        bump_data_version()
+        self.report()
+
+    def flush(self, position):
+        with transaction.atomic():
+            created = super().flush(position)
+            self.checkpoint.player_offset, self.checkpoint.event_offset = position
+            self.checkpoint.rows_loaded += created
+            self.checkpoint.save(update_fields=['player_offset', 'event_offset', 'rows_loaded', 'updated_at'])
+        return created
+
+
+def split_players(records, paths):
+    """
+    Yield every player record from records, (record, source text) pairs as
+    from iter_players(with_text=True), after copying its text to one of the
+    NDJSON files at paths in turn (player offset modulo the number of
+    paths). The shards are split in the pass that reads the records, and
+    without encoding them again.
+    """
+    files = [open(path, 'w') for path in paths]
+    try:
+        for offset, (player_data, text) in enumerate(records):
+            shard_file = files[offset % len(files)]
+            # Line breaks in JSON text can only be whitespace between tokens.
+            shard_file.write(text.replace('\r', ' ').replace('\n', ' '))
+            shard_file.write('\n')
+            yield player_data
+    finally:
+        for shard_file in files:
+            shard_file.close()
+
+
+def load_shard(shard_path, mode, batch_size):
+    """
+    Process pool entry point: load the events of one shard of players (an
+    NDJSON file written by split_players) in a single transaction on the
+    worker's own database connection, and return the worker's load stats.
+    """
+    django.setup()
+    loader = BulkLoader(mode=mode, batch_size=batch_size, log=lambda message: None)
+    try:
+        with transaction.atomic():
+            loader.load_players(iter_players(shard_path), with_roster=False)
+    finally:
+        connections.close_all()
+    return dict(loader.stats)
+
+
+class ParallelLoader(BulkLoader):
+    """
+    Loads teams, games and players serially, then splits the shot, pass and
+    turnover inserts by player across a pool of worker processes. Each shard
+    commits atomically and inserts skip existing IDs, so a failed shard can
+    simply be retried and the result matches a serial load.
+
+    players.json is parsed once: the roster pass also writes each shard's
+    player records to its own NDJSON file, so a worker decodes only its
+    shard rather than the whole file.
+    """
+
+    def __init__(self, workers, retries=2, **kwargs):
+        super().__init__(**kwargs)
+        self.workers = workers
+        self.retries = retries
+
+    def load_all(self, data_dir=RAW_DATA_DIR):
+        self.load_teams(read_json(os.path.join(data_dir, 'teams.json')))
+        self.load_games(read_json(os.path.join(data_dir, 'games.json')))
+        with tempfile.TemporaryDirectory() as shard_dir:
+            shard_paths = [os.path.join(shard_dir, f'players-{shard}.ndjson') for shard in range(self.workers)]
+            records = iter_players(os.path.join(data_dir, 'players.json'), with_text=True)
+            self.load_roster(split_players(records, shard_paths))
+            failed = self.load_shards(shard_paths)
+
+        bump_data_version()
+        self.report()
+        if failed:
+            raise RuntimeError(
+                f'Shards {sorted(failed)} of {self.workers} failed after {self.retries + 1} attempts'
+            )
+
+    def load_shards(self, shard_paths):
+        """
+        Load every shard's events on the worker pool, retrying failed
+        shards. Returns {shard: exception} for the shards that still failed.
+        """
+        self.log(f'Loading shots, passes and turnovers with {self.workers} workers...')
+        # Workers must open their own connections (and pools) rather than
+        # inherit this process's.
+        connections.close_all()
+        close_pools()
+
+        shards = list(range(self.workers))
+        attempts = defaultdict(int)
+        failed = {}
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            while shards:
+                futures = {
+                    shard: pool.submit(load_shard, shard_paths[shard], self.mode, self.batch_size)
+                    for shard in shards
+                }
+                shards = []
+                for shard, future in futures.items():
+                    attempts[shard] += 1
+                    try:
+                        shard_stats = future.result()
+                    except Exception as e:
+                        self.log(f'  Shard {shard} failed (attempt {attempts[shard]}): {e}')
+                        if attempts[shard] <= self.retries:
+                            shards.append(shard)
+                        else:
+                            failed[shard] = e
+                        continue
+                    for table, stats in shard_stats.items():
+                        for key, value in stats.items():
+                            self.stats[table][key] += value
+        return failed
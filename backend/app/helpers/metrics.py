@@ -0,0 +1,118 @@
+"""
+Prometheus metrics for /metrics: request latency and database time per
+route, summary cache hits and misses, loader throughput, and live event
+ingestion.
+
+With several worker processes, set PROMETHEUS_MULTIPROC_DIR to a directory
+shared by the workers (and by management commands such as
+load_sample_data) before starting them, and empty it on each deploy. Every
+process then writes its samples to files there and /metrics aggregates
+them, whichever worker answers. Without it, each process reports only its
+own samples.
+"""
+import os
+
+METRICS_DIR = os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+if METRICS_DIR:
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+try:
+    import prometheus_client
+    from prometheus_client import multiprocess
+except ImportError:
+    prometheus_client = None
+
+# Seconds; finer at the low end, where cached and single-player requests land.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1, 2.5, 5, 10)
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = prometheus_client.Histogram(
+        'api_request_duration_seconds', 'Request latency by route',
+        ['route', 'method', 'status'], buckets=LATENCY_BUCKETS,
+    )
+    REQUEST_DB_TIME = prometheus_client.Histogram(
+        'api_request_db_seconds', 'Database time per request by route',
+        ['route'], buckets=LATENCY_BUCKETS,
+    )
+    DB_QUERIES = prometheus_client.Counter(
+        'api_db_queries', 'Database queries by route', ['route'],
+    )
+    CACHE_REQUESTS = prometheus_client.Counter(
+        'summary_cache_requests', 'Summary cache lookups by key kind and result', ['kind', 'result'],
+    )
+    LOADER_ROWS = prometheus_client.Counter(
+        'loader_rows', 'Rows written by the loaders by table', ['entity'],
+    )
+    LOADER_SECONDS = prometheus_client.Counter(
+        'loader_seconds', 'Seconds the loaders spent writing each table', ['entity'],
+    )
+    LOADER_THROUGHPUT = prometheus_client.Gauge(
+        'loader_rows_per_second', 'Rows per second of the most recent load by table',
+        ['entity'], multiprocess_mode='mostrecent',
+    )
+    # Kept apart from the loader metrics, so live ingestion batches do not
+    # overwrite the throughput of the last bulk load.
+    INGEST_EVENTS = prometheus_client.Counter(
+        'ingest_events', 'Events received by /api/v1/events by table and outcome', ['entity', 'result'],
+    )
+    INGEST_BATCH_SECONDS = prometheus_client.Histogram(
+        'ingest_batch_seconds', 'Seconds spent validating and writing one ingested batch',
+        buckets=LATENCY_BUCKETS,
+    )
+
+
+def observe_request(route, method, status, seconds, db_seconds, queries):
+    if prometheus_client is None:
+        return
+    REQUEST_LATENCY.labels(route, method, status).observe(seconds)
+    REQUEST_DB_TIME.labels(route).observe(db_seconds)
+    if queries:
+        DB_QUERIES.labels(route).inc(queries)
+
+
+def record_cache_lookup(key, hit):
+    """
+    Count a summary cache lookup under its key's kind (see cache_key).
+    """
+    if prometheus_client is None:
+        return
+    CACHE_REQUESTS.labels(key.split(':', 1)[0], 'hit' if hit else 'miss').inc()
+
+
+def record_load(entity, rows, seconds):
+    if prometheus_client is None:
+        return
+    LOADER_ROWS.labels(entity).inc(rows)
+    LOADER_SECONDS.labels(entity).inc(seconds)
+    if seconds:
+        LOADER_THROUGHPUT.labels(entity).set(rows / seconds)
+
+
+def record_ingest(created, duplicates, errors, seconds):
+    """
+    Count one ingested batch: created is {table: rows}, duplicates and
+    errors are event counts for the whole batch.
+    """
+    if prometheus_client is None:
+        return
+    for entity, rows in created.items():
+        if rows:
+            INGEST_EVENTS.labels(entity, 'created').inc(rows)
+    if duplicates:
+        INGEST_EVENTS.labels('all', 'duplicate').inc(duplicates)
+    if errors:
+        INGEST_EVENTS.labels('all', 'error').inc(errors)
+    INGEST_BATCH_SECONDS.observe(seconds)
+
+
+def render_metrics():
+    """
+    (body, content type) of every metric in Prometheus text format,
+    aggregated across processes in multiprocess mode.
+    """
+    if METRICS_DIR:
+        registry = prometheus_client.CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return prometheus_client.generate_latest(registry), prometheus_client.CONTENT_TYPE_LATEST
@@ -1,247 +1,440 @@
+import asyncio
+import base64
+import functools
 import json
 import os
 import random
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.db.models import Sum
 
 from app.dbmodels import models
+from app.helpers.event_store import EVENT_KINDS, get_event_store
+from app.helpers.query_budget import query_budget
+from app.helpers.rollup import ROLLUP_COLUMNS
+
+ACTION_TYPES = [action_type for action_type, _ in models.Shot.ACTION_TYPES]
+
+TOTAL_KEYS = [
+    'totalShotAttempts',
+    'totalPoints',
+    'totalPasses',
+    'totalPotentialAssists',
+    'totalTurnovers',
+    'totalPassingTurnovers',
+]
+
+# Queries get_player_summary_stats may issue, however many events the player
+# has: the player lookup, one grouped aggregate over the rollup and one
+# location fetch per event table.
+SUMMARY_QUERY_BUDGET = 5
+
+
+def empty_totals():
+    return {key: 0 for key in TOTAL_KEYS}
+
+
+def empty_action_stats(include=EVENT_KINDS):
+    return empty_totals() | {kind: [] for kind in include}
+
+
+def window_game_ids(date_from=None, date_to=None, game_ids=None):
+    """
+    Resolve a summary window, an inclusive game date range and/or a list of
+    game IDs, to the sorted IDs of the games it covers. Returns None when no
+    filter is given, meaning every game.
+    """
+    if date_from is None and date_to is None and game_ids is None:
+        return None
+
+    games = models.Game.objects.all()
+    if date_from is not None:
+        games = games.filter(date__gte=date_from)
+    if date_to is not None:
+        games = games.filter(date__lte=date_to)
+    if game_ids is not None:
+        games = games.filter(game_id__in=game_ids)
+    return list(games.order_by('game_id').values_list('game_id', flat=True))
+
+
+def action_totals_queryset(player_ids=None, games=None, team_id=None):
+    """
+    The grouped query behind aggregate_action_totals: per-player,
+    per-action-type sums over the PlayerGameStats rollup, restricted to the
+    game IDs in games when given, and to one team's players (joined through
+    players) when team_id is given.
+    """
+    stats = models.PlayerGameStats.objects.all()
+    if player_ids is not None:
+        stats = stats.filter(player_id__in=player_ids)
+    if team_id is not None:
+        stats = stats.filter(player__team_id=team_id)
+    if games is not None:
+        stats = stats.filter(game_id__in=games)
+
+    return stats.values('player_id', 'action_type').annotate(
+        **{key: Sum(column) for key, column in ROLLUP_COLUMNS.items()}
+    ).order_by()
+
+
+def aggregate_action_totals(player_ids=None, games=None, team_id=None):
+    """
+    Sum the per-game rollup per player and action type in one grouped query.
+    Returns {player_id: {action_type: totals}} for every player with at
+    least one event; pass player_ids to restrict the aggregation to those
+    players, games to those game IDs and team_id to that team's players.
+    """
+    totals = defaultdict(lambda: defaultdict(empty_totals))
+    for row in action_totals_queryset(player_ids, games, team_id):
+        totals[row['player_id']][row['action_type']] = {key: row[key] or 0 for key in TOTAL_KEYS}
+    return totals
+
+
+def event_location_querysets(player_ids, include=EVENT_KINDS, after=None, games=None):
+    """
+    The lean values_list queries behind fetch_event_locations, keyed by event
+    kind, for the kinds in include only. Rows are (event_id, player_id,
+    action_type, *payload columns) in event ID order; after, a dict of
+    {kind: event_id}, starts each kind just past that event, and games
+    restricts the events to those game IDs.
+    """
+    querysets = {}
+    if 'shots' in include:
+        querysets['shots'] = models.Shot.objects.filter(player_id__in=player_ids).order_by('shot_id').values_list(
+            'shot_id', 'player_id', 'action_type', 'shot_loc_x', 'shot_loc_y', 'points'
+        )
+    if 'passes' in include:
+        querysets['passes'] = models.Pass.objects.filter(player_id__in=player_ids).order_by('pass_id').values_list(
+            'pass_id', 'player_id', 'action_type', 'ball_start_loc_x', 'ball_start_loc_y',
+            'ball_end_loc_x', 'ball_end_loc_y', 'completed_pass', 'potential_assist', 'turnover'
+        )
+    if 'turnovers' in include:
+        querysets['turnovers'] = models.Turnover.objects.filter(
+            player_id__in=player_ids
+        ).order_by('turnover_id').values_list(
+            'turnover_id', 'player_id', 'action_type', 'tov_loc_x', 'tov_loc_y'
+        )
+
+    if games is not None:
+        querysets = {kind: queryset.filter(game_id__in=games) for kind, queryset in querysets.items()}
+    if after is not None:
+        querysets = {kind: queryset.filter(pk__gt=after[kind]) for kind, queryset in querysets.items()}
+    return querysets
+
+
+def shot_payload(loc_x, loc_y, points):
+    return {
+        'loc': [loc_x, loc_y],
+        'points': points
+    }
+
 
-def get_player_summary_stats(player_id: str):
+def pass_payload(start_x, start_y, end_x, end_y, completed, potential_assist, turnover):
+    return {
+        'startLoc': [start_x, start_y],
+        'endLoc': [end_x, end_y],
+        'isCompleted': completed,
+        'isPotentialAssist': potential_assist,
+        'isTurnover': turnover
+    }
+
+
+def turnover_payload(loc_x, loc_y):
+    return {
+        'loc': [loc_x, loc_y]
+    }
+
+
+EVENT_PAYLOADS = {
+    'shots': shot_payload,
+    'passes': pass_payload,
+    'turnovers': turnover_payload,
+}
+
+
+def collect_events(rows_by_kind):
+    """
+    Group event_location_querysets rows into
+    {player_id: {action_type: {kind: [...]}}}.
+    """
+    events = defaultdict(lambda: defaultdict(dict))
+    for kind, rows in rows_by_kind.items():
+        payload = EVENT_PAYLOADS[kind]
+        for _, player_id, action_type, *values in rows:
+            events[player_id][action_type].setdefault(kind, []).append(payload(*values))
+    return events
+
+
+def fetch_event_locations(player_ids, include=EVENT_KINDS, games=None):
+    """
+    Fetch the per-event location payloads for the given players, keyed by
+    {player_id: {action_type: {'shots': [...], 'passes': [...], 'turnovers': [...]}}}.
+    Only the kinds in include are fetched, and only the columns their
+    payloads need are selected.
+    """
+    return collect_events(event_location_querysets(player_ids, include, games=games))
+
+
+def fetch_event_page(player_id, include=EVENT_KINDS, after=None, limit=None, games=None):
+    """
+    One page of a player's event payloads: at most limit events of each kind
+    after the event IDs in after. Returns (events, next_after), where
+    next_after holds the last event ID returned for every kind that has
+    more events, or is None once every kind is exhausted.
+    """
+    rows_by_kind = {}
+    next_after = {}
+    for kind, queryset in event_location_querysets([player_id], include, after, games).items():
+        rows = list(queryset[:limit + 1])
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_after[kind] = rows[-1][0]
+        rows_by_kind[kind] = rows
+
+    return collect_events(rows_by_kind)[player_id], next_after or None
+
+
+def encode_cursor(after):
+    """
+    Opaque pagination cursor for a {kind: event_id} dict.
+    """
+    return base64.urlsafe_b64encode(json.dumps(after, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Inverse of encode_cursor. Raises ValueError for a malformed cursor.
+    """
     try:
-        player_id = int(player_id)
-        player = models.Player.objects.get(player_id=player_id)
-    except (ValueError, models.Player.DoesNotExist):
-        return {"error": "Player not found"}
-    
-    shots = models.Shot.objects.filter(player=player)
-    
-    passes = models.Pass.objects.filter(player=player)
-    
-    turnovers = models.Turnover.objects.filter(player=player)
-    total_shot_attempts = shots.count()
-    total_points = sum(shot.points for shot in shots)
-    total_passes = passes.count()
-    total_potential_assists = passes.filter(potential_assist=True).count()
-    total_turnovers = turnovers.count()
-    total_passing_turnovers = passes.filter(turnover=True).count()
-    
-    action_stats = defaultdict(lambda: {
-        'totalShotAttempts': 0,
-        'totalPoints': 0,
-        'totalPasses': 0,
-        'totalPotentialAssists': 0,
-        'totalTurnovers': 0,
-        'totalPassingTurnovers': 0,
-        'shots': [],
-        'passes': [],
-        'turnovers': []
-    })
-    
-    for shot in shots:
-        action_type = shot.action_type
-        action_stats[action_type]['totalShotAttempts'] += 1
-        action_stats[action_type]['totalPoints'] += shot.points
-        action_stats[action_type]['shots'].append({
-            'loc': [shot.shot_loc_x, shot.shot_loc_y],
-            'points': shot.points
-        })
-    
-    # Process passes by action type
-    for pass_obj in passes:
-        action_type = pass_obj.action_type
-        action_stats[action_type]['totalPasses'] += 1
-        if pass_obj.potential_assist:
-            action_stats[action_type]['totalPotentialAssists'] += 1
-        if pass_obj.turnover:
-            action_stats[action_type]['totalPassingTurnovers'] += 1
-        
-        action_stats[action_type]['passes'].append({
-            'startLoc': [pass_obj.ball_start_loc_x, pass_obj.ball_start_loc_y],
-            'endLoc': [pass_obj.ball_end_loc_x, pass_obj.ball_end_loc_y],
-            'isCompleted': pass_obj.completed_pass,
-            'isPotentialAssist': pass_obj.potential_assist,
-            'isTurnover': pass_obj.turnover
-        })
-    
-    for turnover in turnovers:
-        action_type = turnover.action_type
-        action_stats[action_type]['totalTurnovers'] += 1
-        action_stats[action_type]['turnovers'].append({
-            'loc': [turnover.tov_loc_x, turnover.tov_loc_y]
-        })
-    
-    pick_and_roll_count = (
-        action_stats['pickAndRoll']['totalShotAttempts'] +
-        action_stats['pickAndRoll']['totalPasses'] +
-        action_stats['pickAndRoll']['totalTurnovers']
-    ) if 'pickAndRoll' in action_stats else 0
-    
-    isolation_count = (
-        action_stats['isolation']['totalShotAttempts'] +
-        action_stats['isolation']['totalPasses'] +
-        action_stats['isolation']['totalTurnovers']
-    ) if 'isolation' in action_stats else 0
-    
-    post_up_count = (
-        action_stats['postUp']['totalShotAttempts'] +
-        action_stats['postUp']['totalPasses'] +
-        action_stats['postUp']['totalTurnovers']
-    ) if 'postUp' in action_stats else 0
-    
-    off_ball_screen_count = (
-        action_stats['offBallScreen']['totalShotAttempts'] +
-        action_stats['offBallScreen']['totalPasses'] +
-        action_stats['offBallScreen']['totalTurnovers']
-    ) if 'offBallScreen' in action_stats else 0
-    
+        after = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (TypeError, ValueError, UnicodeDecodeError) as e:
+        raise ValueError('Invalid cursor') from e
+    if (not isinstance(after, dict) or not set(after) <= set(EVENT_KINDS)
+            or not all(isinstance(event_id, int) for event_id in after.values())):
+        raise ValueError('Invalid cursor')
+    return after
+
+
+def summarize_totals(action_totals):
+    """
+    Collapse one player's per-action-type totals into the headline totals and
+    the per-action-type event counts (pickAndRollCount, ...).
+    """
+    summary = empty_totals()
+    for stats in action_totals.values():
+        for key in TOTAL_KEYS:
+            summary[key] += stats[key]
+
+    for action_type in ACTION_TYPES:
+        stats = action_totals.get(action_type, {})
+        summary[f'{action_type}Count'] = (
+            stats.get('totalShotAttempts', 0) + stats.get('totalPasses', 0) + stats.get('totalTurnovers', 0)
+        )
+
+    return summary
+
+
+def build_player_summary(player_id, name, action_totals, action_events, include=EVENT_KINDS):
+    """
+    Assemble the summary payload for one player from the output of
+    aggregate_action_totals and fetch_event_locations (or the equivalent
+    EventStore methods). Only the event kinds in include are embedded.
+    """
     response = {
-        'name': player.name,
+        'name': name,
         'playerID': player_id,
-        'totalShotAttempts': total_shot_attempts,
-        'totalPoints': total_points,
-        'totalPasses': total_passes,
-        'totalPotentialAssists': total_potential_assists,
-        'totalTurnovers': total_turnovers,
-        'totalPassingTurnovers': total_passing_turnovers,
-        'pickAndRollCount': pick_and_roll_count,
-        'isolationCount': isolation_count,
-        'postUpCount': post_up_count,
-        'offBallScreenCount': off_ball_screen_count,
-        'pickAndRoll': action_stats.get('pickAndRoll', {
-            'totalShotAttempts': 0, 'totalPoints': 0, 'totalPasses': 0,
-            'totalPotentialAssists': 0, 'totalTurnovers': 0, 'totalPassingTurnovers': 0,
-            'shots': [], 'passes': [], 'turnovers': []
-        }),
-        'isolation': action_stats.get('isolation', {
-            'totalShotAttempts': 0, 'totalPoints': 0, 'totalPasses': 0,
-            'totalPotentialAssists': 0, 'totalTurnovers': 0, 'totalPassingTurnovers': 0,
-            'shots': [], 'passes': [], 'turnovers': []
-        }),
-        'postUp': action_stats.get('postUp', {
-            'totalShotAttempts': 0, 'totalPoints': 0, 'totalPasses': 0,
-            'totalPotentialAssists': 0, 'totalTurnovers': 0, 'totalPassingTurnovers': 0,
-            'shots': [], 'passes': [], 'turnovers': []
-        }),
-        'offBallScreen': action_stats.get('offBallScreen', {
-            'totalShotAttempts': 0, 'totalPoints': 0, 'totalPasses': 0,
-            'totalPotentialAssists': 0, 'totalTurnovers': 0, 'totalPassingTurnovers': 0,
-            'shots': [], 'passes': [], 'turnovers': []
-        })
     }
-    
+    response.update(summarize_totals(action_totals))
+
+    for action_type in ACTION_TYPES:
+        stats = empty_action_stats(include)
+        stats.update(action_totals.get(action_type, {}))
+        stats.update(action_events.get(action_type, {}))
+        response[action_type] = stats
+
     return response
 
 
-def get_ranks(player_id: str, player_summary: dict):
+def summarize_players(player_ids, include=EVENT_KINDS, games=None):
+    """
+    Build summary payloads for every existing player in player_ids with the
+    same fixed set of queries whether it holds one ID or hundreds.
+    Returns {player_id: summary}; unknown IDs are simply absent. Event kinds
+    missing from include are neither fetched nor embedded, and games (see
+    window_game_ids) restricts totals and events to those games.
+
+    With settings.SUMMARY_ENGINE = 'columnar' all-time payloads come from
+    the in-memory event store instead, without touching the database;
+    windowed ones always read the per-game rollup.
+    """
+    if settings.SUMMARY_ENGINE == 'columnar' and games is None:
+        store = get_event_store()
+        return {
+            player_id: build_player_summary(
+                player_id, store.player_names[player_id],
+                store.action_totals(player_id), store.action_events(player_id, include), include,
+            )
+            for player_id in player_ids if player_id in store.player_names
+        }
+
+    with query_budget(SUMMARY_QUERY_BUDGET):
+        players = list(models.Player.objects.filter(player_id__in=player_ids))
+        if not players:
+            return {}
+
+        found_ids = [player.player_id for player in players]
+        totals = aggregate_action_totals(found_ids, games)
+        events = fetch_event_locations(found_ids, include, games)
+
+    return {
+        player.player_id: build_player_summary(
+            player.player_id, player.name, totals[player.player_id], events[player.player_id], include
+        )
+        for player in players
+    }
+
+
+def summarize_player_page(player_id, include=EVENT_KINDS, after=None, limit=None, games=None):
     """
-    Calculate player ranks for each statistic against all players.
-    Lower rank number means better performance (1st place, 2nd place, etc.)
+    Like summarize_players for one player, but with each event kind paged
+    (see fetch_event_page). Kinds missing from a continuation cursor were
+    exhausted on an earlier page and are left out. Returns
+    (summary, next_after), or (None, None) for an unknown player.
+    """
+    if after is not None:
+        include = [kind for kind in include if kind in after]
+
+    if settings.SUMMARY_ENGINE == 'columnar' and games is None:
+        store = get_event_store()
+        if player_id not in store.player_names:
+            return None, None
+        events, next_after = store.event_page(player_id, include, after, limit)
+        summary = build_player_summary(
+            player_id, store.player_names[player_id], store.action_totals(player_id), events, include
+        )
+        return summary, next_after
+
+    with query_budget(SUMMARY_QUERY_BUDGET):
+        player = models.Player.objects.filter(player_id=player_id).first()
+        if player is None:
+            return None, None
+
+        totals = aggregate_action_totals([player_id], games)
+        events, next_after = fetch_event_page(player_id, include, after, limit, games)
+
+    return build_player_summary(player_id, player.name, totals[player_id], events, include), next_after
+
+
+def get_player_summary_stats(player_id: str, include=EVENT_KINDS, after=None, limit=None, games=None):
+    """
+    One player's summary, over every game or only the game IDs in games.
+    With a limit, the event arrays are paginated and the payload carries a
+    nextCursor for the following page (None on the last one).
     """
     try:
         player_id = int(player_id)
     except ValueError:
-        return {"error": "Invalid player ID"}
-    
-    # Get all players' stats for comparison
-    all_players = models.Player.objects.all()
-    
-    # Calculate stats for all players
-    all_player_stats = []
-    for player in all_players:
-        shots = models.Shot.objects.filter(player=player)
-        passes = models.Pass.objects.filter(player=player)
-        turnovers = models.Turnover.objects.filter(player=player)
-        
-        pick_and_roll_actions = (
-            shots.filter(action_type='pickAndRoll').count() +
-            passes.filter(action_type='pickAndRoll').count() +
-            turnovers.filter(action_type='pickAndRoll').count()
-        )
-        isolation_actions = (
-            shots.filter(action_type='isolation').count() +
-            passes.filter(action_type='isolation').count() +
-            turnovers.filter(action_type='isolation').count()
-        )
-        post_up_actions = (
-            shots.filter(action_type='postUp').count() +
-            passes.filter(action_type='postUp').count() +
-            turnovers.filter(action_type='postUp').count()
-        )
-        off_ball_screen_actions = (
-            shots.filter(action_type='offBallScreen').count() +
-            passes.filter(action_type='offBallScreen').count() +
-            turnovers.filter(action_type='offBallScreen').count()
-        )
-        
-        player_stats = {
-            'player_id': player.player_id,
-            'totalShotAttempts': shots.count(),
-            'totalPoints': sum(shot.points for shot in shots),
-            'totalPasses': passes.count(),
-            'totalPotentialAssists': passes.filter(potential_assist=True).count(),
-            'totalTurnovers': turnovers.count(),
-            'totalPassingTurnovers': passes.filter(turnover=True).count(),
-            'pickAndRollCount': pick_and_roll_actions,
-            'isolationCount': isolation_actions,
-            'postUpCount': post_up_actions,
-            'offBallScreenCount': off_ball_screen_actions,
-        }
-        all_player_stats.append(player_stats)
-    
-    current_player_stats = None
-    for stats in all_player_stats:
-        if stats['player_id'] == player_id:
-            current_player_stats = stats
-            break
-    
-    if not current_player_stats:
-        return {"error": "Player stats not found"}
-    
-    def calculate_rank(current_value, all_values, reverse=False):
-        sorted_values = sorted(all_values, reverse=reverse)
-        return sorted_values.index(current_value) + 1
-    
-    all_shot_attempts = [s['totalShotAttempts'] for s in all_player_stats]
-    all_points = [s['totalPoints'] for s in all_player_stats]
-    all_passes = [s['totalPasses'] for s in all_player_stats]
-    all_potential_assists = [s['totalPotentialAssists'] for s in all_player_stats]
-    all_turnovers = [s['totalTurnovers'] for s in all_player_stats]
-    all_passing_turnovers = [s['totalPassingTurnovers'] for s in all_player_stats]
-    all_pick_and_roll_counts = [s['pickAndRollCount'] for s in all_player_stats]
-    all_isolation_counts = [s['isolationCount'] for s in all_player_stats]
-    all_post_up_counts = [s['postUpCount'] for s in all_player_stats]
-    all_off_ball_screen_counts = [s['offBallScreenCount'] for s in all_player_stats]
-    
-    ranks = {
-        "totalShotAttemptsRank": calculate_rank(
-            current_player_stats['totalShotAttempts'], all_shot_attempts, reverse=True
-        ),
-        "totalPointsRank": calculate_rank(
-            current_player_stats['totalPoints'], all_points, reverse=True
-        ),
-        "totalPassesRank": calculate_rank(
-            current_player_stats['totalPasses'], all_passes, reverse=True
-        ),
-        "totalPotentialAssistsRank": calculate_rank(
-            current_player_stats['totalPotentialAssists'], all_potential_assists, reverse=True
-        ),
-        "totalTurnoversRank": calculate_rank(
-            current_player_stats['totalTurnovers'], all_turnovers, reverse=False
-        ),
-        "totalPassingTurnoversRank": calculate_rank(
-            current_player_stats['totalPassingTurnovers'], all_passing_turnovers, reverse=False
-        ),
-        'pickAndRollCountRank': calculate_rank(
-            current_player_stats['pickAndRollCount'], all_pick_and_roll_counts, reverse=True
-        ),
-        'isolationCountRank': calculate_rank(
-            current_player_stats['isolationCount'], all_isolation_counts, reverse=True
-        ),
-        'postUpCountRank': calculate_rank(
-            current_player_stats['postUpCount'], all_post_up_counts, reverse=True
-        ),
-        'offBallScreenCountRank': calculate_rank(
-            current_player_stats['offBallScreenCount'], all_off_ball_screen_counts, reverse=True
-        ),
-    }
-    
-    return ranks
+        return {"error": "Player not found"}
+
+    if limit is not None:
+        summary, next_after = summarize_player_page(player_id, include, after, limit, games)
+        if summary is None:
+            return {"error": "Player not found"}
+        summary['nextCursor'] = encode_cursor(next_after) if next_after else None
+        return summary
+
+    summaries = summarize_players([player_id], include, games)
+    if player_id not in summaries:
+        return {"error": "Player not found"}
+
+    return summaries[player_id]
+
+
+def get_player_summaries(player_ids, include=EVENT_KINDS, games=None):
+    """
+    Summarize a batch of requested player IDs. Returns (summaries, errors):
+    summaries in request order, and one {'id', 'error'} entry per ID that
+    could not be summarized, so one bad ID does not fail the batch.
+    """
+    requested = []
+    errors = []
+    for raw_id in player_ids:
+        try:
+            player_id = int(raw_id)
+        except (TypeError, ValueError):
+            errors.append({'id': raw_id, 'error': 'Invalid player ID'})
+            continue
+        if player_id not in requested:
+            requested.append(player_id)
+
+    found = summarize_players(requested, include, games)
+
+    summaries = []
+    for player_id in requested:
+        if player_id in found:
+            summaries.append(found[player_id])
+        else:
+            errors.append({'id': player_id, 'error': 'Player not found'})
+
+    return summaries, errors
+
+
+# Bounded, so the connections held by async requests (one per thread) stay
+# within settings.ASYNC_DB_THREADS rather than the default executor's size.
+DB_EXECUTOR = ThreadPoolExecutor(max_workers=settings.ASYNC_DB_THREADS, thread_name_prefix='async-db')
+
+
+def in_own_connection(func):
+    """
+    Wrap a blocking ORM function as a coroutine that runs on a DB_EXECUTOR
+    thread, and so on that thread's own database connection, letting
+    several queries run at once. Connections are recycled as Django does at
+    the end of a request.
+    """
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        close_old_connections()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    return sync_to_async(run, thread_sensitive=False, executor=DB_EXECUTOR)
+
+
+def player_name(player_id):
+    return models.Player.objects.filter(player_id=player_id).values_list('name', flat=True).first()
+
+
+async def aget_player_summary_stats(player_id, include=EVENT_KINDS, games=None):
+    """
+    Async get_player_summary_stats: the player lookup, the rollup totals and
+    each event kind's locations are independent queries, so they are issued
+    concurrently instead of one after another.
+    """
+    try:
+        player_id = int(player_id)
+    except ValueError:
+        return {"error": "Player not found"}
+
+    if settings.SUMMARY_ENGINE == 'columnar' and games is None:
+        return await sync_to_async(get_player_summary_stats)(player_id, include)
+
+    name, totals, *kind_events = await asyncio.gather(
+        in_own_connection(player_name)(player_id),
+        in_own_connection(aggregate_action_totals)([player_id], games),
+        *(in_own_connection(fetch_event_locations)([player_id], [kind], games) for kind in include),
+    )
+    if name is None:
+        return {"error": "Player not found"}
+
+    events = defaultdict(dict)
+    for kind_event in kind_events:
+        for action_type, action_events in kind_event[player_id].items():
+            events[action_type].update(action_events)
+
+    return build_player_summary(player_id, name, totals[player_id], events, include)
@@ -0,0 +1,33 @@
+import logging
+from contextlib import contextmanager
+
+from django.db import connection
+
+LOGGER = logging.getLogger('django')
+
+
+class QueryCounter:
+    """
+    Execute wrapper that counts the queries run on a connection.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@contextmanager
+def query_budget(limit: int):
+    """
+    Log a warning when the wrapped block issues more than ``limit``
+    queries. Only a warning, so a regression on the request path is visible
+    without failing requests; the tests enforce the budgets.
+    """
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        yield counter
+    if counter.count > limit:
+        LOGGER.warning('Query budget exceeded: %s queries, budget is %s', counter.count, limit)
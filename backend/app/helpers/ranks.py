@@ -0,0 +1,243 @@
+import threading
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict
+
+from django.conf import settings
+
+from app.dbmodels import models
+from app.helpers.data_version import get_data_changes, get_data_version
+from app.helpers.event_store import get_event_store
+from app.helpers.players import aggregate_action_totals, summarize_totals
+
+# (stat, descending). Higher is better for every stat except the turnover
+# stats, where the fewest turnovers ranks first.
+RANKED_STATS = [
+    ('totalShotAttempts', True),
+    ('totalPoints', True),
+    ('totalPasses', True),
+    ('totalPotentialAssists', True),
+    ('totalTurnovers', False),
+    ('totalPassingTurnovers', False),
+    ('pickAndRollCount', True),
+    ('isolationCount', True),
+    ('postUpCount', True),
+    ('offBallScreenCount', True),
+]
+DESCENDING = dict(RANKED_STATS)
+
+
+def ranked_stats(action_totals, action_type=None):
+    """
+    One player's ranked stats from their totals per action type, counting
+    only action_type's events when given.
+    """
+    if action_type is not None:
+        action_totals = {action_type: action_totals[action_type]} if action_type in action_totals else {}
+    return summarize_totals(action_totals)
+
+
+class RankIndex:
+    """
+    Every player's ranked stat vector plus one ascending sorted array per
+    stat, so a rank is two binary searches instead of a league-wide sort.
+
+    Ties share the best rank and the next distinct value skips ahead
+    (1, 2, 2, 4), which is what sorted(values).index(value) + 1 returned.
+    """
+
+    def __init__(self, player_stats, version=None, games=None, action_type=None):
+        self.version = version
+        self.games = games
+        self.action_type = action_type
+        self.player_stats = player_stats
+        self.sorted_values = {
+            stat: sorted(stats[stat] for stats in player_stats.values())
+            for stat, _ in RANKED_STATS
+        }
+        # Player IDs best first per stat, built on the first leaderboard
+        # request for that stat.
+        self.leader_order = {}
+
+    @classmethod
+    def build(cls, version=None, games=None, action_type=None):
+        """
+        Build the index over every game, or only the game IDs in games, and
+        over every action type, or only the events of action_type.
+        """
+        if settings.SUMMARY_ENGINE == 'columnar' and games is None and action_type is None:
+            # Stamped with the store's version, which lags while another
+            # thread refreshes the store, so the index is refreshed again
+            # once the store catches up.
+            store = get_event_store()
+            return cls(store.player_stats(), version=store.version)
+
+        totals = aggregate_action_totals(games=games)
+        player_stats = {
+            player_id: ranked_stats(totals.get(player_id, {}), action_type)
+            for player_id in models.Player.objects.values_list('player_id', flat=True)
+        }
+        return cls(player_stats, version=version, games=games, action_type=action_type)
+
+    def patched(self, player_ids, version):
+        """
+        A copy of this index as of version, where only player_ids changed:
+        their stats are re-read (from the event store for the columnar
+        engine's all-time index, from the rollup in two queries otherwise)
+        and moved within the sorted arrays and leaderboard orders, instead
+        of rebuilding the index from every player. Players that no longer
+        exist are dropped.
+        """
+        if settings.SUMMARY_ENGINE == 'columnar' and self.games is None and self.action_type is None:
+            store = get_event_store()
+            if store.version != version:
+                # The store is still being refreshed; patch once it is.
+                return self
+            changed_stats = {
+                player_id: ranked_stats(store.action_totals(player_id))
+                for player_id in player_ids if player_id in store.player_names
+            }
+        else:
+            existing = set(models.Player.objects.filter(player_id__in=player_ids).values_list('player_id', flat=True))
+            totals = aggregate_action_totals(sorted(existing), games=self.games) if existing else {}
+            changed_stats = {
+                player_id: ranked_stats(totals.get(player_id, {}), self.action_type) for player_id in existing
+            }
+
+        index = RankIndex.__new__(RankIndex)
+        index.version = version
+        index.games = self.games
+        index.action_type = self.action_type
+        index.player_stats = player_stats = dict(self.player_stats)
+        index.sorted_values = {stat: list(values) for stat, values in self.sorted_values.items()}
+        index.leader_order = {stat: list(order) for stat, order in self.leader_order.items()}
+
+        for player_id in player_ids:
+            previous = player_stats.pop(player_id, None)
+            if previous is not None:
+                for stat, values in index.sorted_values.items():
+                    del values[bisect_left(values, previous[stat])]
+                for order in index.leader_order.values():
+                    order.remove(player_id)
+            if player_id not in changed_stats:
+                continue
+
+            stats = player_stats[player_id] = changed_stats[player_id]
+            for stat, values in index.sorted_values.items():
+                insort(values, stats[stat])
+            for stat, order in index.leader_order.items():
+                sign = -1 if DESCENDING[stat] else 1
+                insort(order, player_id, key=lambda leader: (sign * player_stats[leader][stat], leader))
+        return index
+
+    def rank(self, stat, value, descending=True):
+        values = self.sorted_values[stat]
+        if descending:
+            return len(values) - bisect_right(values, value) + 1
+        return bisect_left(values, value) + 1
+
+    def leaders(self, stat, offset=0, limit=25):
+        """
+        One page of the leaderboard for stat as (player_id, value, rank),
+        best first in the order rank uses and by player ID among ties. The
+        order is sorted once per index, so any page is a slice.
+        """
+        descending = DESCENDING[stat]
+        order = self.leader_order.get(stat)
+        if order is None:
+            sign = -1 if descending else 1
+            player_stats = self.player_stats
+            order = sorted(player_stats, key=lambda player_id: (sign * player_stats[player_id][stat], player_id))
+            self.leader_order[stat] = order
+        page = []
+        for player_id in order[offset:offset + limit]:
+            value = self.player_stats[player_id][stat]
+            page.append((player_id, value, self.rank(stat, value, descending)))
+        return page
+
+    def ranks_for(self, player_id):
+        stats = self.player_stats.get(player_id)
+        if stats is None:
+            return None
+        return {
+            f'{stat}Rank': self.rank(stat, stats[stat], descending)
+            for stat, descending in RANKED_STATS
+        }
+
+
+# Windowed and per-action-type rank indexes kept per process, least
+# recently used evicted first.
+MAX_WINDOW_RANK_INDEXES = 32
+
+_rank_index = None
+_rank_index_lock = threading.Lock()
+_window_rank_indexes = OrderedDict()
+_window_rank_indexes_lock = threading.Lock()
+
+
+def get_rank_index(games=None, action_type=None):
+    """
+    Return the process-wide rank index, brought up to date (see
+    refresh_rank_index) when the data version has moved on since it was
+    built. With games and/or action_type, return
+    the index for that window of game IDs and action type instead, built
+    from the per-game rollup.
+    """
+    global _rank_index
+    version, _ = get_data_version()
+    if games is not None or action_type is not None:
+        return get_window_rank_index(tuple(games) if games is not None else None, version, action_type)
+
+    index = _rank_index
+    if index is not None and index.version == version:
+        return index
+
+    with _rank_index_lock:
+        if _rank_index is None or _rank_index.version != version:
+            _rank_index = refresh_rank_index(_rank_index, version)
+        return _rank_index
+
+
+def refresh_rank_index(index, version, games=None, action_type=None):
+    """
+    Bring index (None for none yet) up to version: patch the players
+    changed since it was built when the data change log can say which,
+    rebuild it otherwise.
+    """
+    changed = get_data_changes(index.version, version) if index is not None else None
+    if changed is None:
+        return RankIndex.build(version=version, games=games, action_type=action_type)
+    return index.patched(changed, version)
+
+
+def get_window_rank_index(games, version, action_type=None):
+    key = (games, action_type)
+    with _window_rank_indexes_lock:
+        index = _window_rank_indexes.get(key)
+        if index is not None and index.version == version:
+            _window_rank_indexes.move_to_end(key)
+            return index
+
+        index = refresh_rank_index(index, version, games, action_type)
+        _window_rank_indexes[key] = index
+        _window_rank_indexes.move_to_end(key)
+        while len(_window_rank_indexes) > MAX_WINDOW_RANK_INDEXES:
+            _window_rank_indexes.popitem(last=False)
+        return index
+
+
+def get_ranks(player_id: str, player_summary: dict, games=None):
+    """
+    Calculate player ranks for each statistic against all players, over
+    every game or only the game IDs in games.
+    Lower rank number means better performance (1st place, 2nd place, etc.)
+    """
+    try:
+        player_id = int(player_id)
+    except ValueError:
+        return {"error": "Invalid player ID"}
+
+    ranks = get_rank_index(games).ranks_for(player_id)
+    if ranks is None:
+        return {"error": "Player stats not found"}
+
+    return ranks
@@ -0,0 +1,129 @@
+import json
+
+READ_SIZE = 1 << 16
+
+WHITESPACE = ' \t\r\n'
+
+# Characters that can continue a JSON number.
+NUMBER_CHARS = '0123456789.eE+-'
+
+
+def iter_json_array(f, read_size=READ_SIZE, with_text=False):
+    """
+    Yield the elements of a top-level JSON array from a text file one at a
+    time, keeping only the element being decoded in memory. With
+    with_text=True, yield (element, its source text) instead.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    eof = False
+    started = False
+    expect_comma = False
+    after_comma = False
+
+    def fill(size):
+        nonlocal buffer, pos, eof
+        chunk = f.read(size)
+        if not chunk:
+            eof = True
+        buffer = buffer[pos:] + chunk
+        pos = 0
+
+    fill(read_size)
+    while True:
+        while pos < len(buffer) and buffer[pos] in WHITESPACE:
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                raise ValueError('Unexpected end of JSON array')
+            fill(read_size)
+            continue
+
+        char = buffer[pos]
+        if not started:
+            if char != '[':
+                raise ValueError('Expected a JSON array')
+            started = True
+            pos += 1
+            continue
+        if char == ']':
+            if after_comma:
+                raise ValueError('Trailing "," in JSON array')
+            pos += 1
+            while not (buffer[pos:].strip(WHITESPACE) or eof):
+                fill(read_size)
+            if buffer[pos:].strip(WHITESPACE):
+                raise ValueError('Extra data after JSON array')
+            return
+        if expect_comma:
+            if char != ',':
+                raise ValueError(f'Expected "," or "]" in JSON array, got {char!r}')
+            expect_comma = False
+            after_comma = True
+            pos += 1
+            continue
+
+        # Decode the next element, reading more (in growing chunks, so a large
+        # element is not re-scanned once per READ_SIZE) until it is complete:
+        # followed by its delimiter, since a number cut off at the end of the
+        # buffer still decodes.
+        size = read_size
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            else:
+                delimiter = end
+                while delimiter < len(buffer) and buffer[delimiter] in WHITESPACE:
+                    delimiter += 1
+                if delimiter < len(buffer):
+                    next_char = buffer[delimiter]
+                    if next_char in ',]':
+                        break
+                    if eof or next_char not in NUMBER_CHARS or not isinstance(element, (int, float)):
+                        raise ValueError(f'Expected "," or "]" in JSON array, got {next_char!r}')
+                elif eof:
+                    break
+            fill(size)
+            size *= 2
+
+        text = buffer[pos:end] if with_text else None
+        pos = end
+        expect_comma = True
+        after_comma = False
+        yield (element, text) if with_text else element
+
+
+def iter_ndjson(f, with_text=False):
+    """
+    Yield one JSON document per non-blank line, or (document, line) with
+    with_text=True.
+    """
+    for line in f:
+        line = line.strip()
+        if line:
+            yield (json.loads(line), line) if with_text else json.loads(line)
+
+
+def iter_players(path, with_text=False):
+    """
+    Stream player records from a players.json file, either a JSON array (the
+    raw_data layout) or NDJSON with one player object per line, detected
+    from the first non-blank character. with_text=True yields (record, its
+    source text) pairs.
+    """
+    with open(path, 'r') as f:
+        first = ''
+        while not first:
+            char = f.read(1)
+            if not char:
+                return
+            if not char.isspace():
+                first = char
+        f.seek(0)
+
+        records = iter_json_array(f, with_text=with_text) if first == '[' else iter_ndjson(f, with_text)
+        yield from records
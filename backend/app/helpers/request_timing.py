@@ -0,0 +1,112 @@
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+
+_request_timings = ContextVar('request_timings', default=None)
+
+re_placeholder_list = re.compile(r'%s(?:\s*,\s*%s)+')
+re_number = re.compile(r'\b\d+\b')
+
+
+@lru_cache(maxsize=1024)
+def sql_shape(sql):
+    """
+    sql with IN lists of any length and inlined numbers collapsed, so the
+    same query for different IDs has the same shape.
+    """
+    return re_number.sub('?', re_placeholder_list.sub('%s, ...', sql))
+
+
+class RequestTimings:
+    """
+    Where one request spent its time: queries and their total duration per
+    SQL shape, and seconds per named phase (see timed).
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.shapes = Counter()
+        self.phases = defaultdict(float)
+        self.lock = threading.Lock()
+
+    def add_query(self, sql, seconds):
+        with self.lock:
+            self.queries += 1
+            self.db_seconds += seconds
+            self.shapes[sql_shape(sql)] += 1
+
+    def add_phase(self, phase, seconds):
+        with self.lock:
+            self.phases[phase] += seconds
+
+    def repeated_queries(self, threshold):
+        """
+        (shape, count) for SQL shapes run more than threshold times, the
+        signature of an N+1 query pattern.
+        """
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+
+def start_request_timings():
+    """
+    Start collecting timings for the current request. Returns (timings,
+    token); pass the token to stop_request_timings.
+    """
+    timings = RequestTimings()
+    return timings, _request_timings.set(timings)
+
+
+def stop_request_timings(token):
+    _request_timings.reset(token)
+
+
+def current_request_timings():
+    return _request_timings.get()
+
+
+@contextmanager
+def timed(phase):
+    """
+    Add the wrapped block's duration to the current request's phase. A no-op
+    outside a request.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_phase(phase, time.perf_counter() - start)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper adding each query's duration and shape to the current
+    request's timings. Installed on every connection (install_query_recorder)
+    so it also sees queries run on sync_to_async worker threads, which
+    inherit the request's context.
+    """
+    timings = _request_timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add_query(sql, time.perf_counter() - start)
+
+
+def install_query_recorder(connection, **kwargs):
+    """
+    Add record_query to connection's execute wrappers once. Also usable as a
+    connection_created receiver.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
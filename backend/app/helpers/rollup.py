@@ -0,0 +1,181 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from app.dbmodels.models import Pass, PlayerGameStats, Shot, Turnover
+
+# Summary total -> PlayerGameStats column.
+ROLLUP_COLUMNS = {
+    'totalShotAttempts': 'shot_attempts',
+    'totalPoints': 'points',
+    'totalPasses': 'passes',
+    'totalPotentialAssists': 'potential_assists',
+    'totalTurnovers': 'turnovers',
+    'totalPassingTurnovers': 'passing_turnovers',
+}
+
+ROLLUP_BATCH_SIZE = 5000
+
+
+def event_totals_querysets(player_ids=None, game_ids=None):
+    """
+    Grouped aggregates over the raw event tables per (player, game, action
+    type), one per event table: (shots, passes, turnovers).
+    """
+    shots = Shot.objects.all()
+    passes = Pass.objects.all()
+    turnovers = Turnover.objects.all()
+    if player_ids is not None:
+        shots = shots.filter(player_id__in=player_ids)
+        passes = passes.filter(player_id__in=player_ids)
+        turnovers = turnovers.filter(player_id__in=player_ids)
+    if game_ids is not None:
+        shots = shots.filter(game_id__in=game_ids)
+        passes = passes.filter(game_id__in=game_ids)
+        turnovers = turnovers.filter(game_id__in=game_ids)
+
+    group = ('player_id', 'game_id', 'action_type')
+    shot_rows = shots.values(*group).annotate(
+        shot_attempts=Count('shot_id'),
+        points=Sum('points'),
+    ).order_by()
+    pass_rows = passes.values(*group).annotate(
+        passes=Count('pass_id'),
+        potential_assists=Count('pass_id', filter=Q(potential_assist=True)),
+        passing_turnovers=Count('pass_id', filter=Q(turnover=True)),
+    ).order_by()
+    turnover_rows = turnovers.values(*group).annotate(
+        turnovers=Count('turnover_id'),
+    ).order_by()
+
+    return shot_rows, pass_rows, turnover_rows
+
+
+def compute_player_game_stats(player_ids=None, game_ids=None):
+    """
+    Build unsaved PlayerGameStats rows from the raw events.
+    """
+    totals = defaultdict(dict)
+    for rows in event_totals_querysets(player_ids, game_ids):
+        for row in rows:
+            key = (row.pop('player_id'), row.pop('game_id'), row.pop('action_type'))
+            totals[key].update({column: value or 0 for column, value in row.items()})
+
+    return [
+        PlayerGameStats(player_id=player_id, game_id=game_id, action_type=action_type, **columns)
+        for (player_id, game_id, action_type), columns in totals.items()
+    ]
+
+
+def refresh_player_game_stats(player_ids=None, game_ids=None):
+    """
+    Recompute the rollup rows for player_ids (every player when None),
+    optionally only within game_ids, from the raw events. Reading the
+    events and replacing the rows run in one transaction, joining the
+    caller's if there is one, and the stale rows are locked first so
+    concurrent single-event deltas wait for it instead of being overwritten.
+    Returns the number of rows written.
+    """
+    stale = PlayerGameStats.objects.all()
+    if player_ids is not None:
+        stale = stale.filter(player_id__in=player_ids)
+    if game_ids is not None:
+        stale = stale.filter(game_id__in=game_ids)
+
+    with transaction.atomic():
+        list(stale.select_for_update().values_list('pk', flat=True))
+        stats = compute_player_game_stats(player_ids, game_ids)
+        stale.delete()
+        PlayerGameStats.objects.bulk_create(stats, batch_size=ROLLUP_BATCH_SIZE)
+    return len(stats)
+
+
+def delete_events(querysets):
+    """
+    Delete the Shot, Pass and Turnover rows matched by querysets with one
+    DELETE each, bypassing the per-row delete signals (which would load
+    every row and update its rollup row one at a time), then recount the
+    rollup once for the players and games they covered. Returns the number
+    of events deleted.
+    """
+    player_ids = set()
+    game_ids = set()
+    deleted = 0
+    with transaction.atomic():
+        for queryset in querysets:
+            for player_id, game_id in queryset.values_list('player_id', 'game_id').distinct().order_by():
+                player_ids.add(player_id)
+                game_ids.add(game_id)
+            deleted += queryset._raw_delete(queryset.db)
+        if player_ids:
+            refresh_player_game_stats(sorted(player_ids), sorted(game_ids))
+    return deleted
+
+
+def event_contribution(event):
+    """
+    The PlayerGameStats columns one Shot, Pass or Turnover adds to.
+    """
+    if isinstance(event, Shot):
+        return {'shot_attempts': 1, 'points': event.points}
+    if isinstance(event, Pass):
+        return {
+            'passes': 1,
+            'potential_assists': int(event.potential_assist),
+            'passing_turnovers': int(event.turnover),
+        }
+    return {'turnovers': 1}
+
+
+def apply_event_delta(event, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one event's contribution to its
+    rollup row, creating the row on first add.
+    """
+    contribution = event_contribution(event)
+    updated = PlayerGameStats.objects.filter(
+        player_id=event.player_id, game_id=event.game_id, action_type=event.action_type,
+    ).update(**{column: F(column) + sign * value for column, value in contribution.items()})
+    if not updated and sign > 0:
+        PlayerGameStats.objects.create(
+            player_id=event.player_id, game_id=event.game_id, action_type=event.action_type, **contribution
+        )
+
+
+def apply_event_deltas(events):
+    """
+    Add the contributions of many new events to their rollup rows with one
+    read and batched writes: existing rows are incremented in place
+    (F expressions, so concurrent single-event deltas are not lost) and
+    missing rows are created. Returns the number of rollup rows touched.
+    """
+    deltas = defaultdict(lambda: dict.fromkeys(ROLLUP_COLUMNS.values(), 0))
+    for event in events:
+        delta = deltas[(event.player_id, event.game_id, event.action_type)]
+        for column, value in event_contribution(event).items():
+            delta[column] += value
+    if not deltas:
+        return 0
+
+    existing = PlayerGameStats.objects.filter(
+        player_id__in={player_id for player_id, _, _ in deltas},
+        game_id__in={game_id for _, game_id, _ in deltas},
+        action_type__in={action_type for _, _, action_type in deltas},
+    )
+    updated = []
+    for stats in existing:
+        delta = deltas.pop((stats.player_id, stats.game_id, stats.action_type), None)
+        if delta is None:
+            continue
+        for column, value in delta.items():
+            setattr(stats, column, F(column) + value)
+        updated.append(stats)
+
+    with transaction.atomic():
+        PlayerGameStats.objects.bulk_update(updated, list(ROLLUP_COLUMNS.values()), batch_size=ROLLUP_BATCH_SIZE)
+        PlayerGameStats.objects.bulk_create([
+            PlayerGameStats(player_id=player_id, game_id=game_id, action_type=action_type, **delta)
+            for (player_id, game_id, action_type), delta in deltas.items()
+        ], batch_size=ROLLUP_BATCH_SIZE)
+    return len(updated) + len(deltas)
@@ -0,0 +1,124 @@
+import math
+
+import numpy as np
+from django.conf import settings
+
+from app.dbmodels import models
+from app.helpers.event_store import ACTION_CODES, get_event_store
+
+BIN_TYPES = ['hex', 'grid']
+
+DEFAULT_BIN_SIZE = 2.0
+MIN_BIN_SIZE = 0.5
+MAX_BIN_SIZE = 25.0
+
+
+def fetch_shot_columns(player_id, action_type=None, from_game=None, to_game=None):
+    """
+    Return (x, y, points) arrays for a player's shots, optionally restricted
+    to one action type and an inclusive game ID range.
+    """
+    if settings.SUMMARY_ENGINE == 'columnar':
+        actions, shots = get_event_store().shots.slice(player_id)
+        mask = np.ones(len(actions), dtype=bool)
+        if action_type is not None:
+            mask &= actions == ACTION_CODES[action_type]
+        if from_game is not None:
+            mask &= shots['game'] >= from_game
+        if to_game is not None:
+            mask &= shots['game'] <= to_game
+        return shots['x'][mask], shots['y'][mask], shots['points'][mask]
+
+    queryset = models.Shot.objects.filter(player_id=player_id)
+    if action_type is not None:
+        queryset = queryset.filter(action_type=action_type)
+    if from_game is not None:
+        queryset = queryset.filter(game_id__gte=from_game)
+    if to_game is not None:
+        queryset = queryset.filter(game_id__lte=to_game)
+
+    rows = list(queryset.values_list('shot_loc_x', 'shot_loc_y', 'points'))
+    columns = np.array(rows, dtype=np.float64).reshape(-1, 3)
+    return columns[:, 0], columns[:, 1], columns[:, 2]
+
+
+def grid_bins(x, y, size):
+    """
+    Square bins of side size. Returns (bin index per shot, bin centers).
+    """
+    cells = np.stack([np.floor(x / size), np.floor(y / size)], axis=1).astype(np.int64)
+    keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+    return inverse.reshape(-1), (keys + 0.5) * size
+
+
+def hex_bins(x, y, size):
+    """
+    Pointy-top hexagonal bins with circumradius size. Hex centers form two
+    offset rectangular lattices; each shot goes to the nearer of its
+    candidate centers on either lattice. Returns (bin index per shot, bin
+    centers).
+    """
+    dx = math.sqrt(3) * size
+    dy = 3 * size
+
+    even_col = np.round(x / dx)
+    even_row = np.round(y / dy)
+    odd_col = np.floor(x / dx)
+    odd_row = np.floor(y / dy)
+
+    even_distance = (x - even_col * dx) ** 2 + (y - even_row * dy) ** 2
+    odd_distance = (x - (odd_col + 0.5) * dx) ** 2 + (y - (odd_row + 0.5) * dy) ** 2
+    use_odd = odd_distance < even_distance
+
+    col = np.where(use_odd, odd_col, even_col)
+    row = np.where(use_odd, 2 * odd_row + 1, 2 * even_row)
+    cells = np.stack([col, row], axis=1).astype(np.int64)
+
+    keys, inverse = np.unique(cells, axis=0, return_inverse=True)
+    centers = np.stack([
+        (keys[:, 0] + (keys[:, 1] % 2) * 0.5) * dx,
+        keys[:, 1] * (dy / 2),
+    ], axis=1)
+    return inverse.reshape(-1), centers
+
+
+def bin_shots(x, y, points, bin_type='hex', size=DEFAULT_BIN_SIZE):
+    """
+    Attempts, makes and points per court bin, for bins with at least one shot.
+    """
+    if len(x) == 0:
+        return []
+
+    bin_index, centers = (hex_bins if bin_type == 'hex' else grid_bins)(x, y, size)
+    bin_count = len(centers)
+    attempts = np.bincount(bin_index, minlength=bin_count)
+    makes = np.bincount(bin_index, weights=points > 0, minlength=bin_count)
+    bin_points = np.bincount(bin_index, weights=points, minlength=bin_count)
+
+    return [
+        {'x': center_x, 'y': center_y, 'attempts': int(bin_attempts), 'makes': int(bin_makes), 'points': int(total)}
+        for (center_x, center_y), bin_attempts, bin_makes, total in zip(
+            np.round(centers, 2).tolist(), attempts.tolist(), makes.tolist(), bin_points.tolist()
+        )
+    ]
+
+
+def player_exists(player_id):
+    if settings.SUMMARY_ENGINE == 'columnar':
+        return player_id in get_event_store().player_names
+    return models.Player.objects.filter(player_id=player_id).exists()
+
+
+def get_shot_chart(player_id, bin_type='hex', size=DEFAULT_BIN_SIZE, action_type=None, from_game=None, to_game=None):
+    if not player_exists(player_id):
+        return {"error": "Player not found"}
+
+    x, y, points = fetch_shot_columns(player_id, action_type, from_game, to_game)
+    return {
+        'playerID': player_id,
+        'bin': bin_type,
+        'size': size,
+        'actionType': action_type,
+        'totalShotAttempts': len(x),
+        'bins': bin_shots(x, y, points, bin_type, size),
+    }
@@ -0,0 +1,288 @@
+import json
+import math
+import os
+import random
+from datetime import date, timedelta
+
+from app.dbmodels.models import Shot
+
+ACTION_TYPES = [action_type for action_type, _ in Shot.ACTION_TYPES]
+
+# Court coordinates are in feet with the hoop at the origin, x across the
+# court and y towards half court. The baseline is 5.25 ft behind the hoop.
+BASELINE_Y = -5.25
+THREE_POINT_RADIUS = 23.75
+CORNER_THREE_X = 22.0
+CORNER_THREE_MAX_Y = 8.75
+
+CITIES = [
+    'Atlanta', 'Boston', 'Brooklyn', 'Charlotte', 'Chicago', 'Cleveland', 'Dallas', 'Denver', 'Detroit',
+    'Golden State', 'Houston', 'Indiana', 'Los Angeles', 'Memphis', 'Miami', 'Milwaukee', 'Minnesota',
+    'New Orleans', 'New York', 'Oklahoma City', 'Orlando', 'Philadelphia', 'Phoenix', 'Portland',
+    'Sacramento', 'San Antonio', 'Seattle', 'Toronto', 'Utah', 'Washington',
+]
+NICKNAMES = [
+    'Aces', 'Bolts', 'Comets', 'Dragons', 'Express', 'Falcons', 'Giants', 'Hawks', 'Jets', 'Knights',
+    'Lynx', 'Monarchs', 'Owls', 'Pilots', 'Rockets', 'Sharks', 'Titans', 'Vipers', 'Wolves', 'Zephyrs',
+]
+FIRST_NAMES = [
+    'Aaron', 'Andre', 'Ben', 'Caleb', 'Chris', 'Darius', 'DeShawn', 'Eli', 'Evan', 'Frank', 'Isaiah', 'Jalen',
+    'Jamal', 'Jordan', 'Kevin', 'Luka', 'Malik', 'Marcus', 'Nate', 'Nikola', 'Omar', 'Paul', 'Reggie', 'Sam',
+    'Tariq', 'Trey', 'Tyrese', 'Victor', 'Xavier', 'Zion',
+]
+LAST_NAMES = [
+    'Adams', 'Allen', 'Brooks', 'Brown', 'Carter', 'Davis', 'Edwards', 'Evans', 'Fox', 'Green', 'Harris',
+    'Hill', 'Holiday', 'Jackson', 'Johnson', 'Jones', 'King', 'Lewis', 'Miller', 'Mitchell', 'Murray',
+    'Parker', 'Robinson', 'Smith', 'Thompson', 'Turner', 'Walker', 'Washington', 'White', 'Young',
+]
+
+DEFAULT_START_DATE = date(2023, 10, 24)
+
+# Roster slots cycle through these roles; the first five slots start.
+ROLES = ['guard', 'guard', 'wing', 'wing', 'big']
+STARTERS = 5
+STARTER_USAGE = 2.5
+
+# Share of each role's plays by action type.
+ROLE_ACTION_WEIGHTS = {
+    'guard': {'pickAndRoll': 0.55, 'isolation': 0.2, 'postUp': 0.05, 'offBallScreen': 0.2},
+    'wing': {'pickAndRoll': 0.3, 'isolation': 0.25, 'postUp': 0.1, 'offBallScreen': 0.35},
+    'big': {'pickAndRoll': 0.35, 'isolation': 0.05, 'postUp': 0.5, 'offBallScreen': 0.1},
+}
+# (shot share, pass share) of each role's events; the rest are turnovers.
+ROLE_EVENT_MIX = {
+    'guard': (0.35, 0.57),
+    'wing': (0.5, 0.42),
+    'big': (0.55, 0.37),
+}
+# Share of shots taken at the rim, from midrange and from three, by action type.
+ACTION_SHOT_ZONES = {
+    'pickAndRoll': {'rim': 0.35, 'mid': 0.25, 'three': 0.4},
+    'isolation': {'rim': 0.25, 'mid': 0.4, 'three': 0.35},
+    'postUp': {'rim': 0.6, 'mid': 0.35, 'three': 0.05},
+    'offBallScreen': {'rim': 0.15, 'mid': 0.3, 'three': 0.55},
+}
+ZONE_MAKE_RATE = {'rim': 0.62, 'mid': 0.41, 'three': 0.36}
+ZONE_FOUL_RATE = {'rim': 0.12, 'mid': 0.04, 'three': 0.02}
+AND_ONE_RATE = 0.75
+CORNER_THREE_RATE = 0.25
+
+PASS_COMPLETION_RATE = 0.96
+ROLE_POTENTIAL_ASSIST_RATE = {'guard': 0.16, 'wing': 0.1, 'big': 0.07}
+INCOMPLETE_TURNOVER_RATE = 0.8
+
+
+def team_name(team_id):
+    index = team_id - 1
+    name = f'{CITIES[index % len(CITIES)]} {NICKNAMES[index * 7 % len(NICKNAMES)]}'
+    if index >= len(CITIES):
+        name += f' {index // len(CITIES) + 1}'
+    return name
+
+
+def player_name(rng):
+    return f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+
+
+def choose(rng, weights):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def poisson(rng, mean):
+    """
+    Knuth's method for small means, a rounded normal approximation above.
+    """
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit = math.exp(-mean)
+    count = 0
+    product = rng.random()
+    while product > limit:
+        count += 1
+        product *= rng.random()
+    return count
+
+
+def polar(distance, angle):
+    return round(distance * math.cos(angle), 2), round(max(BASELINE_Y, distance * math.sin(angle)), 2)
+
+
+def shot_location(rng, zone):
+    if zone == 'rim':
+        return polar(min(abs(rng.gauss(0, 2.5)), 6), rng.uniform(-0.3, math.pi + 0.3))
+    if zone == 'mid':
+        return polar(rng.uniform(6, 22), rng.uniform(-0.1, math.pi + 0.1))
+    if rng.random() < CORNER_THREE_RATE:
+        side = rng.choice([-1, 1])
+        return round(side * rng.uniform(CORNER_THREE_X, 24.5), 2), round(rng.uniform(-4.5, CORNER_THREE_MAX_Y), 2)
+    distance = rng.uniform(THREE_POINT_RADIUS, 28)
+    lowest = math.asin(CORNER_THREE_MAX_Y / distance)
+    return polar(distance, rng.uniform(lowest, math.pi - lowest))
+
+
+def floor_location(rng):
+    return polar(rng.uniform(0, 30), rng.uniform(-0.2, math.pi + 0.2))
+
+
+def season_schedule(rng, teams, games, start_date):
+    """
+    (game_id, date, home team, away team) for games games: each day every
+    team plays at most once, paired at random.
+    """
+    team_ids = list(range(1, teams + 1))
+    schedule = []
+    day = 0
+    while len(schedule) < games:
+        rng.shuffle(team_ids)
+        for home, away in zip(team_ids[0::2], team_ids[1::2]):
+            if len(schedule) == games:
+                break
+            schedule.append((len(schedule), start_date + timedelta(days=day), home, away))
+        day += 1
+    return schedule
+
+
+class SeasonWriter:
+    """
+    Writes teams.json, games.json and players.json in the raw_data schema
+    for a synthetic season, reproducible for a given seed.
+
+    Players are spread evenly across teams; each team's events in a game
+    (half of events_per_game) are shared among its roster by usage, with
+    starters used most. Action types follow each player's role, shot
+    locations and make rates follow the action type, and event kinds follow
+    the role. players.json is streamed one player at a time, so memory
+    stays bounded by one player's events whatever the season size.
+    """
+
+    def __init__(self, seed=0, players=300, teams=30, games=1230, events_per_game=400, start_date=None):
+        if teams < 2:
+            raise ValueError('Need at least two teams')
+        if players < teams:
+            raise ValueError('Need at least one player per team')
+        self.seed = seed
+        self.players = players
+        self.teams = teams
+        self.games = games
+        self.events_per_game = events_per_game
+        self.start_date = start_date or DEFAULT_START_DATE
+
+    def rng(self, *parts):
+        return random.Random(':'.join(str(part) for part in [self.seed, *parts]))
+
+    def write(self, data_dir, log=print):
+        """
+        Write the three files into data_dir. Returns the event counts.
+        """
+        self.next_id = {'shots': 0, 'passes': 0, 'turnovers': 0}
+        schedule = season_schedule(self.rng('schedule'), self.teams, self.games, self.start_date)
+        team_games = {team_id: [] for team_id in range(1, self.teams + 1)}
+        for game_id, _, home, away in schedule:
+            team_games[home].append(game_id)
+            team_games[away].append(game_id)
+
+        usage_rng = self.rng('usage')
+        usage = [
+            usage_rng.lognormvariate(0, 0.4) * (STARTER_USAGE if self.roster_slot(player_id) < STARTERS else 1)
+            for player_id in range(self.players)
+        ]
+        team_usage = {team_id: 0.0 for team_id in team_games}
+        for player_id, weight in enumerate(usage):
+            team_usage[self.team_id(player_id)] += weight
+
+        with open(os.path.join(data_dir, 'teams.json'), 'w') as f:
+            json.dump([{'team_id': team_id, 'name': team_name(team_id)} for team_id in team_games], f, indent=2)
+        with open(os.path.join(data_dir, 'games.json'), 'w') as f:
+            json.dump([{'id': game_id, 'date': day.isoformat()} for game_id, day, _, _ in schedule], f, indent=2)
+
+        with open(os.path.join(data_dir, 'players.json'), 'w') as f:
+            f.write('[')
+            for player_id in range(self.players):
+                team_id = self.team_id(player_id)
+                share = usage[player_id] / team_usage[team_id]
+                player = self.player(player_id, team_id, team_games[team_id], share)
+                f.write(',\n' if player_id else '\n')
+                json.dump(player, f)
+                if (player_id + 1) % 1000 == 0:
+                    log(f'  {player_id + 1}/{self.players} players, {sum(self.next_id.values())} events')
+            f.write('\n]\n')
+        return dict(self.next_id)
+
+    def team_id(self, player_id):
+        return player_id % self.teams + 1
+
+    def roster_slot(self, player_id):
+        return player_id // self.teams
+
+    def player(self, player_id, team_id, game_ids, share):
+        rng = self.rng('player', player_id)
+        name = player_name(rng)
+        role = ROLES[self.roster_slot(player_id) % len(ROLES)]
+        shot_share, pass_share = ROLE_EVENT_MIX[role]
+        events = {'shots': [], 'passes': [], 'turnovers': []}
+        for game_id in game_ids:
+            for _ in range(poisson(rng, self.events_per_game / 2 * share)):
+                action_type = choose(rng, ROLE_ACTION_WEIGHTS[role])
+                roll = rng.random()
+                if roll < shot_share:
+                    events['shots'].append(self.shot_event(rng, game_id, action_type))
+                elif roll < shot_share + pass_share:
+                    events['passes'].append(self.pass_event(rng, game_id, action_type, role))
+                else:
+                    events['turnovers'].append(self.turnover_event(rng, game_id, action_type))
+        return {'name': name, 'team_id': team_id, 'player_id': player_id, **events}
+
+    def event_id(self, kind):
+        event_id = self.next_id[kind]
+        self.next_id[kind] += 1
+        return event_id
+
+    def shot_event(self, rng, game_id, action_type):
+        zone = choose(rng, ACTION_SHOT_ZONES[action_type])
+        x, y = shot_location(rng, zone)
+        fouled = rng.random() < ZONE_FOUL_RATE[zone]
+        points = 0
+        if rng.random() < ZONE_MAKE_RATE[zone]:
+            points = 3 if zone == 'three' else 2
+            if fouled and rng.random() < AND_ONE_RATE:
+                points += 1
+        return {
+            'id': self.event_id('shots'),
+            'points': points,
+            'shooting_foul_drawn': fouled,
+            'shot_loc_x': x,
+            'shot_loc_y': y,
+            'game_id': game_id,
+            'action_type': action_type,
+        }
+
+    def pass_event(self, rng, game_id, action_type, role):
+        start_x, start_y = floor_location(rng)
+        completed = rng.random() < PASS_COMPLETION_RATE
+        potential_assist = completed and rng.random() < ROLE_POTENTIAL_ASSIST_RATE[role]
+        if potential_assist:
+            end_x, end_y = shot_location(rng, choose(rng, ACTION_SHOT_ZONES[action_type]))
+        else:
+            end_x, end_y = floor_location(rng)
+        return {
+            'id': self.event_id('passes'),
+            'completed_pass': completed,
+            'potential_assist': potential_assist,
+            'turnover': not completed and rng.random() < INCOMPLETE_TURNOVER_RATE,
+            'ball_start_loc_x': start_x,
+            'ball_start_loc_y': start_y,
+            'ball_end_loc_x': end_x,
+            'ball_end_loc_y': end_y,
+            'game_id': game_id,
+            'action_type': action_type,
+        }
+
+    def turnover_event(self, rng, game_id, action_type):
+        x, y = floor_location(rng)
+        return {
+            'id': self.event_id('turnovers'),
+            'tov_loc_x': x,
+            'tov_loc_y': y,
+            'game_id': game_id,
+            'action_type': action_type,
+        }
@@ -0,0 +1,48 @@
+from app.dbmodels import models
+from app.helpers.players import ACTION_TYPES, TOTAL_KEYS, aggregate_action_totals, empty_totals, summarize_totals
+from app.helpers.query_budget import query_budget
+
+# Queries get_team_summary may issue, however large the roster: the team
+# lookup, the roster and one grouped aggregate over the rollup.
+TEAM_SUMMARY_QUERY_BUDGET = 3
+
+
+def get_team_summary(team_id, games=None):
+    """
+    Team totals, the same totals per action type, and each rostered
+    player's totals as their contribution (highest scorers first), over
+    every game or only the game IDs in games. All of it comes from one
+    grouped aggregate over the rollup joined through players, rather than
+    from per-player summaries.
+    """
+    try:
+        team_id = int(team_id)
+    except ValueError:
+        return {"error": "Team not found"}
+
+    with query_budget(TEAM_SUMMARY_QUERY_BUDGET):
+        name = models.Team.objects.filter(team_id=team_id).values_list('name', flat=True).first()
+        if name is None:
+            return {"error": "Team not found"}
+
+        roster = list(
+            models.Player.objects.filter(team_id=team_id).order_by('player_id').values_list('player_id', 'name')
+        )
+        totals = aggregate_action_totals(games=games, team_id=team_id)
+
+    team_totals = {}
+    players = []
+    for player_id, player_name in roster:
+        player_totals = totals.get(player_id, {})
+        for action_type, stats in player_totals.items():
+            action_totals = team_totals.setdefault(action_type, empty_totals())
+            for key in TOTAL_KEYS:
+                action_totals[key] += stats[key]
+        players.append({'playerID': player_id, 'name': player_name} | summarize_totals(player_totals))
+    players.sort(key=lambda player: (-player['totalPoints'], player['playerID']))
+
+    summary = {'teamID': team_id, 'name': name}
+    summary.update(summarize_totals(team_totals))
+    summary['actionTypes'] = {action_type: team_totals.get(action_type, empty_totals()) for action_type in ACTION_TYPES}
+    summary['players'] = players
+    return summary
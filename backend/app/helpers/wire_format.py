@@ -0,0 +1,90 @@
+import base64
+
+from app.helpers.players import ACTION_TYPES, EVENT_KINDS
+
+LAYOUTS = ['objects', 'columnar']
+
+# Stored coordinates carry two decimals (the raw data files do, and
+# ingestion rounds to them), so scaling by 100 and sending integers is
+# lossless.
+COORDINATE_DECIMALS = 2
+COORDINATE_SCALE = 10 ** COORDINATE_DECIMALS
+
+
+# Per action type the event arrays are short, where plain Python beats the
+# fixed cost of building NumPy arrays.
+def fixed_point(values):
+    return [round(value * COORDINATE_SCALE) for value in values]
+
+
+def bitset(values, binary=False):
+    """
+    Pack booleans eight to a byte, least significant bit first. Returned as
+    bytes for binary encodings and base64 text for JSON.
+    """
+    bits = 0
+    for index, value in enumerate(values):
+        if value:
+            bits |= 1 << index
+    packed = bits.to_bytes((len(values) + 7) // 8, 'little')
+    return packed if binary else base64.b64encode(packed).decode()
+
+
+def compact_shots(shots, binary=False):
+    return {
+        'count': len(shots),
+        'x': fixed_point([shot['loc'][0] for shot in shots]),
+        'y': fixed_point([shot['loc'][1] for shot in shots]),
+        'points': [shot['points'] for shot in shots],
+    }
+
+
+def compact_passes(passes, binary=False):
+    return {
+        'count': len(passes),
+        'startX': fixed_point([event['startLoc'][0] for event in passes]),
+        'startY': fixed_point([event['startLoc'][1] for event in passes]),
+        'endX': fixed_point([event['endLoc'][0] for event in passes]),
+        'endY': fixed_point([event['endLoc'][1] for event in passes]),
+        'isCompleted': bitset([event['isCompleted'] for event in passes], binary),
+        'isPotentialAssist': bitset([event['isPotentialAssist'] for event in passes], binary),
+        'isTurnover': bitset([event['isTurnover'] for event in passes], binary),
+    }
+
+
+def compact_turnovers(turnovers, binary=False):
+    return {
+        'count': len(turnovers),
+        'x': fixed_point([turnover['loc'][0] for turnover in turnovers]),
+        'y': fixed_point([turnover['loc'][1] for turnover in turnovers]),
+    }
+
+
+COMPACT_EVENTS = {
+    'shots': compact_shots,
+    'passes': compact_passes,
+    'turnovers': compact_turnovers,
+}
+
+
+def compact_summary(summary, binary=False):
+    """
+    Rewrite a summary payload's event arrays from one object per event into
+    parallel arrays per field: coordinates as integers in units of
+    1/coordinateScale, booleans as bitsets. Everything else is unchanged.
+    """
+    if 'error' in summary:
+        return summary
+
+    compact = dict(summary)
+    for action_type in ACTION_TYPES:
+        stats = summary.get(action_type)
+        if not isinstance(stats, dict):
+            continue
+        compact[action_type] = {
+            key: COMPACT_EVENTS[key](value, binary) if key in EVENT_KINDS else value
+            for key, value in stats.items()
+        }
+    compact['layout'] = 'columnar'
+    compact['coordinateScale'] = COORDINATE_SCALE
+    return compact
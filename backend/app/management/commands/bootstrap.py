@@ -0,0 +1,65 @@
+from contextlib import contextmanager
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from app.dbmodels.models import Player
+from app.helpers.loaders import LOAD_MODES
+
+# Arbitrary application-wide key for pg_advisory_lock.
+BOOTSTRAP_LOCK_ID = 7283641001
+
+
+@contextmanager
+def advisory_lock(lock_id):
+    """
+    Hold a session-level PostgreSQL advisory lock for the duration of the
+    block, waiting for any other holder first. Other databases have no
+    equivalent, and the block runs unguarded there.
+    """
+    if connection.vendor != 'postgresql':
+        yield
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_advisory_lock(%s)', [lock_id])
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_unlock(%s)', [lock_id])
+
+
+class Command(BaseCommand):
+    help = (
+        'Load the sample data if the database has no players yet (optionally migrating first), '
+        'holding an advisory lock so concurrent deploys or replicas bootstrap exactly once'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--migrate',
+            action='store_true',
+            help='Apply migrations first, under the same lock',
+        )
+        parser.add_argument(
+            '--mode',
+            choices=LOAD_MODES,
+            default='bulk',
+            help='Load mode passed to load_sample_data',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Waiting for the bootstrap lock...')
+        with advisory_lock(BOOTSTRAP_LOCK_ID):
+            if options['migrate']:
+                call_command('migrate', interactive=False, verbosity=options['verbosity'])
+
+            player_count = Player.objects.count()
+            if player_count:
+                self.stdout.write(f'Database already has {player_count} players. Skipping data load.')
+                return
+
+            self.stdout.write('No players found in database. Loading sample data...')
+            call_command('load_sample_data', mode=options['mode'])
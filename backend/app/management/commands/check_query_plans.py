@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.dbmodels.models import Player, PlayerGameStats, Shot, Pass, Turnover
+from app.helpers.players import action_totals_queryset, event_location_querysets
+
+
+def iter_plan_nodes(plan):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from iter_plan_nodes(child)
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the hot player summary queries and fail if any of them sequentially scans a large table'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--player-id',
+            type=int,
+            help='Player to build the queries for (defaults to the lowest player ID)',
+        )
+        parser.add_argument(
+            '--min-rows',
+            type=int,
+            default=10000,
+            help='Tables with at least this many (estimated) rows count as large',
+        )
+        parser.add_argument(
+            '--analyze',
+            action='store_true',
+            help='Run ANALYZE on the rollup and event tables first so the planner has current statistics',
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'postgresql':
+            raise CommandError('check_query_plans requires PostgreSQL')
+
+        player_id = options['player_id']
+        if player_id is None:
+            player_id = Player.objects.order_by('player_id').values_list('player_id', flat=True).first()
+        if player_id is None:
+            raise CommandError('No players loaded')
+
+        tables = [model._meta.db_table for model in (PlayerGameStats, Shot, Pass, Turnover)]
+        if options['analyze']:
+            with connection.cursor() as cursor:
+                for table in tables:
+                    cursor.execute(f'ANALYZE {connection.ops.quote_name(table)}')
+        table_rows = self.table_rows(tables)
+
+        hot_queries = [('action totals', action_totals_queryset([player_id]))] + [
+            (f'{kind} locations', queryset)
+            for kind, queryset in event_location_querysets([player_id]).items()
+        ]
+
+        failures = []
+        for name, queryset in hot_queries:
+            explained = json.loads(queryset.explain(format='json'))
+            if isinstance(explained, list):
+                explained = explained[0]
+            nodes = list(iter_plan_nodes(explained['Plan']))
+
+            scans = sorted({
+                f"{node['Node Type']} on {node.get('Index Name') or node['Relation Name']}"
+                for node in nodes if 'Relation Name' in node
+            })
+            self.stdout.write(f'{name}: {", ".join(scans)}')
+
+            for node in nodes:
+                table = node.get('Relation Name')
+                if node['Node Type'] == 'Seq Scan' and table_rows.get(table, 0) >= options['min_rows']:
+                    failures.append(f'{name} sequentially scans {table} (~{table_rows[table]:,} rows)')
+
+        if failures:
+            raise CommandError('Query plan regression:\n  ' + '\n  '.join(failures))
+
+        self.stdout.write(self.style.SUCCESS('No sequential scans on large tables'))
+
+    def table_rows(self, tables):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT relname, reltuples FROM pg_class WHERE relkind = %s AND relname = ANY(%s)',
+                ['r', tables],
+            )
+            return {table: max(int(rows), 0) for table, rows in cursor.fetchall()}
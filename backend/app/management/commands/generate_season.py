@@ -0,0 +1,71 @@
+import os
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.helpers.synthetic import DEFAULT_START_DATE, SeasonWriter
+
+
+class Command(BaseCommand):
+    help = 'Generate a synthetic season of teams, games and players files in the raw_data format'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            required=True,
+            help='Directory to write teams.json, games.json and players.json into',
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; the same options and seed give identical files')
+        parser.add_argument('--players', type=int, default=300, help='Players, spread evenly across the teams')
+        parser.add_argument('--teams', type=int, default=30, help='Teams')
+        parser.add_argument('--games', type=int, default=1230, help='Games in the season')
+        parser.add_argument(
+            '--events-per-game',
+            type=int,
+            default=400,
+            help='Average shots, passes and turnovers per game, across both teams',
+        )
+        parser.add_argument(
+            '--start-date',
+            type=date.fromisoformat,
+            default=DEFAULT_START_DATE,
+            help='Date of the first game day (YYYY-MM-DD)',
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Overwrite existing files in the output directory',
+        )
+
+    def handle(self, *args, **options):
+        output_dir = options['output_dir']
+        existing = [
+            name for name in ('teams.json', 'games.json', 'players.json')
+            if os.path.exists(os.path.join(output_dir, name))
+        ]
+        if existing and not options['force']:
+            raise CommandError(f"{output_dir} already has {', '.join(existing)}; pass --force to overwrite")
+        if min(options['players'], options['teams'], options['games']) < 1 or options['events_per_game'] < 0:
+            raise CommandError('--players, --teams and --games must be positive and --events-per-game not negative')
+        os.makedirs(output_dir, exist_ok=True)
+
+        try:
+            writer = SeasonWriter(
+                seed=options['seed'],
+                players=options['players'],
+                teams=options['teams'],
+                games=options['games'],
+                events_per_game=options['events_per_game'],
+                start_date=options['start_date'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Generating {options['players']} players on {options['teams']} teams over {options['games']} games "
+            f"(seed {options['seed']})..."
+        )
+        counts = writer.write(output_dir, log=self.stdout.write)
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {counts['shots']} shots, {counts['passes']} passes and {counts['turnovers']} turnovers to {output_dir}"
+        ))
@@ -3,28 +3,101 @@ import sys
 import json
 import django
 from datetime import datetime
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from app.dbmodels.models import Team, Game, Player, Shot, Pass, Turnover
+from app.helpers.data_version import bump_data_version
+from app.helpers.loaders import DEFAULT_BATCH_SIZE, LOAD_MODES, RAW_DATA_DIR, BulkLoader, IncrementalLoader, ParallelLoader
+from app.helpers.raw_data import iter_players
 
 
 class Command(BaseCommand):
     help = 'Load sample basketball data into the database'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode',
+            choices=LOAD_MODES,
+            default='bulk',
+            help='row: one get_or_create per row; bulk: batched bulk_create; copy: batched PostgreSQL COPY',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Rows per write in the bulk and copy modes',
+        )
+        parser.add_argument(
+            '--data-dir',
+            default=RAW_DATA_DIR,
+            help='Directory holding teams.json, games.json and players.json',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=1,
+            help='Worker processes loading shots, passes and turnovers in parallel, sharded by player',
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=2,
+            help='Times a failed worker shard is retried',
+        )
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Commit every batch with a resumable checkpoint and skip unchanged files and games',
+        )
+
     def handle(self, *args, **options):
-        self.stdout.write('Loading sample basketball data...')
+        mode = options.get('mode', 'bulk')
+        incremental = options.get('incremental', False)
+        workers = options.get('workers', 1)
+        self.data_dir = options.get('data_dir', RAW_DATA_DIR)
+        if incremental and mode == 'row':
+            raise CommandError('--incremental requires the bulk or copy mode')
+        if workers > 1 and (mode == 'row' or incremental):
+            raise CommandError('--workers requires the bulk or copy mode without --incremental')
+        self.stdout.write(f'Loading sample basketball data ({mode} mode)...')
         
         try:
-            with transaction.atomic():
-                self.load_teams()
-                self.load_players()
-                self.load_games()
-                self.load_shots()
-                self.load_passes()
-                self.load_turnovers()
+            if mode == 'row':
+                with transaction.atomic():
+                    self.load_teams()
+                    self.load_players()
+                    self.load_games()
+                    self.load_shots()
+                    self.load_passes()
+                    self.load_turnovers()
+                    bump_data_version()
+            elif workers > 1:
+                loader = ParallelLoader(
+                    workers=workers,
+                    retries=options.get('retries', 2),
+                    mode=mode,
+                    batch_size=options.get('batch_size', DEFAULT_BATCH_SIZE),
+                    log=self.stdout.write,
+                )
+                loader.load_all(self.data_dir)
+            elif incremental:
+                loader = IncrementalLoader(
+                    mode=mode,
+                    batch_size=options.get('batch_size', DEFAULT_BATCH_SIZE),
+                    log=self.stdout.write,
+                )
+                loader.load_all(self.data_dir)
+            else:
+                with transaction.atomic():
+                    loader = BulkLoader(
+                        mode=mode,
+                        batch_size=options.get('batch_size', DEFAULT_BATCH_SIZE),
+                        log=self.stdout.write,
+                    )
+                    loader.load_all(self.data_dir)
                 
             self.stdout.write(
                 self.style.SUCCESS('Successfully loaded sample data!')
@@ -37,7 +110,7 @@ class Command(BaseCommand):
 
     def load_teams(self):
         self.stdout.write('Loading teams...')
-        teams_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'teams.json')
+        teams_path = os.path.join(self.data_dir, 'teams.json')
         
         with open(teams_path, 'r') as f:
             teams_data = json.load(f)
@@ -54,10 +127,9 @@ class Command(BaseCommand):
 
     def load_players(self):
         self.stdout.write('Loading players...')
-        players_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'players.json')
+        players_path = os.path.join(self.data_dir, 'players.json')
         
-        with open(players_path, 'r') as f:
-            players_data = json.load(f)
+        players_data = iter_players(players_path)
         
         for player_data in players_data:
             try:
@@ -80,7 +152,7 @@ class Command(BaseCommand):
 
     def load_games(self):
         self.stdout.write('Loading games...')
-        games_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'games.json')
+        games_path = os.path.join(self.data_dir, 'games.json')
         
         with open(games_path, 'r') as f:
             games_data = json.load(f)
@@ -99,10 +171,9 @@ class Command(BaseCommand):
 
     def load_shots(self):
         self.stdout.write('Loading shots...')
-        players_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'players.json')
+        players_path = os.path.join(self.data_dir, 'players.json')
         
-        with open(players_path, 'r') as f:
-            players_data = json.load(f)
+        players_data = iter_players(players_path)
         
         shot_count = 0
         for player_data in players_data:
@@ -136,10 +207,9 @@ class Command(BaseCommand):
 
     def load_passes(self):
         self.stdout.write('Loading passes...')
-        players_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'players.json')
+        players_path = os.path.join(self.data_dir, 'players.json')
         
-        with open(players_path, 'r') as f:
-            players_data = json.load(f)
+        players_data = iter_players(players_path)
         
         pass_count = 0
         for player_data in players_data:
@@ -176,10 +246,9 @@ class Command(BaseCommand):
 
     def load_turnovers(self):
         self.stdout.write('Loading turnovers...')
-        players_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))), 'raw_data', 'players.json')
+        players_path = os.path.join(self.data_dir, 'players.json')
         
-        with open(players_path, 'r') as f:
-            players_data = json.load(f)
+        players_data = iter_players(players_path)
         
         turnover_count = 0
         for player_data in players_data:
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.dbmodels.models import Player
+from app.helpers.data_version import bump_data_version
+from app.helpers.rollup import refresh_player_game_stats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the PlayerGameStats rollup from the raw shot, pass and turnover rows'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--player-id',
+            type=int,
+            action='append',
+            dest='player_ids',
+            help='Only rebuild this player (repeatable; defaults to every player)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Players rebuilt per transaction',
+        )
+
+    def handle(self, *args, **options):
+        player_ids = options['player_ids']
+        if player_ids is None:
+            player_ids = list(Player.objects.order_by('player_id').values_list('player_id', flat=True))
+        batch_size = options['batch_size']
+
+        rows = 0
+        for start in range(0, len(player_ids), batch_size):
+            batch = player_ids[start:start + batch_size]
+            with transaction.atomic():
+                rows += refresh_player_game_stats(batch)
+            self.stdout.write(f'  Rebuilt {min(start + batch_size, len(player_ids))}/{len(player_ids)} players')
+
+        bump_data_version()
+        self.stdout.write(self.style.SUCCESS(f'Wrote {rows} player game stats rows'))
@@ -0,0 +1,142 @@
+import json
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connection
+from django.db.backends.signals import connection_created
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+
+from app.helpers.metrics import observe_request
+from app.helpers.request_timing import (
+    current_request_timings, install_query_recorder, start_request_timings, stop_request_timings,
+)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+LOGGER = logging.getLogger('django')
+
+re_accepts_brotli = _lazy_re_compile(r'\bbr\b')
+
+# Brotli quality 5 compresses summary payloads noticeably better than gzip
+# at a similar cost; the higher levels are too slow to run per request.
+BROTLI_QUALITY = 5
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    Compress responses with brotli when the client accepts br and brotli is
+    installed, and with gzip (GZipMiddleware) otherwise.
+    """
+
+    def process_response(self, request, response):
+        accepts_brotli = re_accepts_brotli.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if (brotli is None or not accepts_brotli or response.streaming
+                or response.has_header('Content-Encoding') or len(response.content) < 200):
+            return super().process_response(request, response)
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        compressed = brotli.compress(response.content, quality=BROTLI_QUALITY)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(response.content))
+        # As in GZipMiddleware, the compressed body is no longer byte-for-byte
+        # the entity the strong ETag described.
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
+
+
+class PerformanceMiddleware:
+    """
+    Times every request: query count and database time (from an execute
+    wrapper on every connection), plus the compute and serialize phases
+    (see app.helpers.request_timing.timed; DRF responses are timed while
+    they render). Reports them in a Server-Timing header and one JSON log
+    line per request, and logs a warning when one SQL shape repeats more
+    than settings.N_PLUS_ONE_THRESHOLD times in a request. Latency and
+    database time also feed the /metrics histograms.
+
+    Place it first in MIDDLEWARE so the total covers the whole chain.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(install_query_recorder, dispatch_uid='install_query_recorder')
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        install_query_recorder(connection)
+        timings, token = start_request_timings()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stop_request_timings(token)
+        return self.report(request, response, timings, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        timings, token = start_request_timings()
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stop_request_timings(token)
+        return self.report(request, response, timings, time.perf_counter() - start)
+
+    def process_template_response(self, request, response):
+        timings = current_request_timings()
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timings.add_phase('serialize', time.perf_counter() - start)
+            )
+        return response
+
+    def report(self, request, response, timings, total_seconds):
+        metrics = [('db', timings.db_seconds, f'{timings.queries} queries')]
+        metrics += [(phase, seconds, None) for phase, seconds in timings.phases.items()]
+        metrics.append(('total', total_seconds, None))
+        response['Server-Timing'] = ', '.join(
+            f'{name};dur={seconds * 1000:.1f}' + (f';desc="{description}"' if description else '')
+            for name, seconds, description in metrics
+        )
+
+        match = getattr(request, 'resolver_match', None)
+        route = match.view_name if match else None
+        observe_request(
+            route or 'unmatched', request.method, response.status_code, total_seconds,
+            timings.db_seconds, timings.queries,
+        )
+        repeated = timings.repeated_queries(settings.N_PLUS_ONE_THRESHOLD)
+        for shape, count in repeated:
+            LOGGER.warning('Possible N+1 queries in %s: %s runs of %s', request.path, count, shape)
+        LOGGER.info(json.dumps({
+            'event': 'request',
+            'method': request.method,
+            'path': request.path,
+            'route': route,
+            'status': response.status_code,
+            'totalMs': round(total_seconds * 1000, 2),
+            'queries': timings.queries,
+            'dbMs': round(timings.db_seconds * 1000, 2),
+            **{f'{phase}Ms': round(seconds * 1000, 2) for phase, seconds in timings.phases.items()},
+            'repeatedQueries': len(repeated),
+        }))
+        return response
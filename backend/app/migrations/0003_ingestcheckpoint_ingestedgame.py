@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0002_dataversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IngestCheckpoint',
+            fields=[
+                ('checkpoint_id', models.AutoField(primary_key=True, serialize=False)),
+                ('source', models.CharField(max_length=500)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('player_offset', models.IntegerField(default=0)),
+                ('event_offset', models.IntegerField(default=0)),
+                ('rows_loaded', models.BigIntegerField(default=0)),
+                ('completed', models.BooleanField(default=False)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'ingest_checkpoints',
+                'unique_together': {('source', 'content_hash')},
+            },
+        ),
+        migrations.CreateModel(
+            name='IngestedGame',
+            fields=[
+                ('game', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='ingest', serialize=False, to='app.game')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'ingested_games',
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-18 11:26
+
+from django.db import migrations, models
+
+from app.dbmodels.operations import AddIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # The covering indexes are built concurrently, so event writes are not
+    # blocked while they build; that cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('app', '0003_ingestcheckpoint_ingestedgame'),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='shot',
+            index=models.Index(fields=['player', 'action_type'], include=['points', 'shot_loc_x', 'shot_loc_y'], name='shots_player_action_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='pass',
+            index=models.Index(fields=['player', 'action_type'], include=['potential_assist', 'turnover', 'completed_pass', 'ball_start_loc_x', 'ball_start_loc_y', 'ball_end_loc_x', 'ball_end_loc_y'], name='passes_player_action_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='turnover',
+            index=models.Index(fields=['player', 'action_type'], include=['tov_loc_x', 'tov_loc_y'], name='turnovers_player_action_idx'),
+        ),
+    ]
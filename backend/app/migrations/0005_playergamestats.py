@@ -0,0 +1,71 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:41
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_player_game_stats(apps, schema_editor):
+    """
+    Build the rollup from the events already loaded. Mirrors
+    app.helpers.rollup.compute_player_game_stats on the historical models.
+    """
+    Shot = apps.get_model('app', 'Shot')
+    Pass = apps.get_model('app', 'Pass')
+    Turnover = apps.get_model('app', 'Turnover')
+    PlayerGameStats = apps.get_model('app', 'PlayerGameStats')
+
+    group = ('player_id', 'game_id', 'action_type')
+    totals = defaultdict(dict)
+    for rows in (
+        Shot.objects.values(*group).annotate(shot_attempts=Count('shot_id'), points=Sum('points')).order_by(),
+        Pass.objects.values(*group).annotate(
+            passes=Count('pass_id'),
+            potential_assists=Count('pass_id', filter=Q(potential_assist=True)),
+            passing_turnovers=Count('pass_id', filter=Q(turnover=True)),
+        ).order_by(),
+        Turnover.objects.values(*group).annotate(turnovers=Count('turnover_id')).order_by(),
+    ):
+        for row in rows:
+            key = (row.pop('player_id'), row.pop('game_id'), row.pop('action_type'))
+            totals[key].update({column: value or 0 for column, value in row.items()})
+
+    PlayerGameStats.objects.bulk_create(
+        [
+            PlayerGameStats(player_id=player_id, game_id=game_id, action_type=action_type, **columns)
+            for (player_id, game_id, action_type), columns in totals.items()
+        ],
+        batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_event_covering_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerGameStats',
+            fields=[
+                ('player_game_stats_id', models.AutoField(primary_key=True, serialize=False)),
+                ('action_type', models.CharField(max_length=20)),
+                ('shot_attempts', models.IntegerField(default=0)),
+                ('points', models.IntegerField(default=0)),
+                ('passes', models.IntegerField(default=0)),
+                ('potential_assists', models.IntegerField(default=0)),
+                ('turnovers', models.IntegerField(default=0)),
+                ('passing_turnovers', models.IntegerField(default=0)),
+                ('game', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='player_stats', to='app.game')),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='game_stats', to='app.player')),
+            ],
+            options={
+                'db_table': 'player_game_stats',
+                'unique_together': {('player', 'game', 'action_type')},
+            },
+        ),
+        migrations.RunPython(backfill_player_game_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_playergamestats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='game',
+            index=models.Index(fields=['date', 'game_id'], name='games_date_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:56
+
+from django.db import migrations, models
+
+from app.dbmodels.operations import AddIndexConcurrently, RemoveIndexConcurrently
+
+
+class Migration(migrations.Migration):
+    # The covering indexes are built concurrently, so event writes are not
+    # blocked while they build; that cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('app', '0006_games_date_index'),
+    ]
+
+    operations = [
+        RemoveIndexConcurrently(
+            model_name='pass',
+            name='passes_player_action_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='shot',
+            name='shots_player_action_idx',
+        ),
+        RemoveIndexConcurrently(
+            model_name='turnover',
+            name='turnovers_player_action_idx',
+        ),
+        AddIndexConcurrently(
+            model_name='pass',
+            index=models.Index(fields=['player', 'pass_id'], include=('action_type', 'game', 'potential_assist', 'turnover', 'completed_pass', 'ball_start_loc_x', 'ball_start_loc_y', 'ball_end_loc_x', 'ball_end_loc_y'), name='passes_player_event_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='shot',
+            index=models.Index(fields=['player', 'shot_id'], include=('action_type', 'game', 'points', 'shot_loc_x', 'shot_loc_y'), name='shots_player_event_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='turnover',
+            index=models.Index(fields=['player', 'turnover_id'], include=('action_type', 'game', 'tov_loc_x', 'tov_loc_y'), name='turnovers_player_event_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_event_covering_indexes_pk'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DataChange',
+            fields=[
+                ('version', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('player_ids', models.JSONField(null=True)),
+            ],
+            options={
+                'db_table': 'data_changes',
+            },
+        ),
+    ]
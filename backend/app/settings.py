@@ -27,8 +27,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'app.middleware.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'app.middleware.CompressionMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'spa.middleware.SPAMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -68,7 +70,7 @@ WSGI_APPLICATION = 'app.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.postgresql_psycopg2',
+        'ENGINE': 'django.db.backends.postgresql',
         'OPTIONS': {
             'options': '-c search_path=app,public',
         },
@@ -83,6 +85,37 @@ DATABASES = {
 db_from_env = dj_database_url.config(conn_max_age=600)
 DATABASES['default'].update(db_from_env)
 
+# Ping a reused connection before running queries on it, so a connection
+# dropped by a failover is replaced rather than failing the request.
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# DB_POOL=1 gives each process a psycopg_pool connection pool (psycopg 3)
+# of at most DB_POOL_MAX_SIZE connections, so the connections held against
+# Postgres are bounded by workers * DB_POOL_MAX_SIZE. Requests queue for up to
+# DB_POOL_TIMEOUT seconds when the pool is exhausted (and are refused outright
+# once DB_POOL_MAX_WAITING are queued, if set). With CONN_HEALTH_CHECKS the
+# pool checks each connection before handing it out, and connections are
+# recycled after DB_POOL_MAX_LIFETIME seconds so a failover drains gradually
+# rather than in one reconnect storm. See app.helpers.db_pool for stats.
+DB_POOL = os.environ.get('DB_POOL', '').lower() in ('1', 'true', 'yes')
+if DB_POOL:
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.environ.get('DB_POOL_MIN_SIZE', '2')),
+        'max_size': int(os.environ.get('DB_POOL_MAX_SIZE', '10')),
+        'timeout': float(os.environ.get('DB_POOL_TIMEOUT', '10')),
+        'max_idle': float(os.environ.get('DB_POOL_MAX_IDLE', '300')),
+        'max_lifetime': float(os.environ.get('DB_POOL_MAX_LIFETIME', '1800')),
+        'max_waiting': int(os.environ.get('DB_POOL_MAX_WAITING', '0')),
+    }
+
+# Threads the async summary view runs its concurrent queries on (up to six
+# per request: player, totals, one per event kind, ranks). Each thread uses
+# its own database connection, persistent up to CONN_MAX_AGE or borrowed
+# from the pool with DB_POOL, so this caps the connections async requests
+# hold per process. Defaults to DB_POOL_MAX_SIZE so they fit in the pool.
+ASYNC_DB_THREADS = int(os.environ.get('ASYNC_DB_THREADS', os.environ.get('DB_POOL_MAX_SIZE', '10')))
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -116,3 +149,31 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'static')
 STATICFILES_STORAGE = 'spa.storage.SPAStaticFilesStorage'
+
+# Seconds a process may reuse its last read of the data version before
+# checking the database again for loader writes made by other processes.
+DATA_VERSION_TTL = float(os.environ.get('DATA_VERSION_TTL', '1'))
+
+# Cache for merged summary + ranks payloads. Use app.helpers.cache.DjangoCache
+# with {'alias': ...} to share entries between workers through CACHES. Data
+# changes never clear a shared alias; entries for older data versions expire
+# after the alias's TIMEOUT (or {'timeout': ...}).
+PLAYER_SUMMARY_CACHE = {
+    'BACKEND': 'app.helpers.cache.LocMemLRUCache',
+    'OPTIONS': {
+        'max_entries': int(os.environ.get('PLAYER_SUMMARY_CACHE_SIZE', '1024')),
+    },
+}
+
+# 'database' answers summaries and ranks with SQL aggregates; 'columnar'
+# answers them from an in-memory NumPy copy of the event tables
+# (app.helpers.event_store), refreshed whenever the data version changes.
+SUMMARY_ENGINE = os.environ.get('SUMMARY_ENGINE', 'database')
+
+# PerformanceMiddleware logs a likely N+1 query pattern when one SQL shape
+# runs more than this many times in a single request.
+N_PLUS_ONE_THRESHOLD = int(os.environ.get('N_PLUS_ONE_THRESHOLD', '10'))
+
+# Comma-separated keys accepted by the event ingestion endpoint as
+# Authorization: Bearer <key>. Ingestion is refused while this is empty.
+INGEST_API_KEYS = [key.strip() for key in os.environ.get('INGEST_API_KEYS', '').split(',') if key.strip()]
@@ -0,0 +1,34 @@
+"""
+API-only settings for the JSON endpoints: no admin, sessions, messages,
+static files or SPA middleware, and DRF without authentication or the
+browsable API, so workers import and boot as little as possible.
+
+Select it with DJANGO_SETTINGS_MODULE=app.settings_api. Run migrations and
+bootstrap with the full app.settings, which still owns the auth and
+session tables.
+"""
+from app.settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    'rest_framework',
+    'app.apps.AppsConfig',
+    'corsheaders',
+]
+
+MIDDLEWARE = [
+    'app.middleware.PerformanceMiddleware',
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'app.middleware.CompressionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+]
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'],
+    'DEFAULT_PARSER_CLASSES': ['rest_framework.parsers.JSONParser'],
+    'DEFAULT_AUTHENTICATION_CLASSES': [],
+    'DEFAULT_PERMISSION_CLASSES': [],
+    'UNAUTHENTICATED_USER': None,
+}
@@ -0,0 +1,80 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from app.dbmodels.models import Pass, Player, Shot, Turnover
+from app.helpers.cache import invalidate_summary_cache
+from app.helpers.data_version import data_version_changed, mark_data_changed
+from app.helpers.rollup import apply_event_delta, refresh_player_game_stats
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_save, sender=Shot)
+@receiver(post_save, sender=Pass)
+@receiver(post_save, sender=Turnover)
+@receiver(post_delete, sender=Player)
+@receiver(post_delete, sender=Shot)
+@receiver(post_delete, sender=Pass)
+@receiver(post_delete, sender=Turnover)
+def data_changed(sender, instance, signal, created=False, **kwargs):
+    if sender is Player:
+        player_ids = {instance.pk}
+    elif signal is post_save and not created and instance._previous_owner is None:
+        # A new instance saved over a stored event: its previous player is
+        # unknown.
+        player_ids = None
+    else:
+        player_ids = {instance.player_id}
+        if signal is post_save and instance._previous_owner is not None:
+            player_ids.add(instance._previous_owner[0])
+    mark_data_changed(player_ids)
+
+
+@receiver(pre_save, sender=Shot)
+@receiver(pre_save, sender=Pass)
+@receiver(pre_save, sender=Turnover)
+def remember_event_owner(sender, instance, raw=False, **kwargs):
+    """
+    Keep the stored (player_id, game_id) of an event about to be updated,
+    so event_saved can recount the rollup rows it is moving away from.
+    Skipped for new instances, so inserts cost no extra query.
+    """
+    if raw or instance._state.adding:
+        instance._previous_owner = None
+        return
+    instance._previous_owner = sender.objects.filter(pk=instance.pk).values_list('player_id', 'game_id').first()
+
+
+@receiver(post_save, sender=Shot)
+@receiver(post_save, sender=Pass)
+@receiver(post_save, sender=Turnover)
+def event_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        apply_event_delta(instance, 1)
+    elif instance._previous_owner is None:
+        # A new instance was saved over a stored event, whose previous
+        # player and game were not read, so recount every rollup row.
+        refresh_player_game_stats()
+    else:
+        # The previous values are unknown, so recount the games the event
+        # was and now is in, for the player it belonged to and belongs to.
+        player_id, game_id = instance._previous_owner
+        refresh_player_game_stats(
+            sorted({player_id, instance.player_id}), sorted({game_id, instance.game_id}),
+        )
+
+
+@receiver(post_delete, sender=Shot)
+@receiver(post_delete, sender=Pass)
+@receiver(post_delete, sender=Turnover)
+def event_deleted(sender, instance, **kwargs):
+    apply_event_delta(instance, -1)
+
+
+@receiver(data_version_changed)
+def drop_cached_summaries(sender, player_ids=None, **kwargs):
+    # Summaries are keyed by player version (get_player_version), so a
+    # change scoped to some players leaves every other entry valid.
+    if player_ids is None:
+        invalidate_summary_cache()
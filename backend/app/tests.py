@@ -0,0 +1,738 @@
+import io
+import json
+import math
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+import numpy as np
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+
+from app.dbmodels.models import Game, Pass, Player, PlayerGameStats, Shot, Team, Turnover
+from app.helpers import data_version, event_store, ranks
+from app.helpers.cache import get_summary_cache, invalidate_summary_cache, summary_cache_key
+from app.helpers.data_version import get_data_changes, get_data_version, get_player_version
+from app.helpers.event_store import get_event_store
+from app.helpers.ingest import ingest_events
+from app.helpers.loaders import BulkLoader, IncrementalLoader
+from app.helpers.players import (
+    SUMMARY_QUERY_BUDGET, get_player_summary_stats, summarize_player_page, summarize_players,
+)
+from app.helpers.ranks import RANKED_STATS, RankIndex
+from app.helpers.raw_data import iter_json_array, iter_players
+from app.helpers.request_timing import sql_shape
+from app.helpers.rollup import compute_player_game_stats, delete_events
+from app.helpers.shot_chart import bin_shots, hex_bins
+from app.helpers.synthetic import SeasonWriter
+from app.helpers.teams import TEAM_SUMMARY_QUERY_BUDGET, get_team_summary
+from app.middleware import PerformanceMiddleware
+from app.views.players import summary_options, summary_variant, window_options
+
+
+def create_sample_data(cls):
+    team = Team.objects.create(team_id=1, name='Tune Squad')
+    games = [Game.objects.create(game_id=game_id, date=date(2024, 1, game_id)) for game_id in range(1, 4)]
+    cls.player_ids = []
+    event_id = 0
+    for player_id in range(1, 6):
+        Player.objects.create(player_id=player_id, name=f'Player {player_id}', team=team)
+        cls.player_ids.append(player_id)
+        for game in games:
+            for action_type in ('pickAndRoll', 'isolation'):
+                event_id += 1
+                Shot.objects.create(
+                    shot_id=event_id, player_id=player_id, game=game, points=2,
+                    shot_loc_x=1.0, shot_loc_y=2.0, action_type=action_type,
+                )
+                Pass.objects.create(
+                    pass_id=event_id, player_id=player_id, game=game, completed_pass=True,
+                    potential_assist=True, turnover=False, ball_start_loc_x=0.0, ball_start_loc_y=0.0,
+                    ball_end_loc_x=1.0, ball_end_loc_y=1.0, action_type=action_type,
+                )
+                Turnover.objects.create(
+                    turnover_id=event_id, player_id=player_id, game=game,
+                    tov_loc_x=3.0, tov_loc_y=4.0, action_type=action_type,
+                )
+
+
+def rollup_snapshot(rows):
+    """
+    {(player, game, action type): counts} for the non-empty PlayerGameStats
+    rows in rows.
+    """
+    columns = ['shot_attempts', 'points', 'passes', 'potential_assists', 'turnovers', 'passing_turnovers']
+    return {
+        (row.player_id, row.game_id, row.action_type): tuple(getattr(row, column) for column in columns)
+        for row in rows
+        if any(getattr(row, column) for column in columns)
+    }
+
+
+def reset_process_state():
+    """
+    Forget the per-process derived data (data change memo, event store,
+    rank indexes, cached summaries). Each test's transaction is rolled
+    back, so data versions repeat between tests and must not be matched
+    against what an earlier test derived.
+    """
+    data_version._cached_version = None
+    data_version._data_changes.clear()
+    data_version._player_versions = data_version.PlayerVersions()
+    event_store._event_store = None
+    ranks._rank_index = None
+    ranks._window_rank_indexes.clear()
+    invalidate_summary_cache()
+
+
+@override_settings(SUMMARY_ENGINE='database')
+class QueryBudgetTests(TestCase):
+    """
+    The summary helpers issue a fixed number of queries however many
+    players, games and events they cover.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_sample_data(cls)
+
+    def assert_within_budget(self, budget, function, *args, **kwargs):
+        with CaptureQueriesContext(connection) as queries:
+            result = function(*args, **kwargs)
+        self.assertLessEqual(len(queries), budget, [query['sql'] for query in queries])
+        return result
+
+    def test_summary_all_kinds(self):
+        summary = self.assert_within_budget(SUMMARY_QUERY_BUDGET, get_player_summary_stats, 1)
+        self.assertEqual(summary['totalShotAttempts'], 6)
+        self.assertEqual(len(summary['pickAndRoll']['shots']), 3)
+
+    def test_summary_without_events(self):
+        summary = self.assert_within_budget(SUMMARY_QUERY_BUDGET, get_player_summary_stats, 1, include=[])
+        self.assertEqual(summary['totalPoints'], 12)
+        self.assertNotIn('shots', summary['pickAndRoll'])
+
+    def test_windowed_summary(self):
+        summary = self.assert_within_budget(SUMMARY_QUERY_BUDGET, get_player_summary_stats, 1, games=[1, 2])
+        self.assertEqual(summary['totalShotAttempts'], 4)
+        self.assertEqual(len(summary['isolation']['turnovers']), 2)
+
+    def test_summary_page(self):
+        summary, next_after = self.assert_within_budget(
+            SUMMARY_QUERY_BUDGET, summarize_player_page, 1, limit=2, games=[1, 2, 3],
+        )
+        self.assertEqual(summary['totalShotAttempts'], 6)
+        self.assertIsNotNone(next_after)
+
+    def test_batch_summary(self):
+        summaries = self.assert_within_budget(SUMMARY_QUERY_BUDGET, summarize_players, self.player_ids)
+        self.assertEqual(sorted(summaries), self.player_ids)
+
+    def test_team_summary(self):
+        summary = self.assert_within_budget(TEAM_SUMMARY_QUERY_BUDGET, get_team_summary, 1)
+        self.assertEqual(summary['totalShotAttempts'], 30)
+        self.assertEqual(len(summary['players']), 5)
+
+
+@override_settings(SUMMARY_ENGINE='database', DATA_VERSION_TTL=0)
+class IncrementalRefreshTests(TestCase):
+    """
+    Ingested events bump the data version for just their players, and rank
+    indexes patched for those players match a full rebuild.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+
+    def setUp(self):
+        reset_process_state()
+
+    def ingest_shots(self, player_id):
+        events = [
+            {
+                'type': 'shot', 'id': 1000 + game_id, 'player_id': player_id, 'game_id': game_id,
+                'action_type': 'isolation', 'points': 3, 'shooting_foul_drawn': False,
+                'shot_loc_x': 1.0, 'shot_loc_y': 2.0,
+            }
+            for game_id in range(1, 4)
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            result = ingest_events(events)
+        self.assertEqual(result['created']['shots'], 3)
+
+    def assert_same_index(self, patched, built):
+        self.assertEqual(patched.player_stats, built.player_stats)
+        self.assertEqual(patched.sorted_values, built.sorted_values)
+        for stat, _ in RANKED_STATS:
+            self.assertEqual(patched.leaders(stat), built.leaders(stat))
+
+    def test_ingest_scopes_data_change(self):
+        version, _ = get_data_version()
+        self.ingest_shots(3)
+        new_version, _ = get_data_version()
+        self.assertEqual(new_version, version + 1)
+        self.assertEqual(get_data_changes(version, new_version), {3})
+
+    def test_patched_rank_index(self):
+        version, _ = get_data_version()
+        index = RankIndex.build(version=version)
+        window = RankIndex.build(version=version, games=(1, 2), action_type='isolation')
+        for stat, _ in RANKED_STATS:
+            index.leaders(stat)
+        self.ingest_shots(3)
+        new_version, _ = get_data_version()
+        changed = get_data_changes(version, new_version)
+        self.assert_same_index(index.patched(changed, new_version), RankIndex.build(version=new_version))
+        self.assert_same_index(
+            window.patched(changed, new_version),
+            RankIndex.build(version=new_version, games=(1, 2), action_type='isolation'),
+        )
+
+    @override_settings(SUMMARY_ENGINE='columnar')
+    def test_columnar_patch_reads_event_store(self):
+        version, _ = get_data_version()
+        index = RankIndex.build(version=version)
+        self.ingest_shots(3)
+        new_version, _ = get_data_version()
+        store = get_event_store()
+        self.assertEqual(store.version, new_version)
+        with CaptureQueriesContext(connection) as queries:
+            patched = index.patched(get_data_changes(version, new_version), new_version)
+        # Only the data version is read, with DATA_VERSION_TTL=0.
+        self.assertEqual(
+            [query['sql'] for query in queries if 'data_version' not in query['sql']], [],
+        )
+        self.assert_same_index(patched, RankIndex.build(version=new_version))
+
+    @override_settings(SUMMARY_ENGINE='columnar')
+    def test_lagging_event_store_is_not_cached(self):
+        url = reverse('player_summary', args=[3])
+        before = self.client.get(url)
+        self.assertIn('ETag', before)
+        self.ingest_shots(3)
+
+        # Another thread refreshing the store: this request is answered
+        # from the old one, so it must be neither cached nor validated.
+        with event_store._event_store_lock:
+            lagging = self.client.get(url)
+        self.assertNotIn('ETag', lagging)
+        self.assertEqual(lagging.json()['totalPoints'], before.json()['totalPoints'])
+
+        fresh = self.client.get(url)
+        self.assertIn('ETag', fresh)
+        self.assertNotEqual(fresh['ETag'], before['ETag'])
+        self.assertEqual(fresh.json()['totalPoints'], before.json()['totalPoints'] + 9)
+
+
+@override_settings(SUMMARY_ENGINE='database', DATA_VERSION_TTL=0)
+class SummaryCacheTests(TestCase):
+    """
+    PlayerSummary validators: ETag and Last-Modified, 304 responses to
+    conditional requests, and fresh payloads once the data changes.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+
+    def setUp(self):
+        reset_process_state()
+        self.url = reverse('player_summary', args=[1])
+
+    def test_validators(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+        self.assertIn('Accept', response['Vary'])
+        self.assertEqual(self.client.get(self.url)['ETag'], response['ETag'])
+        self.assertNotEqual(self.client.get(self.url, {'include': 'none'})['ETag'], response['ETag'])
+        self.assertNotEqual(self.client.get(reverse('player_summary', args=[2]))['ETag'], response['ETag'])
+
+    def test_not_modified(self):
+        response = self.client.get(self.url)
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH='"other"').status_code, 200)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304,
+        )
+
+    def test_write_invalidates(self):
+        response = self.client.get(self.url)
+        with self.captureOnCommitCallbacks(execute=True):
+            Shot.objects.create(
+                shot_id=1000, player_id=1, game_id=1, points=3,
+                shot_loc_x=1.0, shot_loc_y=2.0, action_type='isolation',
+            )
+        changed = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed['ETag'], response['ETag'])
+        self.assertEqual(changed.json()['totalPoints'], response.json()['totalPoints'] + 3)
+        self.assertEqual(changed.json()['totalPointsRank'], 1)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=changed['ETag']).status_code, 304)
+
+
+class ShotChartTests(TestCase):
+    """
+    Hex and grid binning, and the attempts, makes and points per bin served
+    by the shotChart endpoint under either summary engine.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+            Shot.objects.create(
+                shot_id=1000, player_id=1, game_id=3, points=0,
+                shot_loc_x=-10.0, shot_loc_y=20.0, action_type='isolation',
+            )
+
+    def setUp(self):
+        reset_process_state()
+
+    def test_grid_bins(self):
+        x = np.array([0.5, 1.9, 2.1, -0.1])
+        y = np.array([0.5, 1.9, 0.0, 0.0])
+        points = np.array([2.0, 0.0, 3.0, 0.0])
+        self.assertEqual(bin_shots(x, y, points, 'grid', 2.0), [
+            {'x': -1.0, 'y': 1.0, 'attempts': 1, 'makes': 0, 'points': 0},
+            {'x': 1.0, 'y': 1.0, 'attempts': 2, 'makes': 1, 'points': 2},
+            {'x': 3.0, 'y': 1.0, 'attempts': 1, 'makes': 1, 'points': 3},
+        ])
+        self.assertEqual(bin_shots(np.array([]), np.array([]), np.array([]), 'grid', 2.0), [])
+
+    def test_hex_bins(self):
+        size = 1.0
+        dx = math.sqrt(3) * size
+        x = np.array([0.0, 0.1, dx / 2, dx])
+        y = np.array([0.0, -0.1, 1.5, 0.0])
+        bins = bin_shots(x, y, np.array([2.0, 2.0, 3.0, 0.0]), 'hex', size)
+        self.assertEqual([(b['x'], b['y'], b['attempts'], b['makes'], b['points']) for b in bins], [
+            (0.0, 0.0, 2, 2, 4),
+            (round(dx / 2, 2), 1.5, 1, 1, 3),
+            (round(dx, 2), 0.0, 1, 0, 0),
+        ])
+
+        # Every shot lands in the hex whose center is nearest, so within
+        # the circumradius of it.
+        rng = np.random.default_rng(0)
+        x, y = rng.uniform(-25, 25, 2000), rng.uniform(-5, 45, 2000)
+        bin_index, centers = hex_bins(x, y, size)
+        distance = np.hypot(x - centers[bin_index, 0], y - centers[bin_index, 1])
+        self.assertLessEqual(distance.max(), size + 1e-9)
+        nearest = np.hypot(x[:, None] - centers[:, 0], y[:, None] - centers[:, 1]).min(axis=1)
+        np.testing.assert_allclose(distance, nearest)
+
+    def test_endpoint(self):
+        url = reverse('shot_chart', args=[1])
+        for engine in ('database', 'columnar'):
+            with self.subTest(engine=engine), override_settings(SUMMARY_ENGINE=engine):
+                reset_process_state()
+                chart = self.client.get(url, {'bin': 'grid', 'size': 5}).json()
+                self.assertEqual(chart['totalShotAttempts'], 7)
+                self.assertEqual(chart['bins'], [
+                    {'x': -7.5, 'y': 22.5, 'attempts': 1, 'makes': 0, 'points': 0},
+                    {'x': 2.5, 'y': 2.5, 'attempts': 6, 'makes': 6, 'points': 12},
+                ])
+
+                chart = self.client.get(url, {'action_type': 'isolation', 'fromGame': 2, 'toGame': 3}).json()
+                self.assertEqual(chart['bin'], 'hex')
+                self.assertEqual(chart['totalShotAttempts'], 3)
+                self.assertEqual(sum(b['attempts'] for b in chart['bins']), 3)
+                self.assertEqual(sum(b['makes'] for b in chart['bins']), 2)
+
+                missing = self.client.get(reverse('shot_chart', args=[99]))
+                self.assertEqual(missing.json(), {'error': 'Player not found'})
+        for params in ({'bin': 'square'}, {'size': 0.1}, {'size': 'big'}, {'action_type': 'dunk'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(url, params).status_code, 400)
+
+
+@override_settings(SUMMARY_ENGINE='database')
+class PerformanceMiddlewareTests(TestCase):
+    """
+    Every response carries a Server-Timing header, and SQL shapes repeated
+    past settings.N_PLUS_ONE_THRESHOLD in one request are logged.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+
+    def setUp(self):
+        reset_process_state()
+
+    def server_timing(self, response):
+        metrics = {}
+        for metric in response['Server-Timing'].split(', '):
+            name, *params = metric.split(';')
+            metrics[name] = dict(param.split('=', 1) for param in params)
+        return metrics
+
+    def test_server_timing(self):
+        with CaptureQueriesContext(connection) as queries:
+            with self.assertNoLogs('django', 'WARNING'):
+                response = self.client.get(reverse('player_summary', args=[1]))
+        metrics = self.server_timing(response)
+        self.assertEqual(list(metrics), ['db', 'compute', 'serialize', 'total'])
+        self.assertEqual(metrics['db']['desc'], f'"{len(queries)} queries"')
+        self.assertGreaterEqual(float(metrics['total']['dur']), float(metrics['compute']['dur']))
+
+        not_found = self.client.get('/api/v1/nowhere')
+        self.assertEqual(list(self.server_timing(not_found)), ['db', 'total'])
+
+    @override_settings(N_PLUS_ONE_THRESHOLD=3)
+    def test_repeated_queries_logged(self):
+        def get_response(request):
+            # An N+1 pattern: one query per player, then a single batch.
+            for player_id in self.player_ids:
+                Player.objects.filter(player_id=player_id).exists()
+            list(Player.objects.filter(player_id__in=self.player_ids[:2]))
+            list(Player.objects.filter(player_id__in=self.player_ids[2:]))
+            return HttpResponse()
+
+        middleware = PerformanceMiddleware(get_response)
+        with self.assertLogs('django', 'INFO') as logs:
+            response = middleware(RequestFactory().get('/players'))
+        warnings = [record.getMessage() for record in logs.records if record.levelname == 'WARNING']
+        self.assertEqual(len(warnings), 1)
+        self.assertIn(f'{len(self.player_ids)} runs of SELECT', warnings[0])
+        self.assertEqual(json.loads(logs.records[-1].getMessage())['repeatedQueries'], 1)
+        self.assertIn(f'"{len(self.player_ids) + 2} queries"', response['Server-Timing'])
+
+    def test_sql_shape(self):
+        self.assertEqual(
+            sql_shape('SELECT 1 FROM t WHERE a IN (%s, %s,%s) AND b = 12 LIMIT 21'),
+            'SELECT ? FROM t WHERE a IN (%s, ...) AND b = ? LIMIT ?',
+        )
+        self.assertEqual(sql_shape('SELECT a FROM t WHERE a IN (%s)'), 'SELECT a FROM t WHERE a IN (%s)')
+        self.assertEqual(sql_shape('SELECT t2.a FROM t2'), 'SELECT t2.a FROM t2')
+
+
+@override_settings(DATA_VERSION_TTL=0)
+class LeaderboardTests(TestCase):
+    """
+    Leaderboard order, shared ranks for ties and pagination, before and
+    after an ingest that patches the rank indexes instead of rebuilding
+    them, under either summary engine.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+
+    def setUp(self):
+        reset_process_state()
+
+    def leaderboard(self, stat, **params):
+        response = self.client.get(reverse('leaderboard', args=[stat]), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def rows(self, leaderboard):
+        return [(player['playerID'], player['value'], player['rank']) for player in leaderboard['players']]
+
+    def ingest(self):
+        shot = {
+            'type': 'shot', 'action_type': 'isolation', 'shooting_foul_drawn': False,
+            'shot_loc_x': 1.0, 'shot_loc_y': 2.0,
+        }
+        events = [
+            shot | {'id': 1000 + game_id, 'player_id': 3, 'game_id': game_id, 'points': 3}
+            for game_id in range(1, 4)
+        ]
+        events.append(shot | {'id': 1010, 'player_id': 5, 'game_id': 1, 'points': 2})
+        events.append({
+            'type': 'turnover', 'id': 1020, 'player_id': 2, 'game_id': 2, 'action_type': 'isolation',
+            'tov_loc_x': 0.0, 'tov_loc_y': 0.0,
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            ingest_events(events)
+
+    def test_ties_and_pages(self):
+        for engine in ('database', 'columnar'):
+            with self.subTest(engine=engine), override_settings(SUMMARY_ENGINE=engine):
+                reset_process_state()
+                leaderboard = self.leaderboard('totalPoints')
+                self.assertEqual(self.rows(leaderboard), [(player_id, 12, 1) for player_id in range(1, 6)])
+                self.assertEqual(
+                    (leaderboard['order'], leaderboard['total'], leaderboard['nextOffset']), ('desc', 5, None),
+                )
+                self.assertEqual(self.leaderboard('totalTurnovers')['order'], 'asc')
+
+                page = self.leaderboard('totalPoints', limit=2, offset=2)
+                self.assertEqual([player['playerID'] for player in page['players']], [3, 4])
+                self.assertEqual(page['nextOffset'], 4)
+                self.assertEqual(self.leaderboard('totalPoints', offset=10)['players'], [])
+
+    def check_patched_ingest(self):
+        before = self.leaderboard('totalPoints', limit=2)
+        self.leaderboard('totalPoints', action_type='isolation')
+        self.ingest()
+
+        with mock.patch.object(RankIndex, 'build', side_effect=AssertionError('rebuilt')):
+            after = self.leaderboard('totalPoints', limit=2)
+            self.assertNotEqual(after, before)
+            self.assertEqual(self.rows(after), [(3, 21, 1), (5, 14, 2)])
+            self.assertEqual(after['nextOffset'], 2)
+            page = self.leaderboard('totalPoints', limit=2, offset=2)
+            self.assertEqual(self.rows(page), [(1, 12, 3), (2, 12, 3)])
+            self.assertEqual(self.rows(self.leaderboard('totalPoints', limit=2, offset=4)), [(4, 12, 3)])
+
+            turnovers = self.leaderboard('totalTurnovers')
+            self.assertEqual(self.rows(turnovers), [(1, 6, 1), (3, 6, 1), (4, 6, 1), (5, 6, 1), (2, 7, 5)])
+
+            isolation = self.leaderboard('totalPoints', action_type='isolation')
+            self.assertEqual(self.rows(isolation), [(3, 15, 1), (5, 8, 2), (1, 6, 3), (2, 6, 3), (4, 6, 3)])
+
+        summary = self.client.get(reverse('player_summary', args=[5])).json()
+        self.assertEqual(summary['totalPointsRank'], 2)
+
+    @override_settings(SUMMARY_ENGINE='database')
+    def test_after_patched_ingest(self):
+        self.check_patched_ingest()
+
+    @override_settings(SUMMARY_ENGINE='columnar')
+    def test_columnar_after_patched_ingest(self):
+        self.check_patched_ingest()
+
+
+class RollupSignalTests(TestCase):
+    """
+    The event signals keep the PlayerGameStats rollup in step with the raw
+    events without extra queries on insert, and loader deletes bypass them.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        create_sample_data(cls)
+
+    def assert_rollup_consistent(self):
+        self.assertEqual(rollup_snapshot(PlayerGameStats.objects.all()), rollup_snapshot(compute_player_game_stats()))
+
+    def test_create_does_not_read_event(self):
+        with CaptureQueriesContext(connection) as queries:
+            Shot.objects.create(
+                shot_id=1000, player_id=1, game_id=1, points=3,
+                shot_loc_x=1.0, shot_loc_y=2.0, action_type='isolation',
+            )
+        # The insert and the rollup row's increment.
+        self.assertEqual(len(queries), 2, [query['sql'] for query in queries])
+        self.assert_rollup_consistent()
+
+    def test_moved_event(self):
+        shot = Shot.objects.get(shot_id=1)
+        shot.player_id = 2
+        shot.game_id = 3
+        shot.action_type = 'postUp'
+        shot.save()
+        self.assert_rollup_consistent()
+
+    def test_overwritten_event(self):
+        Turnover(
+            turnover_id=1, player_id=4, game_id=2, tov_loc_x=0.0, tov_loc_y=0.0, action_type='postUp',
+        ).save()
+        self.assert_rollup_consistent()
+
+    def test_delete_events(self):
+        querysets = [model.objects.filter(game_id=2) for model in (Shot, Pass, Turnover)]
+        with CaptureQueriesContext(connection) as queries:
+            deleted = delete_events(querysets)
+        self.assertEqual(deleted, 30)
+        deletes = [query['sql'] for query in queries if query['sql'].startswith('DELETE')]
+        # One per event table, then one replacing the recounted rollup rows.
+        self.assertEqual(len(deletes), 4, deletes)
+        self.assert_rollup_consistent()
+
+
+class IncrementalLoaderTests(TestCase):
+    """
+    An incremental load after a plain bulk load (which records no game
+    hashes) replaces the events of games whose content changed.
+    """
+
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        SeasonWriter(seed=1, players=8, teams=2, games=4, events_per_game=40).write(self.data_dir, log=lambda message: None)
+        BulkLoader(log=lambda message: None).load_all(self.data_dir)
+
+    def edit_players(self, edit):
+        path = os.path.join(self.data_dir, 'players.json')
+        with open(path) as f:
+            players = json.load(f)
+        edit(players)
+        with open(path, 'w') as f:
+            json.dump(players, f)
+
+    def test_edited_file(self):
+        def edit(players):
+            shot = players[0]['shots'][0]
+            shot['points'] = 3 if shot['points'] != 3 else 2
+            shot['action_type'] = 'postUp'
+            self.edited_shot = shot
+            self.removed_pass = players[1]['passes'].pop()
+        self.edit_players(edit)
+
+        IncrementalLoader(log=lambda message: None).load_all(self.data_dir)
+
+        shot = Shot.objects.get(shot_id=self.edited_shot['id'])
+        self.assertEqual(shot.points, self.edited_shot['points'])
+        self.assertEqual(shot.action_type, 'postUp')
+        self.assertFalse(Pass.objects.filter(pass_id=self.removed_pass['id']).exists())
+        self.assertEqual(rollup_snapshot(PlayerGameStats.objects.all()), rollup_snapshot(compute_player_game_stats()))
+
+
+class RawDataTests(SimpleTestCase):
+    """
+    The streaming players.json parser agrees with json.loads at any read
+    size, and rejects what json.loads rejects.
+    """
+
+    def parse(self, text, read_size):
+        return list(iter_json_array(io.StringIO(text), read_size=read_size))
+
+    def write_file(self, text):
+        f = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        self.addCleanup(os.remove, f.name)
+        with f:
+            f.write(text)
+        return f.name
+
+    def test_read_sizes(self):
+        documents = [
+            '[1.5e3]',
+            '[12345678901234567890, -0.25, 3E-2]',
+            ' [ {"player_id": 1, "name": "A, [B]", "shots": [{"id": 1, "shot_loc_x": 1.25}]} , true, null ]\n',
+            '[]',
+        ]
+        for text in documents:
+            for read_size in (1, 2, 3, 7, 64):
+                with self.subTest(text=text, read_size=read_size):
+                    self.assertEqual(self.parse(text, read_size), json.loads(text))
+
+    def test_malformed(self):
+        documents = ['[1,]', '[,1]', '[1 2]', '["a" "b"]', '[1.5x]', '[1', '[1,', '{"a": 1}', '[tru]', '[1] 2']
+        for text in documents:
+            for read_size in (1, 2, 64):
+                with self.subTest(text=text, read_size=read_size):
+                    with self.assertRaises(ValueError):
+                        self.parse(text, read_size)
+
+    def test_ndjson(self):
+        players = [{'player_id': 1, 'shots': []}, {'player_id': 2, 'name': '[x]'}]
+        path = self.write_file('\n' + '\n\n'.join(json.dumps(player) for player in players) + '\n')
+        self.assertEqual(list(iter_players(path)), players)
+
+    def test_players_array(self):
+        players = [{'player_id': 1, 'shots': [{'id': 1}]}, {'player_id': 2}]
+        self.assertEqual(list(iter_players(self.write_file(json.dumps(players)))), players)
+        self.assertEqual(list(iter_players(self.write_file('  \n'))), [])
+
+    def test_with_text(self):
+        players = [{'player_id': 1, 'name': 'A, [B]'}, {'player_id': 2}]
+        for text in (json.dumps(players, indent=2), '\n'.join(json.dumps(player) for player in players)):
+            with self.subTest(text=text):
+                pairs = list(iter_players(self.write_file(text), with_text=True))
+                self.assertEqual([record for record, _ in pairs], players)
+                self.assertEqual([json.loads(source) for _, source in pairs], players)
+
+
+@override_settings(SUMMARY_ENGINE='database', DATA_VERSION_TTL=0, INGEST_API_KEYS=['key-1', 'key-2'])
+class EventIngestTests(TestCase):
+    """
+    POST /api/v1/events: bearer key authentication, all-or-nothing
+    validation, NDJSON bodies, and invalidation scoped to the ingested
+    players.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            create_sample_data(cls)
+
+    def setUp(self):
+        reset_process_state()
+        self.url = reverse('event_ingest')
+
+    def shot(self, event_id, player_id=1, **fields):
+        return {
+            'type': 'shot', 'id': event_id, 'player_id': player_id, 'game_id': 1, 'action_type': 'isolation',
+            'points': 2, 'shooting_foul_drawn': False, 'shot_loc_x': 1.5, 'shot_loc_y': 2.5, **fields,
+        }
+
+    def post(self, body, content_type='application/json', key='key-1'):
+        headers = {'HTTP_AUTHORIZATION': f'Bearer {key}'} if key is not None else {}
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, body, content_type=content_type, **headers)
+
+    def test_requires_key(self):
+        body = json.dumps([self.shot(1000)])
+        self.assertEqual(self.post(body, key=None).status_code, 401)
+        self.assertEqual(self.post(body, key='wrong').status_code, 401)
+        self.assertFalse(Shot.objects.filter(shot_id=1000).exists())
+
+    def test_invalid_events_write_nothing(self):
+        response = self.post(json.dumps([
+            self.shot(1000),
+            self.shot(1001, points='two'),
+            self.shot(1002, player_id=99),
+            {'type': 'dunk'},
+        ]))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1, 2, 3])
+        self.assertFalse(Shot.objects.filter(shot_id__gte=1000).exists())
+        self.assertEqual(self.post('{}').status_code, 400)
+        self.assertEqual(self.post('[]').status_code, 400)
+
+    def test_ndjson(self):
+        body = '\n'.join(json.dumps(self.shot(event_id)) for event_id in (1000, 1001, 1000)) + '\n\n'
+        response = self.post(body, content_type='application/x-ndjson', key='key-2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['created'], {'shots': 2, 'passes': 0, 'turnovers': 0})
+        self.assertEqual(response.json()['duplicates'], 1)
+        self.assertEqual(self.post('not json\n', content_type='application/x-ndjson').status_code, 400)
+
+    def test_locations_rounded(self):
+        response = self.post(json.dumps([self.shot(1000, shot_loc_x=1.23456, shot_loc_y=-7.005001)]))
+        self.assertEqual(response.status_code, 200)
+        shot = Shot.objects.get(shot_id=1000)
+        self.assertEqual((shot.shot_loc_x, shot.shot_loc_y), (1.23, -7.01))
+
+        summary = self.client.get(reverse('player_summary', args=[1]), {'layout': 'columnar'}).json()
+        shots = summary['isolation']['shots']
+        scale = summary['coordinateScale']
+        self.assertIn((123, -701), list(zip(shots['x'], shots['y'])))
+        self.assertEqual(scale, 100)
+
+    def test_invalidates_only_ingested_players(self):
+        fields, include, _ = summary_options({})
+        variant, _ = summary_variant(fields, include, None, None, *window_options({}))
+        for player_id in (1, 2):
+            self.client.get(reverse('player_summary', args=[player_id]))
+        cache = get_summary_cache()
+        before = {player_id: get_player_version(player_id) for player_id in (1, 2)}
+        other_summary = cache.get(summary_cache_key(2, before[2], *variant))
+        self.assertIsNotNone(other_summary)
+
+        response = self.post(json.dumps([self.shot(1000, points=3)]))
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(get_player_version(2), before[2])
+        self.assertEqual(cache.get(summary_cache_key(2, before[2], *variant)), other_summary)
+        self.assertNotEqual(get_player_version(1), before[1])
+        self.assertIsNone(cache.get(summary_cache_key(1, get_player_version(1), *variant)))
+        summary = self.client.get(reverse('player_summary', args=[1])).json()
+        self.assertEqual(summary['totalPoints'], 15)
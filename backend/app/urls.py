@@ -1,7 +1,19 @@
 
 from django.urls import re_path
-from app.views import players
+from app.views import health, ingest, leaderboards, metrics, players, players_async, teams
 
 urlpatterns = [
     re_path(r'^api/v1/playerSummary/(?P<playerID>[0-9]+)$', players.PlayerSummary.as_view(), name='player_summary'),
+    re_path(
+        r'^api/v1/async/playerSummary/(?P<playerID>[0-9]+)$',
+        players_async.AsyncPlayerSummary.as_view(),
+        name='player_summary_async',
+    ),
+    re_path(r'^api/v1/playerSummaries$', players.PlayerSummaries.as_view(), name='player_summaries'),
+    re_path(r'^api/v1/players/(?P<playerID>[0-9]+)/shotChart$', players.ShotChart.as_view(), name='shot_chart'),
+    re_path(r'^api/v1/teamSummary/(?P<teamID>[0-9]+)$', teams.TeamSummary.as_view(), name='team_summary'),
+    re_path(r'^api/v1/leaderboards/(?P<stat>[A-Za-z]+)$', leaderboards.Leaderboard.as_view(), name='leaderboard'),
+    re_path(r'^api/v1/events$', ingest.EventIngest.as_view(), name='event_ingest'),
+    re_path(r'^api/v1/health$', health.Health.as_view(), name='health'),
+    re_path(r'^metrics$', metrics.Metrics.as_view(), name='metrics'),
 ]
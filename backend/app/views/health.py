@@ -0,0 +1,29 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from app.helpers.db_pool import check_database, pool_stats
+
+LOGGER = logging.getLogger('django')
+
+
+class Health(APIView):
+    """
+    Database reachability plus this worker's connection pool usage (null
+    when DB_POOL is off), for load balancer checks and dashboards. Answers
+    503 when the database can't be reached.
+    """
+    logger = LOGGER
+
+    def get(self, request):
+        ok, latency_ms, error = check_database()
+        database = {'ok': ok, 'latencyMs': latency_ms}
+        if error is not None:
+            LOGGER.warning('Health check failed: %s', error)
+            database['error'] = error
+
+        return Response(
+            {'status': 'ok' if ok else 'unavailable', 'database': database, 'pool': pool_stats()},
+            status=status.HTTP_200_OK if ok else status.HTTP_503_SERVICE_UNAVAILABLE,
+        )
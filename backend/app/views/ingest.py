@@ -0,0 +1,57 @@
+import logging
+
+from rest_framework import status
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from app.authentication import HasIngestKey, IngestKeyAuthentication
+from app.helpers.ingest import ingest_events
+from app.helpers.request_timing import timed
+from app.parsers import NDJSONParser
+
+LOGGER = logging.getLogger('django')
+
+MAX_INGEST_EVENTS = 50000
+
+
+class EventIngest(APIView):
+    """
+    Bulk insert of live shots, passes and turnovers, authenticated with
+    Authorization: Bearer <key> (settings.INGEST_API_KEYS). The body is a
+    JSON array of events, or NDJSON (Content-Type: application/x-ndjson)
+    with one event per line. Each event has a type of shot, pass or
+    turnover plus the fields of the raw data files and player_id. Events
+    already stored are skipped, so a failed post can be retried as is. A
+    batch with any invalid event is rejected whole (400, with the errors).
+    """
+    logger = LOGGER
+    authentication_classes = [IngestKeyAuthentication]
+    permission_classes = [HasIngestKey]
+    parser_classes = [JSONParser, NDJSONParser]
+
+    def post(self, request):
+        events = request.data
+        if not isinstance(events, list):
+            return Response(
+                {"error": "Expected a JSON array or NDJSON stream of events"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not events:
+            return Response({"error": "No events given"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(events) > MAX_INGEST_EVENTS:
+            return Response(
+                {"error": f"At most {MAX_INGEST_EVENTS} events per request"},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+
+        with timed('compute'):
+            result = ingest_events(events)
+        if result['errors']:
+            return Response(
+                {
+                    "error": f"{len(result['errors'])} invalid events, nothing was written",
+                    "errors": result['errors'],
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(result)
@@ -0,0 +1,93 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from app.dbmodels import models
+from app.helpers.cache import cache_key, get_summary_cache
+from app.helpers.data_version import get_data_version
+from app.helpers.event_store import event_store_lags
+from app.helpers.players import ACTION_TYPES
+from app.helpers.ranks import DESCENDING, get_rank_index
+from app.helpers.request_timing import timed
+
+LOGGER = logging.getLogger('django')
+
+DEFAULT_LEADERBOARD_SIZE = 25
+MAX_LEADERBOARD_SIZE = 500
+
+
+def get_leaderboard(stat, action_type=None, offset=0, limit=DEFAULT_LEADERBOARD_SIZE):
+    rank_index = get_rank_index(action_type=action_type)
+    leaders = rank_index.leaders(stat, offset, limit)
+    names = dict(
+        models.Player.objects.filter(player_id__in=[player_id for player_id, _, _ in leaders])
+        .values_list('player_id', 'name')
+    )
+    total = len(rank_index.player_stats)
+    return {
+        'stat': stat,
+        'actionType': action_type,
+        'order': 'desc' if DESCENDING[stat] else 'asc',
+        'offset': offset,
+        'limit': limit,
+        'total': total,
+        'nextOffset': offset + limit if offset + limit < total else None,
+        'players': [
+            {'rank': rank, 'playerID': player_id, 'name': names.get(player_id), 'value': value}
+            for player_id, value, rank in leaders
+        ],
+    }
+
+
+class Leaderboard(APIView):
+    """
+    Players ordered by one of the ranked stats, best first:
+    ?limit=<players>&offset=<players to skip>&action_type=<action type>.
+    Ranks match the player summary ranks (ties share a rank, and the
+    turnover stats rank the fewest first). action_type ranks only the events
+    of that action type.
+    """
+    logger = LOGGER
+
+    def get(self, request, stat):
+        params = request.query_params
+        action_type = params.get('action_type') or None
+        try:
+            limit = int(params.get('limit', DEFAULT_LEADERBOARD_SIZE))
+            offset = int(params.get('offset', 0))
+        except ValueError:
+            return Response({"error": "limit and offset must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if stat not in DESCENDING:
+            return Response(
+                {"error": f"Unknown stat {stat}; expected one of {', '.join(DESCENDING)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if action_type is not None and action_type not in ACTION_TYPES:
+            return Response({"error": f"Unknown action_type {action_type}"}, status=status.HTTP_400_BAD_REQUEST)
+        if action_type is not None and stat.endswith('Count') and stat != f'{action_type}Count':
+            return Response(
+                {"error": f"{stat} counts other action types than {action_type}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not 1 <= limit <= MAX_LEADERBOARD_SIZE:
+            return Response(
+                {"error": f"limit must be between 1 and {MAX_LEADERBOARD_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if offset < 0:
+            return Response({"error": "offset must not be negative"}, status=status.HTTP_400_BAD_REQUEST)
+
+        version, _ = get_data_version()
+        cache = get_summary_cache()
+        key = cache_key('leaderboard', version, stat, action_type, offset, limit)
+        lagging = event_store_lags(version)
+        leaderboard = cache.get(key)
+        if leaderboard is None:
+            with timed('compute'):
+                leaderboard = get_leaderboard(stat, action_type, offset, limit)
+            if not lagging:
+                cache.set(key, leaderboard)
+
+        return Response(leaderboard)
@@ -0,0 +1,16 @@
+from django.http import HttpResponse, JsonResponse
+from django.views import View
+
+from app.helpers.metrics import prometheus_client, render_metrics
+
+
+class Metrics(View):
+    """
+    Every metric in Prometheus text format (see app.helpers.metrics).
+    """
+
+    def get(self, request):
+        if prometheus_client is None:
+            return JsonResponse({"error": "prometheus_client is not installed"}, status=503)
+        body, content_type = render_metrics()
+        return HttpResponse(body, content_type=content_type)
@@ -1,19 +1,340 @@
 import logging
+from datetime import date
 
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from app.helpers.players import get_player_summary_stats, get_ranks
+from app.helpers.cache import cache_key, get_summary_cache, summary_cache_key
+from app.helpers.data_version import get_data_version, get_player_version
+from app.helpers.event_store import event_store_lags
+from app.helpers.players import (
+    ACTION_TYPES, EVENT_KINDS, TOTAL_KEYS, decode_cursor, get_player_summaries, get_player_summary_stats,
+    window_game_ids,
+)
+from app.helpers.ranks import RANKED_STATS, get_rank_index, get_ranks
+from app.helpers.request_timing import timed
+from app.helpers.shot_chart import (
+    ACTION_CODES, BIN_TYPES, DEFAULT_BIN_SIZE, MAX_BIN_SIZE, MIN_BIN_SIZE, get_shot_chart,
+)
+from app.helpers.wire_format import LAYOUTS, compact_summary
+from app.renderers import summary_renderer_classes
 
 LOGGER = logging.getLogger('django')
 
+MAX_BATCH_SIZE = 500
+
+DEFAULT_EVENT_PAGE_SIZE = 1000
+MAX_EVENT_PAGE_SIZE = 10000
+
+SUMMARY_FIELDS = (
+    ['name', 'playerID']
+    + TOTAL_KEYS
+    + [f'{action_type}Count' for action_type in ACTION_TYPES]
+    + ACTION_TYPES
+    + [f'{stat}Rank' for stat, _ in RANKED_STATS]
+    + ['nextCursor', 'window']
+)
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def summary_options(params):
+    """
+    Parse the fields=, include= and layout= query parameters shared by the
+    summary views. fields lists the top-level keys to return (all of them
+    when absent); include lists the event arrays (shots, passes, turnovers)
+    to embed under each action type, or none. Event arrays are skipped
+    entirely when fields names no action type. layout=columnar sends event
+    arrays as parallel arrays (see compact_summary). Returns
+    (fields, include, layout) and raises ValueError for unknown names.
+    """
+    fields = None
+    if 'fields' in params:
+        fields = parse_list(params['fields'])
+        unknown = [field for field in fields if field not in SUMMARY_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+
+    include = EVENT_KINDS
+    if 'include' in params:
+        requested = [kind for kind in parse_list(params['include']) if kind != 'none']
+        unknown = [kind for kind in requested if kind not in EVENT_KINDS]
+        if unknown:
+            raise ValueError(f"Unknown event kinds: {', '.join(unknown)}")
+        include = [kind for kind in EVENT_KINDS if kind in requested]
+
+    if fields is not None and not any(action_type in fields for action_type in ACTION_TYPES):
+        include = []
+
+    layout = params.get('layout', 'objects')
+    if layout not in LAYOUTS:
+        raise ValueError(f"layout must be one of {', '.join(LAYOUTS)}")
+
+    return fields, include, layout
+
+
+def window_options(params):
+    """
+    Parse the from= and to= (inclusive YYYY-MM-DD game dates) and games=
+    (comma-separated game IDs) window parameters shared by the summary
+    views. Returns (date_from, date_to, game_ids), each None when absent,
+    and raises ValueError for malformed values.
+    """
+    try:
+        date_from = date.fromisoformat(params['from']) if params.get('from') else None
+        date_to = date.fromisoformat(params['to']) if params.get('to') else None
+    except ValueError:
+        raise ValueError('from and to must be dates (YYYY-MM-DD)')
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise ValueError('from must not be after to')
+
+    game_ids = None
+    if params.get('games'):
+        try:
+            game_ids = sorted({int(game_id) for game_id in parse_list(params['games'])})
+        except ValueError:
+            raise ValueError('games must be comma-separated game IDs')
+
+    return date_from, date_to, game_ids
+
+
+def window_payload(date_from, date_to, games):
+    return {
+        'from': date_from.isoformat() if date_from else None,
+        'to': date_to.isoformat() if date_to else None,
+        'gameIDs': games,
+    }
+
+
+def summary_variant(fields, include, limit, cursor, date_from, date_to, game_ids):
+    """
+    Cache key and ETag suffixes for a summary request's options, both empty
+    for a plain all-time request. Returns (cache_variant, etag_variant).
+    """
+    windowed = date_from is not None or date_to is not None or game_ids is not None
+    variant = []
+    if fields is not None or include != EVENT_KINDS or limit is not None or windowed:
+        variant = [','.join(include), limit, cursor]
+    if windowed:
+        variant.append('~'.join([
+            str(date_from or ''), str(date_to or ''), ','.join(str(game_id) for game_id in game_ids or []),
+        ]))
+    etag_variant = variant + [','.join(fields)] if fields is not None else variant
+    return variant, etag_variant
+
+
+def summary_etag(version, last_modified, player_id, etag_variant):
+    return quote_etag('.'.join(str(part) for part in [version, last_modified, player_id, *etag_variant]))
+
+
+def summary_games(summary):
+    """
+    The game IDs a cached summary was built over (its window), or None for
+    every game.
+    """
+    window = summary.get('window')
+    return window['gameIDs'] if window is not None else None
+
+
+def merge_ranks(summary, ranks):
+    """
+    A summary with its ranks merged in, keeping the window last. Ranks are
+    never cached with the summary: they move whenever any player's stats
+    do, while the summary only changes with the player's own data (see
+    get_player_version).
+    """
+    merged = summary | ranks
+    if 'window' in merged:
+        merged['window'] = merged.pop('window')
+    return merged
+
+
+def select_fields(summary, fields):
+    if fields is None or 'error' in summary:
+        return summary
+    return {field: summary[field] for field in fields if field in summary}
+
+
+def render_summary(request, summary, fields, layout):
+    summary = select_fields(summary, fields)
+    if layout == 'columnar':
+        summary = compact_summary(summary, binary=request.accepted_renderer.render_style == 'binary')
+    return summary
+
 
 class PlayerSummary(APIView):
+    """
+    One player's summary and ranks. Optional query parameters:
+    fields=, include= and layout= (see summary_options), limit=/cursor= to
+    page through the event arrays (a paged response carries the nextCursor
+    to pass back for the following page), and from=/to=/games= (see
+    window_options) to summarize and rank over a window of games only.
+    """
     logger = LOGGER
+    renderer_classes = summary_renderer_classes()
 
     def get(self, request, playerID):
-        print(playerID)
+        params = request.query_params
+        try:
+            fields, include, layout = summary_options(params)
+            date_from, date_to, game_ids = window_options(params)
+            cursor = params.get('cursor') or None
+            after = decode_cursor(cursor) if cursor else None
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(params['limit']) if params.get('limit') else None
+        except ValueError:
+            return Response({"error": "limit must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        if after is not None and limit is None:
+            limit = DEFAULT_EVENT_PAGE_SIZE
+        if limit is not None and not 1 <= limit <= MAX_EVENT_PAGE_SIZE:
+            return Response(
+                {"error": f"limit must be between 1 and {MAX_EVENT_PAGE_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        player_id = int(playerID)
+        version, updated_at = get_data_version()
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+        variant, etag_variant = summary_variant(fields, include, limit, cursor, date_from, date_to, game_ids)
+        if layout != 'objects':
+            etag_variant = etag_variant + [layout]
+        if request.accepted_renderer.format != 'json':
+            etag_variant = etag_variant + [request.accepted_renderer.format]
+        etag = summary_etag(version, last_modified, player_id, etag_variant)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_summary_cache()
+        key = summary_cache_key(player_id, get_player_version(player_id), *variant)
+        lagging = event_store_lags(version)
+        player_summary = cache.get(key)
+        if player_summary is None:
+            games = window_game_ids(date_from, date_to, game_ids)
+            with timed('compute'):
+                player_summary = get_player_summary_stats(
+                    player_id=playerID, include=include, after=after, limit=limit, games=games,
+                )
+            if games is not None and 'error' not in player_summary:
+                player_summary['window'] = window_payload(date_from, date_to, games)
+            if 'error' not in player_summary and not lagging:
+                cache.set(key, player_summary)
+        with timed('compute'):
+            player_summary = merge_ranks(player_summary, get_ranks(
+                player_id=playerID, player_summary=player_summary, games=summary_games(player_summary),
+            ))
+
+        response = Response(render_summary(request, player_summary, fields, layout))
+        if not lagging:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+
+class PlayerSummaries(APIView):
+    """
+    Summaries and ranks for many players in one round trip, either as
+    GET ?ids=1,2,3 or as a POST body of {"ids": [1, 2, 3]} for long lists.
+    Both accept the fields=, include=, layout= and from=/to=/games= query
+    parameters.
+    """
+    logger = LOGGER
+    renderer_classes = summary_renderer_classes()
+
+    def get(self, request):
+        raw_ids = request.query_params.get('ids', '')
+        player_ids = [raw_id.strip() for raw_id in raw_ids.split(',') if raw_id.strip()]
+        return self.summarize(request, player_ids)
+
+    def post(self, request):
+        player_ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(player_ids, list):
+            return Response({"error": "Expected a JSON body of {\"ids\": [...]}"}, status=status.HTTP_400_BAD_REQUEST)
+        return self.summarize(request, player_ids)
+
+    def summarize(self, request, player_ids):
+        try:
+            fields, include, layout = summary_options(request.query_params)
+            date_from, date_to, game_ids = window_options(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        if not player_ids:
+            return Response({"error": "No player IDs given"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(player_ids) > MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"At most {MAX_BATCH_SIZE} player IDs per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        games = window_game_ids(date_from, date_to, game_ids)
+        with timed('compute'):
+            summaries, errors = get_player_summaries(player_ids, include, games)
+            rank_index = get_rank_index(games)
+            players = [
+                render_summary(
+                    request,
+                    summary | (rank_index.ranks_for(summary['playerID']) or {"error": "Player stats not found"}),
+                    fields,
+                    layout,
+                )
+                for summary in summaries
+            ]
+
+        response = {'players': players, 'errors': errors}
+        if games is not None:
+            response['window'] = window_payload(date_from, date_to, games)
+        return Response(response)
+
+
+class ShotChart(APIView):
+    """
+    Shot attempts, makes and points per court bin for one player:
+    ?bin=hex|grid&size=<feet>&action_type=<action type>&fromGame=<id>&toGame=<id>
+    """
+    logger = LOGGER
+
+    def get(self, request, playerID):
+        params = request.query_params
+        bin_type = params.get('bin', 'hex')
+        action_type = params.get('action_type') or None
+        try:
+            size = float(params.get('size', DEFAULT_BIN_SIZE))
+            from_game = int(params['fromGame']) if params.get('fromGame') else None
+            to_game = int(params['toGame']) if params.get('toGame') else None
+        except ValueError:
+            return Response({"error": "size, fromGame and toGame must be numbers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        if bin_type not in BIN_TYPES:
+            return Response({"error": f"bin must be one of {', '.join(BIN_TYPES)}"}, status=status.HTTP_400_BAD_REQUEST)
+        if not MIN_BIN_SIZE <= size <= MAX_BIN_SIZE:
+            return Response(
+                {"error": f"size must be between {MIN_BIN_SIZE} and {MAX_BIN_SIZE}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if action_type is not None and action_type not in ACTION_CODES:
+            return Response({"error": f"Unknown action_type {action_type}"}, status=status.HTTP_400_BAD_REQUEST)
 
-        player_summary = get_player_summary_stats(player_id=playerID)
-        player_summary = player_summary | get_ranks(player_id=playerID, player_summary=player_summary)
+        player_id = int(playerID)
+        version, _ = get_data_version()
+        cache = get_summary_cache()
+        key = cache_key(
+            'shotChart', get_player_version(player_id), player_id, bin_type, size, action_type, from_game, to_game,
+        )
+        lagging = event_store_lags(version)
+        shot_chart = cache.get(key)
+        if shot_chart is None:
+            with timed('compute'):
+                shot_chart = get_shot_chart(player_id, bin_type, size, action_type, from_game, to_game)
+            if 'error' not in shot_chart and not lagging:
+                cache.set(key, shot_chart)
 
-        return Response(player_summary)
+        return Response(shot_chart)
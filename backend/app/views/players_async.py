@@ -0,0 +1,87 @@
+import asyncio
+import logging
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from django.views import View
+
+from app.helpers.cache import get_summary_cache, summary_cache_key
+from app.helpers.data_version import get_data_version, get_player_version
+from app.helpers.event_store import event_store_lags
+from app.helpers.players import aget_player_summary_stats, in_own_connection, window_game_ids
+from app.helpers.ranks import get_ranks
+from app.helpers.request_timing import timed
+from app.helpers.wire_format import compact_summary
+from app.views.players import (
+    merge_ranks, select_fields, summary_etag, summary_games, summary_options, summary_variant, window_options,
+    window_payload,
+)
+
+LOGGER = logging.getLogger('django')
+
+# Match DRF's compact JSON output.
+JSON_PARAMS = {'separators': (',', ':')}
+
+
+class AsyncPlayerSummary(View):
+    """
+    Async counterpart of PlayerSummary, meant to be served from the ASGI app
+    (app.asgi). The player lookup, totals, event locations and ranks are
+    fetched concurrently. Accepts fields=, include=, layout= and
+    from=/to=/games= like PlayerSummary; paging (limit=/cursor=) and
+    MessagePack stay on the sync endpoint.
+    """
+
+    async def get(self, request, playerID):
+        params = request.GET
+        try:
+            fields, include, layout = summary_options(params)
+            date_from, date_to, game_ids = window_options(params)
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        player_id = int(playerID)
+        version, updated_at = await sync_to_async(get_data_version)()
+        last_modified = int(updated_at.timestamp()) if updated_at else None
+        variant, etag_variant = summary_variant(fields, include, None, None, date_from, date_to, game_ids)
+        if layout != 'objects':
+            etag_variant = etag_variant + [layout]
+        etag = summary_etag(version, last_modified, player_id, etag_variant)
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        cache = get_summary_cache()
+        key = summary_cache_key(player_id, await sync_to_async(get_player_version)(player_id), *variant)
+        lagging = event_store_lags(version)
+        player_summary = await sync_to_async(cache.get)(key)
+        if player_summary is None:
+            games = await sync_to_async(window_game_ids)(date_from, date_to, game_ids)
+            with timed('compute'):
+                player_summary, ranks = await asyncio.gather(
+                    aget_player_summary_stats(player_id, include, games),
+                    in_own_connection(get_ranks)(player_id, {}, games),
+                )
+            if games is not None and 'error' not in player_summary:
+                player_summary['window'] = window_payload(date_from, date_to, games)
+            if 'error' not in player_summary and not lagging:
+                await sync_to_async(cache.set)(key, player_summary)
+        else:
+            with timed('compute'):
+                ranks = await in_own_connection(get_ranks)(player_id, {}, summary_games(player_summary))
+        player_summary = merge_ranks(player_summary, ranks)
+
+        player_summary = select_fields(player_summary, fields)
+        if layout == 'columnar':
+            player_summary = compact_summary(player_summary)
+
+        with timed('serialize'):
+            response = JsonResponse(player_summary, json_dumps_params=JSON_PARAMS)
+        if not lagging:
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,47 @@
+import logging
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from app.helpers.cache import cache_key, get_summary_cache
+from app.helpers.data_version import get_data_version
+from app.helpers.players import window_game_ids
+from app.helpers.request_timing import timed
+from app.helpers.teams import get_team_summary
+from app.views.players import window_options, window_payload
+
+LOGGER = logging.getLogger('django')
+
+
+class TeamSummary(APIView):
+    """
+    One team's totals, the same totals per action type, and each rostered
+    player's contribution, highest scorers first:
+    ?from=<YYYY-MM-DD>&to=<YYYY-MM-DD>&games=<id>,<id> restricts every total
+    to that window, as for the player summaries.
+    """
+    logger = LOGGER
+
+    def get(self, request, teamID):
+        try:
+            date_from, date_to, game_ids = window_options(request.query_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        team_id = int(teamID)
+        version, _ = get_data_version()
+        cache = get_summary_cache()
+        key = cache_key(
+            'teamSummary', version, team_id, date_from, date_to, ','.join(str(game_id) for game_id in game_ids or []),
+        )
+        team_summary = cache.get(key)
+        if team_summary is None:
+            games = window_game_ids(date_from, date_to, game_ids)
+            with timed('compute'):
+                team_summary = get_team_summary(team_id, games=games)
+            if games is not None and 'error' not in team_summary:
+                team_summary['window'] = window_payload(date_from, date_to, games)
+            if 'error' not in team_summary:
+                cache.set(key, team_summary)
+
+        return Response(team_summary)
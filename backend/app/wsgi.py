@@ -1,4 +1,3 @@
-
 import os
 import logging
 
@@ -8,19 +7,14 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 
 application = get_wsgi_application()
 
+# Loading the sample data into an empty database is a deploy step
+# (python manage.py bootstrap), not something every worker does on import.
+
 try:
-    from app.dbmodels.models import Player
-    
-    if Player.objects.count() == 0:
-        logging.info("No players found in database. Loading sample data...")
-        
-        from app.management.commands.load_sample_data import Command
-        command = Command()
-        command.handle()
-        
-        logging.info("Sample data loaded successfully!")
-    else:
-        logging.info(f"Database already has {Player.objects.count()} players. Skipping data load.")
-        
+    from django.conf import settings
+
+    if settings.SUMMARY_ENGINE == 'columnar':
+        from app.helpers.event_store import get_event_store
+        get_event_store()
 except Exception as e:
-    logging.error(f"Error loading sample data: {str(e)}")
+    logging.error(f"Error loading event store: {str(e)}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import time
+import argparse
+import statistics
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+DEFAULT_TARGETS = [
+    'wsgi=http://localhost:8000/api/v1/playerSummary/{player_id}',
+    'asgi=http://localhost:8001/api/v1/async/playerSummary/{player_id}',
+]
+
+
+def fetch(url):
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(url) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return time.perf_counter() - start, status
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def run_target(url_template, player_ids, requests, concurrency):
+    urls = [url_template.format(player_id=player_ids[index % len(player_ids)]) for index in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(1 for _, status in results if status >= 400)
+    return {
+        'rps': requests / elapsed,
+        'p50': percentile(latencies, 0.5),
+        'p95': percentile(latencies, 0.95),
+        'p99': percentile(latencies, 0.99),
+        'mean': statistics.mean(latencies),
+        'errors': errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Compare PlayerSummary latency and throughput under concurrency between running deployments, '
+            'e.g. gunicorn app.wsgi on :8000 and gunicorn -k uvicorn.workers.UvicornWorker app.asgi on :8001. '
+            'Start both with PLAYER_SUMMARY_CACHE_SIZE=0 to measure the uncached database path.'
+        )
+    )
+    parser.add_argument(
+        '--target',
+        action='append',
+        dest='targets',
+        help='name=url template with {player_id} (repeatable; defaults to local wsgi :8000 and asgi :8001)',
+    )
+    parser.add_argument('--player-ids', default='0,1,2,3,4,5,6,7,8,9', help='Comma-separated player IDs to cycle through')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per target and concurrency level')
+    parser.add_argument('--concurrency', default='1,8,32', help='Comma-separated concurrency levels')
+    parser.add_argument('--warmup', type=int, default=20, help='Unmeasured requests per target first')
+    args = parser.parse_args()
+
+    targets = [target.split('=', 1) for target in (args.targets or DEFAULT_TARGETS)]
+    player_ids = [player_id.strip() for player_id in args.player_ids.split(',') if player_id.strip()]
+    levels = [int(level) for level in args.concurrency.split(',')]
+
+    for _, url_template in targets:
+        run_target(url_template, player_ids, args.warmup, 1)
+
+    print(f"{'target':<10}{'conc':>6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+    for concurrency in levels:
+        for name, url_template in targets:
+            result = run_target(url_template, player_ids, args.requests, concurrency)
+            print(
+                f"{name:<10}{concurrency:>6}{result['rps']:>10.1f}{result['p50'] * 1000:>10.1f}"
+                f"{result['p95'] * 1000:>10.1f}{result['p99'] * 1000:>10.1f}{result['errors']:>8}"
+            )
+
+
+if __name__ == '__main__':
+    main()
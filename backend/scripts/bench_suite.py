@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import platform
+import tempfile
+import statistics
+import tracemalloc
+from datetime import datetime, timezone
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+django.setup()
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_databases, setup_test_environment, teardown_databases
+
+from app.dbmodels.models import (
+    Team, Game, Player, Shot, Pass, Turnover, IngestCheckpoint, IngestedGame, PlayerGameStats,
+)
+from app.helpers.cache import invalidate_summary_cache
+from app.helpers.data_version import get_data_version
+from app.helpers.loaders import DEFAULT_BATCH_SIZE, BulkLoader, IncrementalLoader
+from app.helpers.players import get_player_summary_stats
+from app.helpers.query_budget import QueryCounter
+from app.helpers.ranks import RankIndex, get_ranks
+from app.helpers.synthetic import SeasonWriter
+
+# Players per size tier.
+SIZES = {
+    'small': 10,
+    'medium': 1000,
+    'large': 50000,
+}
+
+TEAM_COUNT = 30
+
+# The row loader (load_sample_data --mode row) issues several queries per
+# row, so by default it is only measured on tiers this small.
+ROW_LOADER_MAX_PLAYERS = SIZES['small']
+
+# Child tables first, so rows are deleted before the rows they reference.
+TABLES = [
+    model._meta.db_table
+    for model in (Shot, Pass, Turnover, PlayerGameStats, IngestedGame, IngestCheckpoint, Player, Game, Team)
+]
+
+
+def clear_tables():
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"TRUNCATE {', '.join(connection.ops.quote_name(table) for table in TABLES)}")
+        else:
+            for table in TABLES:
+                cursor.execute(f'DELETE FROM {connection.ops.quote_name(table)}')
+
+
+def run_once(function, setup=None, trace_memory=False):
+    """
+    Run function once. Returns (seconds, queries, peak traced bytes or None).
+    """
+    if setup is not None:
+        setup()
+    counter = QueryCounter()
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with connection.execute_wrapper(counter):
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+    return elapsed, counter.count, peak
+
+
+def percentile(sorted_values, fraction):
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def measure(function, runs, setup=None, warmup=0, memory=True):
+    """
+    Time runs calls of function, each after setup, following warmup untimed
+    calls. Peak memory comes from one extra call under tracemalloc, so its
+    overhead stays out of the timings.
+    """
+    for _ in range(warmup):
+        run_once(function, setup)
+    timings = []
+    queries = []
+    for _ in range(runs):
+        elapsed, query_count, _ = run_once(function, setup)
+        timings.append(elapsed)
+        queries.append(query_count)
+    peak = run_once(function, setup, trace_memory=True)[2] if memory else None
+
+    timings.sort()
+    return {
+        'runs': runs,
+        'medianSeconds': statistics.median(timings),
+        'p95Seconds': percentile(timings, 0.95),
+        'meanSeconds': statistics.mean(timings),
+        'queries': statistics.mean(queries),
+        'peakBytes': peak,
+    }
+
+
+def run_size(size, players, args, load_mode):
+    """
+    Generate a synthetic season of players (see app.helpers.synthetic),
+    load it and run every benchmark against it. Returns a
+    list of result records.
+    """
+    results = []
+
+    def record(benchmark, measurement):
+        results.append({'size': size, 'players': players, 'events': events, 'benchmark': benchmark, **measurement})
+        print(
+            f'{size:<8}{benchmark:<22}{measurement["medianSeconds"] * 1000:>12.2f}'
+            f'{measurement["p95Seconds"] * 1000:>12.2f}{measurement["queries"]:>10.1f}'
+            f'{format_bytes(measurement["peakBytes"]):>12}'
+        )
+
+    with tempfile.TemporaryDirectory(prefix=f'bench-{size}-') as data_dir:
+        def quiet(message):
+            pass
+
+        writer = SeasonWriter(
+            seed=args.seed,
+            players=players,
+            teams=min(TEAM_COUNT, players),
+            games=args.games,
+            events_per_game=players * args.events_per_player / args.games,
+        )
+        events = sum(writer.write(data_dir, log=quiet).values())
+
+        if players <= args.row_loader_max_players:
+            with open(os.devnull, 'w') as devnull:
+                record('loader:row', measure(
+                    lambda: call_command('load_sample_data', mode='row', data_dir=data_dir, stdout=devnull),
+                    runs=args.loader_runs, setup=clear_tables, memory=args.memory,
+                ))
+        record(f'loader:{load_mode}', measure(
+            lambda: BulkLoader(mode=load_mode, batch_size=args.batch_size, log=quiet).load_all(data_dir),
+            runs=args.loader_runs, setup=clear_tables, memory=args.memory,
+        ))
+        record('loader:incremental', measure(
+            lambda: IncrementalLoader(mode=load_mode, batch_size=args.batch_size, log=quiet).load_all(data_dir),
+            runs=args.loader_runs, setup=clear_tables, memory=args.memory,
+        ))
+
+    # Spread the sampled players across the ID range, the same ones every run.
+    player_ids = sorted(Player.objects.values_list('player_id', flat=True))
+    step = max(1, len(player_ids) // args.samples)
+    sample = player_ids[::step][:args.samples]
+    client = Client()
+
+    players_to_query = itertools.cycle(sample)
+    record('summary', measure(
+        lambda: get_player_summary_stats(player_id=next(players_to_query)),
+        runs=args.runs, warmup=1, memory=args.memory,
+    ))
+    record('ranks:build', measure(
+        lambda: RankIndex.build(version=get_data_version()[0]),
+        runs=max(1, args.runs // 4), memory=args.memory,
+    ))
+    players_to_query = itertools.cycle(sample)
+    record('ranks', measure(
+        lambda: get_ranks(player_id=next(players_to_query), player_summary={}),
+        runs=args.runs, warmup=1, memory=args.memory,
+    ))
+
+    def get_summary():
+        response = client.get(f'/api/v1/playerSummary/{next(players_to_query)}')
+        if response.status_code != 200:
+            raise RuntimeError(f'PlayerSummary answered {response.status_code}')
+
+    players_to_query = itertools.cycle(sample)
+    record('view', measure(
+        get_summary, runs=args.runs, setup=invalidate_summary_cache, warmup=1, memory=args.memory,
+    ))
+    players_to_query = itertools.cycle(sample)
+    record('view:cached', measure(get_summary, runs=args.runs, warmup=len(sample), memory=args.memory))
+    return results
+
+
+def format_bytes(value):
+    return '-' if value is None else f'{value / (1 << 20):.1f}MB'
+
+
+def compare(results, baseline, tolerance):
+    """
+    Print each benchmark against the baseline record with the same size and
+    name. A benchmark regresses when its median time or peak memory grows
+    by more than tolerance, or it runs more queries. Returns the regressions.
+    """
+    previous = {(result['size'], result['benchmark']): result for result in baseline['results']}
+    regressions = []
+    print(f"\n{'size':<8}{'benchmark':<22}{'median':>10}{'queries':>10}{'peak':>10}")
+    for result in results:
+        before = previous.get((result['size'], result['benchmark']))
+        if before is None:
+            print(f"{result['size']:<8}{result['benchmark']:<22}{'new':>10}")
+            continue
+
+        time_ratio = result['medianSeconds'] / before['medianSeconds'] if before['medianSeconds'] else 1
+        query_delta = result['queries'] - before['queries']
+        memory_ratio = None
+        if result['peakBytes'] is not None and before.get('peakBytes'):
+            memory_ratio = result['peakBytes'] / before['peakBytes']
+        print(
+            f"{result['size']:<8}{result['benchmark']:<22}{time_ratio - 1:>+10.0%}{query_delta:>+10.1f}"
+            f"{'-' if memory_ratio is None else format(memory_ratio - 1, '+.0%'):>10}"
+        )
+
+        if time_ratio > 1 + tolerance:
+            regressions.append(f"{result['size']} {result['benchmark']}: {time_ratio:.2f}x slower")
+        if query_delta > 0:
+            regressions.append(f"{result['size']} {result['benchmark']}: {query_delta:+.1f} queries")
+        if memory_ratio is not None and memory_ratio > 1 + tolerance:
+            regressions.append(f"{result['size']} {result['benchmark']}: {memory_ratio:.2f}x peak memory")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=(
+            'Seed a throwaway test database with synthetic seasons of increasing size and benchmark the '
+            'row, bulk and incremental loaders, get_player_summary_stats, get_ranks and the PlayerSummary view: wall time, query '
+            'count and peak traced memory, optionally compared against a stored baseline'
+        )
+    )
+    parser.add_argument(
+        '--sizes',
+        default='small,medium',
+        help=f"Comma-separated size tiers to run ({', '.join(f'{name}={count}' for name, count in SIZES.items())} players)",
+    )
+    parser.add_argument(
+        '--events-per-player',
+        type=int,
+        default=200,
+        help='Average events per player (10M events at the large size by default)',
+    )
+    parser.add_argument('--games', type=int, default=1230, help='Games in the season')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for the synthetic season')
+    parser.add_argument('--samples', type=int, default=20, help='Players, spread across the roster, to query')
+    parser.add_argument('--runs', type=int, default=50, help='Timed calls per query benchmark')
+    parser.add_argument('--loader-runs', type=int, default=1, help='Timed loads per loader benchmark')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE, help='Loader batch size')
+    parser.add_argument(
+        '--row-loader-max-players',
+        type=int,
+        default=ROW_LOADER_MAX_PLAYERS,
+        help='Also benchmark the row-by-row loader on tiers with at most this many players',
+    )
+    parser.add_argument(
+        '--load-mode',
+        choices=['bulk', 'copy'],
+        help='BulkLoader write mode (defaults to copy on PostgreSQL, bulk elsewhere)',
+    )
+    parser.add_argument('--engine', choices=['database', 'columnar'], help='Override settings.SUMMARY_ENGINE')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='Skip the tracemalloc runs')
+    parser.add_argument('--output', help='Write the results as JSON to this file')
+    parser.add_argument('--baseline', help='Compare against results JSON written by an earlier --output run')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.25,
+        help='Allowed fractional growth in median time or peak memory before a benchmark counts as regressed',
+    )
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(',') if size.strip()]
+    unknown = [size for size in sizes if size not in SIZES]
+    if unknown:
+        parser.error(f"Unknown sizes: {', '.join(unknown)}")
+    if args.engine:
+        settings.SUMMARY_ENGINE = args.engine
+
+    setup_test_environment(debug=False)
+    old_config = setup_databases(verbosity=0, interactive=False, aliases={'default'})
+    try:
+        load_mode = args.load_mode or ('copy' if connection.vendor == 'postgresql' else 'bulk')
+        print(f"{'size':<8}{'benchmark':<22}{'median ms':>12}{'p95 ms':>12}{'queries':>10}{'peak':>12}")
+        results = []
+        for size in sizes:
+            results += run_size(size, SIZES[size], args, load_mode)
+    finally:
+        teardown_databases(old_config, verbosity=0)
+
+    report = {
+        'meta': {
+            'createdAt': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'engine': settings.SUMMARY_ENGINE,
+            'loadMode': load_mode,
+            'eventsPerPlayer': args.events_per_player,
+            'games': args.games,
+            'seed': args.seed,
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'\nWrote {args.output}')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print('\nRegressions:')
+            for regression in regressions:
+                print(f'  {regression}')
+            sys.exit(1)
+        print('\nNo regressions')
+
+
+if __name__ == '__main__':
+    main()
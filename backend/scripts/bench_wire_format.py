@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import gzip
+import time
+import argparse
+import statistics
+import django
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
+django.setup()
+
+from rest_framework.renderers import JSONRenderer
+
+from app.dbmodels.models import Player
+from app.helpers.players import get_player_summaries
+from app.helpers.ranks import get_rank_index
+from app.helpers.wire_format import compact_summary
+from app.middleware import BROTLI_QUALITY
+from app.renderers import MessagePackRenderer, msgpack
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def encodings():
+    """
+    (name, serialize) pairs, where serialize turns the list of summary
+    payloads into response bytes the way the API would.
+    """
+    json_renderer = JSONRenderer()
+    yield 'drf-json', lambda summaries: json_renderer.render(summaries)
+    yield 'columnar-json', lambda summaries: json_renderer.render(
+        [compact_summary(summary) for summary in summaries]
+    )
+    if msgpack is not None:
+        msgpack_renderer = MessagePackRenderer()
+        yield 'msgpack', lambda summaries: msgpack_renderer.render(summaries)
+        yield 'columnar-msgpack', lambda summaries: msgpack_renderer.render(
+            [compact_summary(summary, binary=True) for summary in summaries]
+        )
+
+
+def time_call(function, argument, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(argument)
+        timings.append(time.perf_counter() - start)
+    return result, statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Compare bytes on the wire and serialization time of the summary payload encodings'
+    )
+    parser.add_argument('--player-ids', help='Comma-separated player IDs (defaults to every player)')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per encoding; the median is reported')
+    args = parser.parse_args()
+
+    if args.player_ids:
+        player_ids = [player_id.strip() for player_id in args.player_ids.split(',') if player_id.strip()]
+    else:
+        player_ids = list(Player.objects.order_by('player_id').values_list('player_id', flat=True))
+
+    summaries, errors = get_player_summaries(player_ids)
+    for error in errors:
+        print(f"Skipping {error['id']}: {error['error']}")
+    rank_index = get_rank_index()
+    summaries = [summary | (rank_index.ranks_for(summary['playerID']) or {}) for summary in summaries]
+    print(f'{len(summaries)} player summaries, median of {args.repeat} runs\n')
+
+    header = f"{'encoding':<18}{'serialize ms':>14}{'bytes':>12}{'gzip':>12}{'gzip ms':>10}"
+    if brotli is not None:
+        header += f"{'br':>12}{'br ms':>10}"
+    print(header)
+
+    baseline = None
+    for name, serialize in encodings():
+        body, serialize_time = time_call(serialize, summaries, args.repeat)
+        gzipped, gzip_time = time_call(gzip.compress, body, args.repeat)
+        line = f'{name:<18}{serialize_time * 1000:>14.2f}{len(body):>12,}{len(gzipped):>12,}{gzip_time * 1000:>10.2f}'
+        if brotli is not None:
+            compressed, brotli_time = time_call(
+                lambda data: brotli.compress(data, quality=BROTLI_QUALITY), body, args.repeat
+            )
+            line += f'{len(compressed):>12,}{brotli_time * 1000:>10.2f}'
+        if baseline is None:
+            baseline = len(body)
+        else:
+            line += f'   ({len(body) / baseline:.0%} of drf-json)'
+        print(line)
+
+
+if __name__ == '__main__':
+    main()
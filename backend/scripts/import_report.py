@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import time
+import argparse
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure(settings_module, module):
+    """
+    Import module in a fresh interpreter under python -X importtime.
+    Returns (wall seconds, [(self us, cumulative us, depth, name)]).
+    """
+    python_path = os.pathsep.join(filter(None, [BACKEND_DIR, os.environ.get('PYTHONPATH')]))
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module, PYTHONPATH=python_path)
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    wall = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f'Importing {module} with {settings_module} failed:\n{result.stderr[-2000:]}')
+
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((int(self_us), int(cumulative_us), depth, name.strip()))
+    return wall, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Report what a worker imports at startup, per settings module')
+    parser.add_argument(
+        '--settings',
+        nargs='+',
+        default=['app.settings', 'app.settings_api'],
+        help='Settings modules to compare',
+    )
+    parser.add_argument('--module', default='app.wsgi', help='Module a worker imports on boot')
+    parser.add_argument('--top', type=int, default=15, help='Slowest imports to list per settings module')
+    args = parser.parse_args()
+
+    for settings_module in args.settings:
+        wall, imports = measure(settings_module, args.module)
+        total_self = sum(self_us for self_us, _, _, _ in imports)
+        print(f'{settings_module}: import {args.module} took {wall * 1000:.0f} ms wall '
+              f'({len(imports)} modules, {total_self / 1000:.0f} ms importing)')
+
+        top_level = [entry for entry in imports if entry[2] <= 1]
+        for self_us, cumulative_us, depth, name in sorted(top_level, key=lambda entry: -entry[1])[:args.top]:
+            print(f'  {cumulative_us / 1000:>8.1f} ms  {"  " * depth}{name}')
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,7 @@
 import os
 import sys
 import json
+import argparse
 import django
 from datetime import datetime
 
@@ -12,6 +13,9 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'app.settings')
 django.setup()
 
 from app.dbmodels.models import Team, Game, Player, Shot, Pass, Turnover
+from app.helpers.data_version import bump_data_version
+from app.helpers.loaders import DEFAULT_BATCH_SIZE, LOAD_MODES, RAW_DATA_DIR, BulkLoader, IncrementalLoader
+from app.helpers.raw_data import iter_players
 
 
 def load_teams():
@@ -60,10 +64,9 @@ def load_players():
     print("Loading players...")
     players_path = os.path.join(os.path.dirname(__file__), '..', 'raw_data', 'players.json')
     
-    with open(players_path, 'r') as f:
-        players_data = json.load(f)
-    
-    for player_data in players_data:
+    players_loaded = 0
+    for player_data in iter_players(players_path):
+        players_loaded += 1
         player, created = Player.objects.get_or_create(
             player_id=player_data['player_id'],
             defaults={
@@ -76,7 +79,7 @@ def load_players():
         else:
             print(f"Player already exists: {player.name}")
     
-    print(f"Loaded {len(players_data)} players")
+    print(f"Loaded {players_loaded} players")
 
 
 def load_shots():
@@ -84,8 +87,7 @@ def load_shots():
     print("Loading shots...")
     players_path = os.path.join(os.path.dirname(__file__), '..', 'raw_data', 'players.json')
     
-    with open(players_path, 'r') as f:
-        players_data = json.load(f)
+    players_data = iter_players(players_path)
     
     shots_loaded = 0
     for player_data in players_data:
@@ -116,8 +118,7 @@ def load_passes():
     print("Loading passes...")
     players_path = os.path.join(os.path.dirname(__file__), '..', 'raw_data', 'players.json')
     
-    with open(players_path, 'r') as f:
-        players_data = json.load(f)
+    players_data = iter_players(players_path)
     
     passes_loaded = 0
     for player_data in players_data:
@@ -151,8 +152,7 @@ def load_turnovers():
     print("Loading turnovers...")
     players_path = os.path.join(os.path.dirname(__file__), '..', 'raw_data', 'players.json')
     
-    with open(players_path, 'r') as f:
-        players_data = json.load(f)
+    players_data = iter_players(players_path)
     
     turnovers_loaded = 0
     for player_data in players_data:
@@ -178,16 +178,35 @@ def load_turnovers():
 
 def main():
     """Main function to load all data"""
-    print("Starting data loading process...")
+    parser = argparse.ArgumentParser(description='Load raw_data into the database')
+    parser.add_argument('--mode', choices=LOAD_MODES, default='bulk',
+                        help='row: one get_or_create per row; bulk: batched bulk_create; copy: batched PostgreSQL COPY')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Rows per write in the bulk and copy modes')
+    parser.add_argument('--data-dir', default=RAW_DATA_DIR,
+                        help='Directory holding teams.json, games.json and players.json (bulk and copy modes)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Commit every batch with a resumable checkpoint and skip unchanged files and games')
+    args = parser.parse_args()
+    if args.incremental and args.mode == 'row':
+        parser.error('--incremental requires the bulk or copy mode')
+
+    print(f"Starting data loading process ({args.mode} mode)...")
     
     try:
-        # Load data in dependency order
-        load_teams()
-        load_games()
-        load_players()
-        load_shots()
-        load_passes()
-        load_turnovers()
+        if args.mode == 'row':
+            # Load data in dependency order
+            load_teams()
+            load_games()
+            load_players()
+            load_shots()
+            load_passes()
+            load_turnovers()
+            bump_data_version()
+        elif args.incremental:
+            IncrementalLoader(mode=args.mode, batch_size=args.batch_size).load_all(args.data_dir)
+        else:
+            BulkLoader(mode=args.mode, batch_size=args.batch_size).load_all(args.data_dir)
         
         print("\nData loading completed successfully!")
         